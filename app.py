@@ -1,20 +1,28 @@
 import streamlit as st
-import pandas as pd
 import json
-import gspread
+import math
+import os
 import re
-import time
-from oauth2client.service_account import ServiceAccountCredentials
+from contextlib import contextmanager
+from armazem_cartas import obter_armazem
+from tabelas_html import CSS_TABELAS, tabela_html_cartas
+import banco_cartas
+from busca_cartas import IndiceBusca, dobrar_acentos
+from trocas import MotorTrocas
+import metricas
+from metricas import Medidor
+import preaquecimento
+from cache_planilha import obter_cache
+import clientes_google
+from valores_cartas import formatar_reais
+# ciclos_trocas, visao_ofertas (numpy) e servidor_consultas: importados por
+# quem os usa, depois do primeiro desenho da página
 
 # ======================== CONFIGURAÇÕES =============================
 
-# Autenticação com Google Sheets
+# Autenticação com Google Sheets (cliente único do processo, ver clientes_google.py)
 def autenticar_planilha():
-    escopo = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
-    info = json.loads(st.secrets["GOOGLE_CREDENTIALS"])
-    creds = ServiceAccountCredentials.from_json_keyfile_dict(info, escopo)
-    cliente = gspread.authorize(creds)
-    return cliente
+    return clientes_google.cliente_sheets()
 
 # ======================== SELENIUM + SCRAPING =======================
 
@@ -27,7 +35,10 @@ def set_page_in_url(url, page_number):
 
 def extrair_cartas_ligamagic(nome_jogador, tipo='have'):
     """
-    Busca as cartas do arquivo cartas.json por nome de jogador e tipo ('have' ou 'want').
+    Busca as cartas do jogador por nome e tipo ('have' ou 'want').
+    Se existir o banco cartas.db (gerado com `scrapinglocal.py --sqlite`), a
+    consulta vai direto nele; senão usa o cartas.json, carregado uma única vez
+    pelo armazém do processo e só relido quando muda no disco.
 
     Parâmetros:
       nome_jogador (str): Nome do jogador conforme está em cartas.json.
@@ -36,17 +47,23 @@ def extrair_cartas_ligamagic(nome_jogador, tipo='have'):
     Retorna:
       Lista de cartas do respectivo jogador/tipo.
     """
-    with open("cartas.json", encoding="utf-8") as f:
-        jogadores = json.load(f)
-
-    for jogador in jogadores:
-        if jogador["nome"].strip().lower() == nome_jogador.strip().lower():
-            return jogador.get(tipo, [])
-    return []
+    if banco_cartas.banco_disponivel():
+        return banco_cartas.cartas_do_jogador(banco_cartas.conectar(), nome_jogador, tipo)
+    return obter_armazem().cartas_do_jogador(nome_jogador, tipo)
 
 # ======================== APP STREAMLIT =============================
 
 st.set_page_config(page_title="Troca de Cartas Magic", layout="wide")
+st.markdown(CSS_TABELAS, unsafe_allow_html=True)
+
+# Tempos de cada etapa deste rerun (painel opcional na sidebar). Fica True
+# até o fim do script: depois disso, só rodam reruns de fragmentos
+medidor = Medidor()
+pagina_inteira = True
+with st.sidebar:
+    mostrar_tempos = st.checkbox("⏱️ Mostrar tempos desta página", value=False)
+    gravar_tempos = st.checkbox(f"Gravar tempos em {metricas.ARQUIVO_LOG}", value=False)
+
 colT, colL = st.columns([4, 1])
 with colT:
     st.title("Plataforma de Troca e Venda de Cartas - Magic: The Gathering")
@@ -54,51 +71,202 @@ with colT:
 with colL:
     st.image("logo-figurativa-a-toca.png", width=160)
 
-# Carrega dados da planilha
-placeholder = st.empty()
-placeholder.info("🔄 Carregando dados da planilha...")
+URL_PLANILHA = "https://docs.google.com/spreadsheets/d/1FmicnHU9caYH0NrxO1W49OyyJsfu-vYTKd9rzkyzZ7E/edit#gid=0"
 
-@st.cache_data(ttl=300)  # 5 minutos
-def carregar_dados():
-    try:
-        cliente = autenticar_planilha()
-        st.write("✅ Autenticado com Google Sheets.")
-    except Exception as e:
-        st.error(f"Erro ao autenticar: {e}")
-        st.stop()
-    planilha = cliente.open_by_url("https://docs.google.com/spreadsheets/d/1FmicnHU9caYH0NrxO1W49OyyJsfu-vYTKd9rzkyzZ7E/edit#gid=0")
-    aba = planilha.get_worksheet(0)
-    return aba.get_all_records()
+def abrir_aba_jogadores():
+    cliente = autenticar_planilha()
+    planilha = cliente.open_by_url(URL_PLANILHA)
+    return planilha.get_worksheet(0)
+
+def revisao_planilha():
+    # Só metadados no Drive: muda a cada edição, em qualquer coluna
+    from gspread.utils import extract_id_from_url
 
-dados = carregar_dados()
+    servico = clientes_google.servico_drive()
+    arquivo = clientes_google.executar(
+        servico.files().get(fileId=extract_id_from_url(URL_PLANILHA), fields="version,modifiedTime")
+    )
+    return arquivo.get("version") or arquivo.get("modifiedTime")
 
-placeholder.success("✅ Dados carregados com sucesso!")
-time.sleep(3)
-placeholder.empty()  # Remove a mensagem do placeholder
+def cache_jogadores():
+    return obter_cache(abrir_aba_jogadores, obter_revisao=revisao_planilha)
 
-# =========== CAMPO DE BUSCA POR CARTA =============
-st.header("🔎 Buscar carta por nome")
-busca = st.text_input("Digite o nome (ou parte) da carta", "")
+def buscar_planilha():
+    # Roda em segundo plano: sem st.write/st.error aqui. O cache em disco é
+    # compartilhado entre processos e segura a última cópia boa da planilha.
+    return cache_jogadores().ler()
+
+# Planilha e cartas começam a carregar enquanto a página é desenhada
+preaquecimento.iniciar("planilha", buscar_planilha)
+preaquecimento.iniciar("cartas", lambda: obter_armazem().atualizar())
 
-# Estruturas auxiliares
-jogadores = []
+# Planilha, cartas e índices só são relidos/montados num rerun da página
+# inteira; a busca, a lista de jogadores e o comparativo são fragmentos que
+# rodam de novo sozinhos quando um widget deles muda (digitar na busca não
+# redesenha as tabelas dos jogadores). st.fragment a partir do Streamlit
+# 1.37, st.experimental_fragment antes; sem nenhum dos dois, as funções
+# rodam como parte da página inteira.
+fragmento = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda funcao: funcao)
+
+@st.cache_data(ttl=60)  # 1 minuto; depois relê o cache em disco
+def carregar_dados():
+    metricas.cache_miss()
+    try:
+        return preaquecimento.obter("planilha", buscar_planilha)
+    except Exception as e:
+        st.error(f"Erro ao carregar a planilha: {e}")
+        st.stop()
 
-# Coleta dados de cada jogador
-for linha in dados:
-    nome = linha.get("Jogador")
-    whatsapp = linha.get("Whatsapp (opcional)", "")
-    link_have = linha.get("Link do Have", "").strip()
-    link_want = linha.get("Link do Want", "").strip()
+# Carrega dados da planilha
+placeholder = st.empty()
+if not preaquecimento.pronto("planilha"):
+    placeholder.info("🔄 Carregando dados da planilha...")
+with medidor.medir("planilha", cacheada=True) as etapa:
+    dados = carregar_dados()
+    etapa["itens"] = len(dados)
+placeholder.empty()
+if cache_jogadores().ultimo_erro:
+    st.warning("⚠️ Planilha indisponível no momento; mostrando a última cópia salva.")
+
+LIMITE_RESULTADOS_BUSCA = 200
+# API de consultas opcional (servidor_consultas.py): com
+# SERVIDOR_CONSULTAS=http://127.0.0.1:8765 a busca é feita por ela
+SERVIDOR_CONSULTAS = os.environ.get("SERVIDOR_CONSULTAS", "")
+
+def versao_cartas():
+    """Versão das cartas: banco SQLite, se existir, ou hash do cartas.json."""
+    if banco_cartas.banco_disponivel():
+        return banco_cartas.versao_banco()
+    return obter_armazem().atualizar()
+
+def versao_dados(dados):
+    """Identifica a versão dos dados: cartas + jogadores da planilha."""
+    return versao_cartas(), tuple((linha.get("Jogador"), linha.get("Whatsapp (opcional)", "")) for linha in dados)
+
+def montar_jogadores(dados):
+    jogadores = []
+    for linha in dados:
+        nome = linha.get("Jogador")
+        whatsapp = linha.get("Whatsapp (opcional)", "")
+        link_have = linha.get("Link do Have", "").strip()
+        link_want = linha.get("Link do Want", "").strip()
+
+        lista_have = extrair_cartas_ligamagic(nome, tipo='have')
+        lista_want = extrair_cartas_ligamagic(nome, tipo='want')
+
+        jogadores.append({
+            "nome": nome,
+            "whatsapp": whatsapp,
+            "have": lista_have,
+            "want": lista_want
+        })
+    return jogadores
+
+# Seções da página, na ordem em que aparecem. Enquanto as cartas ainda estão
+# chegando (pré-aquecimento), elas mostram quem está sendo carregado; depois
+# cada uma é preenchida com o seu painel
+secao_busca, secao_filtros, secao_jogadores, secao_comparativo = (st.empty() for _ in range(4))
+if not preaquecimento.pronto("cartas"):
+    secao_busca.info("🔄 Carregando as cartas; a busca e os filtros aparecem em seguida...")
+    nomes_planilha = [str(linha.get("Jogador") or "") for linha in dados]
+    secao_jogadores.info(
+        f"🔄 Carregando as listas de {len(nomes_planilha)} jogador(es): "
+        + ", ".join(nomes_planilha[:20]) + ("..." if len(nomes_planilha) > 20 else "")
+    )
 
-    lista_have = extrair_cartas_ligamagic(nome, tipo='have')
-    lista_want = extrair_cartas_ligamagic(nome, tipo='want')
+# Estado derivado guardado na sessão: enquanto a versão dos dados não muda,
+# os reruns (da página ou de um fragmento) reaproveitam a lista de jogadores
+# e os índices já montados, sem percorrer a liga de novo
+versao = versao_dados(dados)
+derivados = st.session_state.get("derivados")
+cargas_antes = obter_armazem().tempos["cargas"]
+with medidor.medir("cartas", cacheada=True) as etapa:
+    if derivados is None or derivados["versao"] != versao:
+        jogadores = montar_jogadores(dados)
+        derivados = st.session_state["derivados"] = {
+            "versao": versao,
+            "jogadores": jogadores,
+            "itens": sum(len(j["have"]) + len(j["want"]) for j in jogadores),
+        }
+        if banco_cartas.banco_disponivel() or obter_armazem().tempos["cargas"] > cargas_antes:
+            metricas.cache_miss()  # consultou o banco ou o cartas.json foi (re)lido neste rerun
+    jogadores = derivados["jogadores"]
+    etapa["itens"] = derivados["itens"]
+
+def derivado(nome, construir):
+    """Índice `nome` da sessão, montado (ou pego do cache do processo) na primeira vez."""
+    derivados = st.session_state["derivados"]
+    if nome not in derivados:
+        derivados[nome] = construir(derivados["versao"], derivados["jogadores"])
+    return derivados[nome]
+
+@contextmanager
+def tempos_do_fragmento(nome):
+    # Dentro do rerun da página, as etapas do fragmento entram no medidor
+    # dela (painel e log). Um rerun só do fragmento não chega ao painel da
+    # sidebar: o tempo aparece no próprio fragmento e vai sozinho para o log
+    local = Medidor()
+    yield local
+    if pagina_inteira:
+        medidor.etapas.extend(local.etapas)
+    elif gravar_tempos:
+        local.gravar(fragmento=nome)
+    if mostrar_tempos:
+        st.caption(f"⏱️ {nome}: {local.total_ms():.1f} ms")
+
+def buscar_na_api(busca):
+    """Resultados no formato da busca local; None se a API não respondeu."""
+    from servidor_consultas import consultar
 
-    jogadores.append({
-        "nome": nome,
-        "whatsapp": whatsapp,
-        "have": lista_have,
-        "want": lista_want
-    })
+    try:
+        ofertas = consultar(SERVIDOR_CONSULTAS, "/busca", q=busca, limite=LIMITE_RESULTADOS_BUSCA)
+    except OSError:
+        return None
+    return [
+        {
+            "Jogador": oferta["jogador"],
+            "WhatsApp": oferta["whatsapp"],
+            "Carta": oferta["carta"]["Nome"],
+            "Qtd": oferta["carta"].get("Quantidade", ""),
+        }
+        for oferta in ofertas
+    ]
+
+@st.cache_resource(max_entries=4)
+def indice_busca(versao, _jogadores):
+    # Montado uma vez por versão dos dados e compartilhado entre as sessões
+    metricas.cache_miss()
+    return IndiceBusca(_jogadores, tipo="have")
+
+@st.cache_resource(max_entries=4)
+def motor_trocas(versao, _jogadores):
+    metricas.cache_miss()
+    return MotorTrocas(_jogadores)
+
+@st.cache_resource(max_entries=4)
+def ciclos_trocas(versao, _jogadores):
+    # Grafo jogador -> jogador da liga inteira; os ciclos de cada jogador são
+    # buscados sob demanda e memoizados no próprio objeto
+    from ciclos_trocas import CiclosTrocas
+
+    metricas.cache_miss()
+    return CiclosTrocas(_jogadores)
+
+@st.cache_resource(max_entries=4)
+def visao_have(versao, _jogadores):
+    # Quantidade/preço numéricos em arrays: valor das listas, ordem e faixa de preço
+    from visao_ofertas import VisaoOfertas
+
+    metricas.cache_miss()
+    return VisaoOfertas(_jogadores, tipo="have")
+
+@st.cache_data(max_entries=1000)
+def tabela_jogador(nome_jogador, tipo, versao, _cartas, selecao=None, pagina=1):
+    # Memoizada por (jogador, lista, versão, ordem/faixa de preço, página):
+    # tabelas que não mudaram vêm do cache
+    metricas.cache_miss()
+    colunas = colunas_desejadas_have if tipo == "have" else colunas_desejadas_want
+    return tabela_html_cartas(_cartas, colunas_desejadas=colunas)
 
 def carta_com_link_e_imagem(nome, url, img_url):
     if not url:
@@ -114,136 +282,269 @@ def carta_com_link_e_imagem(nome, url, img_url):
     )
 colunas_desejadas_have = ["Nome", "Quantidade", "Qualidade", "Extra", "Idioma", "Preço Venda (R$)"]
 colunas_desejadas_want = ["Nome", "Quantidade", "Qualidade", "Extra", "Idioma"]
-def tabela_html_cartas(cartas, altura_px=350, colunas_desejadas=None):
-    if not cartas:
-        return "<i>Nenhuma carta cadastrada.</i>"
-    # Se não for especificado, usa todas as colunas inclusive preço
-    if colunas_desejadas is None:
-        colunas_desejadas = ["Nome", "Quantidade", "Qualidade", "Extra", "Idioma", "Preço Venda (R$)"]
-    colunas = [c for c in colunas_desejadas if c in cartas[0]]
-    html = f"""
-    <div style="border-radius:15px;border:1.5px solid #e6e6ef;box-shadow:0 2px 10px #0001;background:#fff;margin-bottom:14px;margin-top:2px;padding:0px;overflow: hidden;box-sizing: border-box;max-width: 100%;">
-        <div style="max-height:{altura_px+55}px;overflow-y:hidden;overflow-x:auto;border-radius:15px;padding-bottom: 6px;box-sizing: border-box;">
-        <table style='border-collapse:collapse;width:100%;font-family:"Segoe UI",Roboto,Arial,sans-serif;font-size:12px;background:#f7f8fa;table-layout:fixed;'>
-            <thead>
-            <tr>
-    """
-    for c in colunas:
-        if c == "Nome":
-            width = "min-width:340px;max-width:400px;width:33%;"
-        elif c == "Preço Venda (R$)":
-            width = "width:90px;max-width:120px;"
+
+# =========== CAMPO DE BUSCA POR CARTA =============
+@fragmento
+def painel_busca():
+    st.header("🔎 Buscar carta por nome")
+    busca = st.text_input("Digite o nome (ou parte) da carta", "")
+    if not busca.strip():
+        return
+    # ========== RESULTADO DA BUSCA, LOGO ABAIXO DO CAMPO ==========
+    with tempos_do_fragmento("busca") as medidor_busca:
+        busca_normalizada = busca.strip().lower()
+        resultado = None
+        if banco_cartas.banco_disponivel():
+            with medidor_busca.medir("busca") as etapa:
+                resultado = banco_cartas.buscar_ofertas(banco_cartas.conectar(), busca_normalizada,
+                                                       limite=LIMITE_RESULTADOS_BUSCA)
+        elif SERVIDOR_CONSULTAS:
+            with medidor_busca.medir("busca_api") as etapa:
+                resultado = buscar_na_api(busca_normalizada)
+        if resultado is None:
+            # Sem banco, ou a API não respondeu: índice em memória deste processo
+            resultado = []
+            with medidor_busca.medir("indice_busca", cacheada=True):
+                indice = derivado("indice", indice_busca)
+            with medidor_busca.medir("busca") as etapa:
+                for jogador, carta in indice.buscar(busca_normalizada, limite=LIMITE_RESULTADOS_BUSCA):
+                    resultado.append({
+                        "Jogador": jogador["nome"],
+                        "WhatsApp": jogador["whatsapp"],
+                        "Carta": carta["Nome"],
+                        "Qtd": carta.get("Quantidade", "")
+                    })
+        etapa["itens"] = len(resultado)
+        if resultado:
+            st.success(f"Encontrado(s) {len(resultado)} resultado(s):")
+            for item in resultado:
+                st.markdown(
+                    carta_com_link_e_imagem(
+                        item["Carta"],
+                        item.get("Link Detalhe") or item.get("Imagem") or "#",  # preferencialmente Link Detalhe, depois Imagem
+                        item.get("Imagem", "")
+                    ),
+                    unsafe_allow_html=True,
+                )
+                st.markdown(
+                    f'<b>Jogador:</b> {item["Jogador"]}<br>'
+                    f'<b>Whatsapp:</b> {item["WhatsApp"]}<br>'
+                    f'<b>Qtd:</b> {item["Qtd"]}<hr>',
+                    unsafe_allow_html=True
+                )
         else:
-            width = "width:66px;max-width:88px;"
-        html += f'<th style="border-bottom:2px solid #e6e6ef;color:#2e4a66;background:#f0f2fa;padding:6px 5px;text-align:left;font-weight:600;position:sticky;top:0;z-index:2;{width}">{c}</th>'
-    html += "</tr></thead></table>"
-    html += f"""<div style="max-height:{altura_px}px;overflow-y:auto;overflow-x:hidden;"><table style='border-collapse:collapse;width:100%;font-family:"Segoe UI",Roboto,Arial,sans-serif;font-size:12px;table-layout:fixed;'><tbody>"""
-    for carta in cartas:
-        html += "<tr style='background:#fff;'>"
-        for c in colunas:
-            if c == "Nome":
-                link = carta.get("Link Detalhe") or carta.get("Imagem") or "#"
-                cell = f'<a href="{link}" target="_blank" style="color:#1976d2;text-decoration:none;font-weight:600;min-width:180px;display:inline-block;line-height:1.3;word-break:break-word;">{carta.get("Nome","")}</a>'
-                tdstyle = 'padding:6px 5px;border-bottom:1px solid #e6e6ef;color:#222;vertical-align:middle;word-break:break-word;min-width:180px;max-width:400px;width:33%;'
-            elif c == "Preço Venda (R$)":
-                cell = carta.get(c, "-")
-                tdstyle = 'padding:6px 5px;border-bottom:1px solid #e6e6ef;color:#222;text-align:right;width:90px;max-width:120px;'
-            else:
-                cell = carta.get(c, "-")
-                tdstyle = 'padding:6px 5px;border-bottom:1px solid #e6e6ef;color:#222;width:66px;max-width:88px;text-align:center;'
-            html += f'<td style="{tdstyle}">{cell}</td>'
-        html += "</tr>"
-    html += "</tbody></table></div>"
-    return html
-
-# ========== RESULTADO DA BUSCA, LOGO ABAIXO DO CAMPO ==========
-if busca.strip():
-    busca_normalizada = busca.strip().lower()
-    resultado = []
-    for jogador in jogadores:
-        for carta in jogador.get("have", []):
-            if busca_normalizada in carta.get("Nome", "").lower():
-                resultado.append({
-                    "Jogador": jogador["nome"],
-                    "WhatsApp": jogador["whatsapp"],
-                    "Carta": carta["Nome"],
-                    "Qtd": carta.get("Quantidade", "")
-                })
-    if resultado:
-        st.success(f"Encontrado(s) {len(resultado)} resultado(s):")
-        for item in resultado:
-            st.markdown(
-                carta_com_link_e_imagem(
-                    item["Carta"],
-                    item.get("Link Detalhe") or item.get("Imagem") or "#",  # preferencialmente Link Detalhe, depois Imagem
-                    item.get("Imagem", "")
-                ),
-                unsafe_allow_html=True,
-            )
-            st.markdown(
-                f'<b>Jogador:</b> {item["Jogador"]}<br>'
-                f'<b>Whatsapp:</b> {item["WhatsApp"]}<br>'
-                f'<b>Qtd:</b> {item["Qtd"]}<hr>',
-                unsafe_allow_html=True
-            )
-    else:
-        st.warning("Nenhum jogador possui carta com esse nome.")
-
-# Mostra dados por jogador
-for jogador in jogadores:
-    st.subheader(f"🧙 {jogador['nome']}")
-    if jogador['whatsapp']:
-        numero = re.sub(r'\D', '', jogador['whatsapp'])
-        if not numero.startswith('55'):
-            numero = f'55{numero}'
-        link_whatsapp = f"https://wa.me/{numero}"
-        st.write(f"📱 WhatsApp: [{jogador['whatsapp']}]({link_whatsapp})")
-
-    col1, col2 = st.columns(2)
-
-    with col1:
-        st.markdown("**Cartas disponíveis (Have):**")
-        if jogador["have"]:
-            html = tabela_html_cartas(jogador["have"], colunas_desejadas=colunas_desejadas_have)
+            st.warning("Nenhum jogador possui carta com esse nome.")
+
+with secao_busca.container():
+    painel_busca()
+
+# =========== FILTROS POR QUALIDADE, IDIOMA, EXTRA E PREÇO =============
+LIMITE_RESULTADOS_FILTRO = 200
+
+def rotulo_faceta(valor):
+    return valor or "(em branco)"
+
+@fragmento
+def painel_filtros():
+    from visao_ofertas import FACETA_PRECO, FACETAS
+
+    st.header("🎯 Filtrar ofertas")
+    with tempos_do_fragmento("filtros") as medidor_filtros:
+        with medidor_filtros.medir("valores", cacheada=True):
+            visao = derivado("visao", visao_have)
+        facetas = [*FACETAS, FACETA_PRECO]
+        colunas = st.columns(len(facetas))
+        selecao = {}
+        for coluna, faceta in zip(colunas, facetas):
+            with coluna:
+                valores = visao.facetas()[faceta][0]
+                selecao[faceta] = st.multiselect(faceta, valores, key=f"faceta_{faceta}", format_func=rotulo_faceta)
+        with medidor_filtros.medir("facetas") as etapa:
+            posicoes, contagens = visao.filtrar(selecao)
+            etapa["itens"] = len(posicoes)
+        # Quantas ofertas sobram escolhendo cada valor, com os filtros das outras facetas
+        for coluna, faceta in zip(colunas, facetas):
+            with coluna:
+                st.caption(" · ".join(f"{rotulo_faceta(v)}: {n}" for v, n in contagens[faceta].items()))
+        if not any(selecao.values()):
+            return
+        st.caption(f"{len(posicoes)} oferta(s), das mais baratas para as mais caras")
+        if len(posicoes):
+            ofertas = [
+                {**carta, "Jogador": nome}
+                for nome, carta in visao.ofertas(posicoes, ordem="asc", limite=LIMITE_RESULTADOS_FILTRO)
+            ]
+            html = tabela_html_cartas(ofertas, colunas_desejadas=["Jogador"] + colunas_desejadas_have)
+            metricas.registrar("bytes", len(html))
             st.markdown(html, unsafe_allow_html=True)
-        else:
-            st.info("Nenhuma carta cadastrada.")
 
-    with col2:
-        st.markdown("**Cartas desejadas (Want):**")
-        if jogador["want"]:
-            html = tabela_html_cartas(jogador["want"], colunas_desejadas=colunas_desejadas_want)
-            st.markdown(html, unsafe_allow_html=True)
-        else:
-            st.info("Nenhuma carta desejada cadastrada.")
+with secao_filtros.container():
+    painel_filtros()
+
+# Mostra dados por jogador. Cada jogador fica numa seção recolhível e cada
+# tabela mostra no máximo LINHAS_POR_TABELA cartas por vez: uma lista de 2000
+# cartas não vai inteira para o navegador
+LINHAS_POR_TABELA = 100
+
+def mostrar_tabela(jogador, tipo, cartas, posicao, selecao=None):
+    """Tabela Have/Want do jogador, paginada quando passa de LINHAS_POR_TABELA."""
+    total_paginas = math.ceil(len(cartas) / LINHAS_POR_TABELA)
+    pagina = 1
+    if total_paginas > 1:
+        # O total de páginas vai na chave: mudou a faixa de preço, volta à página 1
+        pagina = st.number_input(
+            f"Página do {tipo.capitalize()}", min_value=1, max_value=total_paginas, value=1, step=1,
+            key=f"pagina_{tipo}_{posicao}_{total_paginas}",
+        )
+    inicio = (pagina - 1) * LINHAS_POR_TABELA
+    versao_das_cartas = st.session_state["derivados"]["versao"][0]
+    html = tabela_jogador(jogador["nome"], tipo, versao_das_cartas, cartas[inicio:inicio + LINHAS_POR_TABELA],
+                          selecao, pagina)
+    metricas.registrar("bytes", len(html))
+    st.markdown(html, unsafe_allow_html=True)
+    if total_paginas > 1:
+        st.caption(f"Cartas {inicio + 1}–{min(inicio + LINHAS_POR_TABELA, len(cartas))} de {len(cartas)}")
+
+def mostrar_jogador(jogador, visao, posicao, selecao=None, aberto=False):
+    with st.expander(f"🧙 {jogador['nome']}", expanded=aberto):
+        if jogador['whatsapp']:
+            numero = re.sub(r'\D', '', jogador['whatsapp'])
+            if not numero.startswith('55'):
+                numero = f'55{numero}'
+            link_whatsapp = f"https://wa.me/{numero}"
+            st.write(f"📱 WhatsApp: [{jogador['whatsapp']}]({link_whatsapp})")
+
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.markdown("**Cartas disponíveis (Have):**")
+            if jogador["have"]:
+                st.caption(f"💰 Valor da lista: {formatar_reais(visao.valor_do_jogador(jogador['nome']))}")
+                cartas_have = jogador["have"]
+                if selecao:
+                    ordem, preco_min, preco_max = selecao
+                    cartas_have = visao.selecionar(jogador["nome"], preco_min, preco_max, ordem)
+                mostrar_tabela(jogador, "have", cartas_have, posicao, selecao)
+            else:
+                st.info("Nenhuma carta cadastrada.")
 
+        with col2:
+            st.markdown("**Cartas desejadas (Want):**")
+            if jogador["want"]:
+                mostrar_tabela(jogador, "want", jogador["want"], posicao)
+            else:
+                st.info("Nenhuma carta desejada cadastrada.")
+
+def mostrar_comparativo(jogador, motor, ciclos):
     # Comparações com outros jogadores
     st.markdown("🟨 **Comparativo com outros jogadores:**")
-    comparacoes = []
-
-    for outro in jogadores:
-        if outro["nome"] == jogador["nome"]:
-            continue
 
+    for nome_outro, par in motor.comparativo(jogador["nome"]):
         # Cartas que este jogador TEM e outro QUER
-        nomes_have = {c["Nome"] for c in jogador["have"] if "Nome" in c}
-        nomes_want_outro = {c["Nome"] for c in outro["want"] if "Nome" in c}
-        em_demand = nomes_have & nomes_want_outro
-
+        em_demand = par["em_demanda"]
         # Cartas que este jogador QUER e outro TEM
-        nomes_want = {c["Nome"] for c in jogador["want"] if "Nome" in c}
-        nomes_have_outro = {c["Nome"] for c in outro["have"] if "Nome" in c}
-        pode_trocar = nomes_want & nomes_have_outro
+        pode_trocar = par["pode_trocar"]
 
         if em_demand or pode_trocar:
-            texto = f"📌 Com **{outro['nome']}**:"
+            texto = f"📌 Com **{nome_outro}**:"
             if em_demand:
                 texto += f"\n- {len(em_demand)} carta(s) que ele quer e você tem: `{', '.join(em_demand)}`"
             if pode_trocar:
                 texto += f"\n- {len(pode_trocar)} carta(s) que você quer e ele tem: `{', '.join(pode_trocar)}`"
             st.markdown(texto)
 
-    st.markdown("---")
+    # Trocas entre 3 ou 4 jogadores que passam por este jogador
+    cadeias = ciclos.ciclos_do_jogador(jogador["nome"], limite=3)
+    if cadeias:
+        st.markdown("🔁 **Trocas em cadeia:**")
+        for ciclo in cadeias:
+            texto = f"📌 {' → '.join(ciclo['jogadores'] + ciclo['jogadores'][:1])} ({ciclo['cartas']} carta(s)):"
+            for troca in ciclo["trocas"]:
+                texto += f"\n- **{troca['de']}** dá a **{troca['para']}**: `{', '.join(troca['cartas'])}`"
+            st.markdown(texto)
+
+JOGADORES_POR_PAGINA = [5, 10, 20, 50]
+ORDENS_PRECO = {"Ordem da lista": None, "Menor preço": "asc", "Maior preço": "desc"}
+
+@fragmento
+def navegador_jogadores():
+    jogadores = st.session_state["derivados"]["jogadores"]
+    st.header("🧙 Jogadores")
+    col_filtro, col_tamanho, col_pagina = st.columns([4, 1, 1])
+    with col_filtro:
+        filtro_jogador = st.text_input("Filtrar jogador pelo nome", "")
+    with col_tamanho:
+        por_pagina = st.selectbox("Jogadores por página", JOGADORES_POR_PAGINA, index=0)
+
+    filtro_normalizado = dobrar_acentos(filtro_jogador)
+    jogadores_visiveis = [j for j in jogadores if filtro_normalizado in dobrar_acentos(j["nome"])]
+    total_paginas = max(1, math.ceil(len(jogadores_visiveis) / por_pagina))
+    with col_pagina:
+        pagina = st.number_input("Página", min_value=1, max_value=total_paginas, value=1, step=1)
+
+    with tempos_do_fragmento("jogadores") as medidor_jogadores:
+        with medidor_jogadores.medir("valores", cacheada=True):
+            visao = derivado("visao", visao_have)
+        col_ordem, col_faixa = st.columns([1, 3])
+        with col_ordem:
+            ordem_preco = ORDENS_PRECO[st.selectbox("Ordenar Have por", list(ORDENS_PRECO))]
+        with col_faixa:
+            preco_teto = float(max(1, math.ceil(visao.preco_maximo() / 100)))
+            faixa_preco = st.slider("Faixa de preço do Have (R$)", 0.0, preco_teto, (0.0, preco_teto), step=0.5)
+        # Sem ordem nem faixa, as listas aparecem como vieram da Ligamagic
+        selecao = None
+        if ordem_preco or faixa_preco != (0.0, preco_teto):
+            preco_min = round(faixa_preco[0] * 100) if faixa_preco[0] > 0 else None
+            preco_max = round(faixa_preco[1] * 100) if faixa_preco[1] < preco_teto else None
+            selecao = (ordem_preco, preco_min, preco_max)
+
+        # Só os jogadores da página atual são renderizados; um jogador sozinho
+        # (ex.: achado pelo filtro) já vem aberto
+        inicio_pagina = (pagina - 1) * por_pagina
+        da_pagina = jogadores_visiveis[inicio_pagina:inicio_pagina + por_pagina]
+        with medidor_jogadores.medir("tabelas_html", cacheada=True):
+            for posicao, jogador in enumerate(da_pagina, start=inicio_pagina):
+                mostrar_jogador(jogador, visao, posicao, selecao, aberto=len(da_pagina) == 1)
+        st.caption(f"Página {pagina} de {total_paginas} — {len(jogadores_visiveis)} jogador(es)")
+
+with secao_jogadores.container():
+    navegador_jogadores()
+
+@fragmento
+def painel_comparativo():
+    jogadores = st.session_state["derivados"]["jogadores"]
+    st.header("🟨 Comparativo e trocas em cadeia")
+    nomes = [j["nome"] for j in jogadores]
+    if not nomes:
+        return
+    nome = st.selectbox("Jogador", nomes, key="comparativo_jogador")
+    with tempos_do_fragmento("comparativo") as medidor_comparativo:
+        with medidor_comparativo.medir("comparativo", cacheada=True):
+            motor = derivado("motor", motor_trocas)
+        with medidor_comparativo.medir("ciclos", cacheada=True):
+            ciclos = derivado("ciclos", ciclos_trocas)
+        mostrar_comparativo(jogadores[nomes.index(nome)], motor, ciclos)
+
+with secao_comparativo.container():
+    painel_comparativo()
+
+if mostrar_tempos:
+    with st.sidebar:
+        st.subheader("⏱️ Tempos deste rerun")
+        linhas_tempos = ["| Etapa | ms | Cache | Itens | Bytes |", "|---|---:|---|---:|---:|"]
+        for etapa in medidor.etapas:
+            linhas_tempos.append(
+                f"| {etapa['etapa']} | {etapa['ms']:.1f} | {etapa.get('cache', '-')} "
+                f"| {etapa.get('itens', '-')} | {etapa.get('bytes', '-')} |"
+            )
+        st.markdown("\n".join(linhas_tempos))
+        st.caption(f"Total do rerun até aqui: {medidor.total_ms():.1f} ms")
+        st.caption(f"Armazém de cartas: {obter_armazem().estatisticas()}")
+        st.caption(f"APIs do Google (processo): {clientes_google.estatisticas_api()}")
+if gravar_tempos:
+    medidor.gravar()
+pagina_inteira = False
+
 st.markdown(
     """
     <style>
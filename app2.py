@@ -1,20 +1,18 @@
 import streamlit as st
 import pandas as pd
 import json
-import gspread
 import re
 import time
-from oauth2client.service_account import ServiceAccountCredentials
+import clientes_google
+from armazem_cartas import obter_armazem
+from tabelas_html import CSS_TABELAS, tabela_html_cartas
+from csv_cartas import ler_csv_cartas
 
 # ======================== CONFIGURAÇÕES =============================
 
 # Autenticação com Google Sheets
 def autenticar_planilha():
-    escopo = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
-    info = json.loads(st.secrets["GOOGLE_CREDENTIALS"])
-    creds = ServiceAccountCredentials.from_json_keyfile_dict(info, escopo)
-    cliente = gspread.authorize(creds)
-    return cliente
+    return clientes_google.cliente_sheets()
 
 # ======================== SELENIUM + SCRAPING =======================
 
@@ -28,6 +26,8 @@ def set_page_in_url(url, page_number):
 def extrair_cartas_ligamagic(nome_jogador, tipo='have'):
     """
     Busca as cartas do arquivo cartas.json por nome de jogador e tipo ('have' ou 'want').
+    O arquivo é carregado uma única vez pelo armazém do processo e só é relido
+    quando muda no disco.
 
     Parâmetros:
       nome_jogador (str): Nome do jogador conforme está em cartas.json.
@@ -36,17 +36,12 @@ def extrair_cartas_ligamagic(nome_jogador, tipo='have'):
     Retorna:
       Lista de cartas do respectivo jogador/tipo.
     """
-    with open("cartas.json", encoding="utf-8") as f:
-        jogadores = json.load(f)
-
-    for jogador in jogadores:
-        if jogador["nome"].strip().lower() == nome_jogador.strip().lower():
-            return jogador.get(tipo, [])
-    return []
+    return obter_armazem().cartas_do_jogador(nome_jogador, tipo)
 
 # ======================== APP STREAMLIT =============================
 
 st.set_page_config(page_title="Troca de Cartas Magic", layout="wide")
+st.markdown(CSS_TABELAS, unsafe_allow_html=True)
 
 with st.container():
     col_logo, col_title, col_button = st.columns([1, 6, 1])
@@ -67,7 +62,8 @@ if import_csv:
 
     if uploaded_file is not None:
         try:
-            df_csv = pd.read_csv(uploaded_file)
+            # Em blocos, uma linha por carta (quantidades somadas) e com teto de memória
+            df_csv = ler_csv_cartas(uploaded_file)
             st.sidebar.success("✅ CSV carregado com sucesso!")
             st.sidebar.dataframe(df_csv)
 
@@ -140,48 +136,6 @@ def carta_com_link_e_imagem(nome, url, img_url):
     )
 colunas_desejadas_have = ["Nome", "Quantidade", "Qualidade", "Extra", "Idioma", "Preço Venda (R$)"]
 colunas_desejadas_want = ["Nome", "Quantidade", "Qualidade", "Extra", "Idioma"]
-def tabela_html_cartas(cartas, altura_px=350, colunas_desejadas=None):
-    if not cartas:
-        return "<i>Nenhuma carta cadastrada.</i>"
-    # Se não for especificado, usa todas as colunas inclusive preço
-    if colunas_desejadas is None:
-        colunas_desejadas = ["Nome", "Quantidade", "Qualidade", "Extra", "Idioma", "Preço Venda (R$)"]
-    colunas = [c for c in colunas_desejadas if c in cartas[0]]
-    html = f"""
-    <div style="border-radius:15px;border:1.5px solid #e6e6ef;box-shadow:0 2px 10px #0001;background:#fff;margin-bottom:14px;margin-top:2px;padding:0px;overflow: hidden;box-sizing: border-box;max-width: 100%;">
-        <div style="max-height:{altura_px+55}px;overflow-y:hidden;overflow-x:auto;border-radius:15px;padding-bottom: 6px;box-sizing: border-box;">
-        <table style='border-collapse:collapse;width:100%;font-family:"Segoe UI",Roboto,Arial,sans-serif;font-size:12px;background:#f7f8fa;table-layout:fixed;'>
-            <thead>
-            <tr>
-    """
-    for c in colunas:
-        if c == "Nome":
-            width = "min-width:340px;max-width:400px;width:33%;"
-        elif c == "Preço Venda (R$)":
-            width = "width:90px;max-width:120px;"
-        else:
-            width = "width:66px;max-width:88px;"
-        html += f'<th style="border-bottom:2px solid #e6e6ef;color:#2e4a66;background:#f0f2fa;padding:6px 5px;text-align:left;font-weight:600;position:sticky;top:0;z-index:2;{width}">{c}</th>'
-    html += "</tr></thead></table>"
-    html += f"""<div style="max-height:{altura_px}px;overflow-y:auto;overflow-x:hidden;"><table style='border-collapse:collapse;width:100%;font-family:"Segoe UI",Roboto,Arial,sans-serif;font-size:12px;table-layout:fixed;'><tbody>"""
-    for carta in cartas:
-        html += "<tr style='background:#fff;'>"
-        for c in colunas:
-            if c == "Nome":
-                link = carta.get("Link Detalhe") or carta.get("Imagem") or "#"
-                cell = f'<a href="{link}" target="_blank" style="color:#1976d2;text-decoration:none;font-weight:600;min-width:180px;display:inline-block;line-height:1.3;word-break:break-word;">{carta.get("Nome","")}</a>'
-                tdstyle = 'padding:6px 5px;border-bottom:1px solid #e6e6ef;color:#222;vertical-align:middle;word-break:break-word;min-width:180px;max-width:400px;width:33%;'
-            elif c == "Preço Venda (R$)":
-                cell = carta.get(c, "-")
-                tdstyle = 'padding:6px 5px;border-bottom:1px solid #e6e6ef;color:#222;text-align:right;width:90px;max-width:120px;'
-            else:
-                cell = carta.get(c, "-")
-                tdstyle = 'padding:6px 5px;border-bottom:1px solid #e6e6ef;color:#222;width:66px;max-width:88px;text-align:center;'
-            html += f'<td style="{tdstyle}">{cell}</td>'
-        html += "</tr>"
-    html += "</tbody></table></div>"
-    return html
-
 # ========== RESULTADO DA BUSCA, LOGO ABAIXO DO CAMPO ==========
 if busca.strip():
     busca_normalizada = busca.strip().lower()
@@ -0,0 +1,152 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+from carta_compacta import carta_ou_dict
+from ids_cartas import obter_catalogo
+from valores_cartas import normalizar_jogadores
+
+# ======================== ARMAZÉM DE CARTAS =========================
+#
+# O cartas.json (ou o cartas.ndjson do scraper, lido linha a linha) é
+# carregado uma única vez por processo e indexado pelo nome normalizado do
+# jogador. Enquanto o arquivo não mudar (mtime + hash), todas as consultas
+# são atendidas pelo índice em memória, inclusive entre reruns do
+# Streamlit, já que o módulo só é importado uma vez. Na carga, cada carta
+# ganha os campos numéricos "quantidade" e "preco_centavos" (valores_cartas.py)
+# e os ids canônicos "id_carta"/"id_impressao" (ids_cartas.py). As cartas
+# ficam na forma compacta de carta_compacta.py, não como dicts.
+
+CAMINHO_CARTAS = "cartas.json"
+# Saída do `scrapinglocal.py --ndjson`: um jogador por linha, lida em streaming
+CAMINHO_CARTAS_NDJSON = "cartas.ndjson"
+
+
+def normalizar_nome_jogador(nome):
+    return (nome or "").strip().lower()
+
+
+class ArmazemCartas:
+    def __init__(self, caminho=CAMINHO_CARTAS, compactar=True):
+        """
+        Parâmetros:
+          caminho (str): cartas.json (lista JSON) ou um arquivo .ndjson com um
+            jogador por linha.
+          compactar (bool): cartas como Carta (carta_compacta.py); False
+            mantém os dicts do JSON (para comparar nos benchmarks).
+        """
+        self.caminho = caminho
+        self._gancho_json = carta_ou_dict if compactar else None
+        self.versao = None  # hash sha1 do conteúdo carregado
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._jogadores = []
+        self._indice = {}
+        self.tempos = {
+            "cargas": 0,
+            "ultima_carga_ms": 0.0,
+            "consultas": 0,
+            "consultas_ms": 0.0,
+        }
+
+    def _carregar(self):
+        """Relê o arquivo se o mtime mudou e reindexa se o conteúdo mudou."""
+        try:
+            mtime = os.stat(self.caminho).st_mtime_ns
+        except FileNotFoundError:
+            self._mtime, self.versao = None, None
+            self._jogadores, self._indice = [], {}
+            return
+        if mtime == self._mtime:
+            return
+
+        inicio = time.perf_counter()
+        if self.caminho.endswith(".ndjson"):
+            versao, jogadores = self._ler_ndjson()
+        else:
+            with open(self.caminho, "rb") as f:
+                bruto = f.read()
+            versao = hashlib.sha1(bruto).hexdigest()
+            jogadores = None if versao == self.versao else json.loads(bruto.decode("utf-8"), object_hook=self._gancho_json)
+        self._mtime = mtime
+        if versao == self.versao:
+            return  # só o mtime mudou (ex.: checkout), conteúdo é o mesmo
+
+        normalizar_jogadores(jogadores)  # cartas.json de scrapers antigos só tem os textos
+        obter_catalogo().anotar(jogadores)
+        indice = {}
+        for jogador in jogadores:
+            indice.setdefault(normalizar_nome_jogador(jogador.get("nome")), jogador)
+
+        self._jogadores, self._indice, self.versao = jogadores, indice, versao
+        self.tempos["cargas"] += 1
+        self.tempos["ultima_carga_ms"] = (time.perf_counter() - inicio) * 1000
+
+    def _ler_ndjson(self):
+        # Linha a linha: nunca há o documento inteiro em memória como texto
+        hash_conteudo = hashlib.sha1()
+        jogadores = []
+        with open(self.caminho, "rb") as f:
+            for linha in f:
+                hash_conteudo.update(linha)
+                if linha.strip():
+                    jogadores.append(json.loads(linha, object_hook=self._gancho_json))
+        return hash_conteudo.hexdigest(), jogadores
+
+    def atualizar(self):
+        """Garante que o índice reflete o arquivo atual e retorna a versão."""
+        with self._lock:
+            self._carregar()
+            return self.versao
+
+    def jogadores(self):
+        with self._lock:
+            self._carregar()
+            return self._jogadores
+
+    def cartas_do_jogador(self, nome_jogador, tipo="have"):
+        inicio = time.perf_counter()
+        with self._lock:
+            self._carregar()
+            jogador = self._indice.get(normalizar_nome_jogador(nome_jogador))
+        self.tempos["consultas"] += 1
+        self.tempos["consultas_ms"] += (time.perf_counter() - inicio) * 1000
+        if jogador is None:
+            return []
+        return jogador.get(tipo, [])
+
+    def estatisticas(self):
+        consultas = self.tempos["consultas"]
+        return {
+            "versao": self.versao,
+            "jogadores": len(self._jogadores),
+            **self.tempos,
+            "consulta_media_ms": self.tempos["consultas_ms"] / consultas if consultas else 0.0,
+        }
+
+
+_armazens = {}
+_armazens_lock = threading.Lock()
+
+
+def caminho_padrao():
+    """
+    O mais recente entre cartas.json e cartas.ndjson: um scraping sem --ndjson
+    depois de um com --ndjson não fica escondido atrás do NDJSON antigo.
+    """
+    existentes = [c for c in (CAMINHO_CARTAS_NDJSON, CAMINHO_CARTAS) if os.path.exists(c)]
+    if not existentes:
+        return CAMINHO_CARTAS
+    return max(existentes, key=os.path.getmtime)
+
+
+def obter_armazem(caminho=None):
+    """Retorna o armazém único do processo para o arquivo informado."""
+    caminho = caminho or caminho_padrao()
+    chave = os.path.abspath(caminho)
+    with _armazens_lock:
+        if chave not in _armazens:
+            _armazens[chave] = ArmazemCartas(caminho)
+        return _armazens[chave]
@@ -0,0 +1,307 @@
+import os
+import sqlite3
+import threading
+from urllib.parse import urlparse, parse_qs
+
+from ids_cartas import anotar_chave
+from valores_cartas import normalizar_carta
+
+# ======================== BANCO SQLITE DE CARTAS ====================
+#
+# Alternativa ao cartas.json monolítico: o scraper grava jogadores, cartas
+# e ofertas (have/want) num arquivo SQLite e o app consulta direto nele,
+# sem carregar a comunidade inteira em memória. Vários processos podem
+# abrir o mesmo arquivo em modo somente leitura.
+#
+# O formato do banco vai em PRAGMA user_version. Um cartas.db gravado por
+# uma versão anterior do scraper (sem qtd/preco_centavos nas ofertas ou sem
+# a chave das cartas) é ignorado por banco_disponivel(): o app volta ao
+# cartas.json até o scraper gravar o banco de novo.
+
+CAMINHO_BANCO = "cartas.db"
+VERSAO_ESQUEMA = 3  # 1: original; 2: qtd e preco_centavos; 3: cartas.chave
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS jogadores (
+    id INTEGER PRIMARY KEY,
+    nome TEXT NOT NULL,
+    nome_normalizado TEXT NOT NULL,
+    whatsapp TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS cartas (
+    id INTEGER PRIMARY KEY,
+    nome TEXT NOT NULL,
+    nome_pt TEXT NOT NULL,
+    nome_en TEXT NOT NULL,
+    edicao TEXT NOT NULL,
+    imagem TEXT NOT NULL,
+    chave TEXT NOT NULL,
+    UNIQUE (nome, imagem)
+);
+CREATE TABLE IF NOT EXISTS ofertas (
+    id INTEGER PRIMARY KEY,
+    jogador_id INTEGER NOT NULL REFERENCES jogadores(id),
+    carta_id INTEGER NOT NULL REFERENCES cartas(id),
+    tipo TEXT NOT NULL CHECK (tipo IN ('have', 'want')),
+    qualidade TEXT NOT NULL,
+    extra TEXT NOT NULL,
+    idioma TEXT NOT NULL,
+    quantidade TEXT NOT NULL,
+    preco TEXT NOT NULL,
+    qtd INTEGER NOT NULL,
+    preco_centavos INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_jogadores_nome ON jogadores (nome_normalizado);
+CREATE INDEX IF NOT EXISTS idx_cartas_nome ON cartas (nome);
+CREATE INDEX IF NOT EXISTS idx_cartas_edicao ON cartas (edicao);
+CREATE INDEX IF NOT EXISTS idx_cartas_chave ON cartas (chave);
+CREATE INDEX IF NOT EXISTS idx_ofertas_jogador ON ofertas (jogador_id, tipo);
+CREATE INDEX IF NOT EXISTS idx_ofertas_carta ON ofertas (carta_id, tipo);
+CREATE VIEW IF NOT EXISTS have AS SELECT * FROM ofertas WHERE tipo = 'have';
+CREATE VIEW IF NOT EXISTS want AS SELECT * FROM ofertas WHERE tipo = 'want';
+"""
+
+# Mesmo formato de dicionário que o scraper grava no cartas.json
+SELECT_CARTA = """
+SELECT c.nome, o.qualidade, o.extra, o.idioma, o.quantidade, o.preco, c.imagem, o.qtd, o.preco_centavos,
+       c.chave, c.edicao
+FROM ofertas o JOIN cartas c ON c.id = o.carta_id
+"""
+
+
+def separar_nomes(nome):
+    """Divide 'Nome PT / Nome EN' nas duas metades (EN pode ser vazio)."""
+    partes = (nome or "").split(" / ", 1)
+    if len(partes) == 2:
+        return partes[0].strip(), partes[1].strip()
+    return partes[0].strip(), ""
+
+
+def edicao_da_url(url):
+    """Extrai o código da edição (parâmetro ed=) do link da carta na Ligamagic."""
+    return parse_qs(urlparse(url or "").query).get("ed", [""])[0].lower()
+
+
+def _linha_para_carta(linha):
+    return {
+        "Nome": linha[0],
+        "Qualidade": linha[1],
+        "Extra": linha[2],
+        "Idioma": linha[3],
+        "Quantidade": linha[4],
+        "Preço Venda (R$)": linha[5],
+        "Imagem": linha[6],
+        "quantidade": linha[7],
+        "preco_centavos": linha[8],
+        "chave": linha[9],
+        "edicao": linha[10],
+    }
+
+
+# ======================== ESCRITA (SCRAPER) =========================
+
+def salvar_jogadores(jogadores, caminho=CAMINHO_BANCO):
+    """
+    Grava a lista de jogadores (mesmo formato do cartas.json) num banco novo.
+
+    O banco é montado num arquivo temporário e trocado de uma vez no final,
+    então os apps que estão lendo nunca veem um banco pela metade.
+    """
+    temporario = caminho + ".tmp"
+    if os.path.exists(temporario):
+        os.remove(temporario)
+    conn = sqlite3.connect(temporario)
+    try:
+        conn.executescript(ESQUEMA)
+        ids_cartas = {}
+        for jogador in jogadores:
+            nome = jogador.get("nome") or ""
+            cursor = conn.execute(
+                "INSERT INTO jogadores (nome, nome_normalizado, whatsapp) VALUES (?, ?, ?)",
+                (nome, nome.strip().lower(), jogador.get("whatsapp") or ""),
+            )
+            jogador_id = cursor.lastrowid
+            for tipo in ("have", "want"):
+                for carta in jogador.get(tipo, []):
+                    chave = (carta.get("Nome", ""), carta.get("Imagem", ""))
+                    carta_id = ids_cartas.get(chave)
+                    if carta_id is None:
+                        nome_pt, nome_en = separar_nomes(chave[0])
+                        carta_id = conn.execute(
+                            "INSERT INTO cartas (nome, nome_pt, nome_en, edicao, imagem, chave) VALUES (?, ?, ?, ?, ?, ?)",
+                            (chave[0], nome_pt, nome_en, edicao_da_url(chave[1]), chave[1], anotar_chave(carta)["chave"]),
+                        ).lastrowid
+                        ids_cartas[chave] = carta_id
+                    normalizar_carta(carta)
+                    conn.execute(
+                        "INSERT INTO ofertas (jogador_id, carta_id, tipo, qualidade, extra, idioma, quantidade, preco,"
+                        " qtd, preco_centavos) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (
+                            jogador_id, carta_id, tipo,
+                            carta.get("Qualidade", ""), carta.get("Extra", ""), carta.get("Idioma", ""),
+                            carta.get("Quantidade", ""), carta.get("Preço Venda (R$)", ""),
+                            carta["quantidade"], carta["preco_centavos"],
+                        ),
+                    )
+        conn.execute(f"PRAGMA user_version = {VERSAO_ESQUEMA}")
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(temporario, caminho)
+
+
+# ======================== LEITURA (APP) =============================
+
+_conexoes = threading.local()
+
+
+def conectar(caminho=CAMINHO_BANCO):
+    """
+    Conexão somente leitura, reaproveitada dentro de cada thread.
+
+    Se o scraper trocou o arquivo (outro inode), a conexão antiga é fechada e
+    uma nova é aberta no banco atual.
+    """
+    cache = getattr(_conexoes, "por_caminho", None)
+    if cache is None:
+        cache = _conexoes.por_caminho = {}
+    inode = os.stat(caminho).st_ino
+    conn, inode_aberto = cache.get(caminho, (None, None))
+    if conn is None or inode_aberto != inode:
+        if conn is not None:
+            conn.close()
+        uri = "file:" + os.path.abspath(caminho) + "?mode=ro"
+        conn = sqlite3.connect(uri, uri=True)
+        cache[caminho] = (conn, inode)
+    return conn
+
+
+_versoes_lidas = {}  # caminho -> ((mtime, tamanho), versão do esquema)
+
+
+def versao_esquema(caminho=CAMINHO_BANCO):
+    """PRAGMA user_version do arquivo (0 em bancos anteriores a ela); relida só se o arquivo mudou."""
+    info = os.stat(caminho)
+    assinatura = (info.st_mtime_ns, info.st_size)
+    lida = _versoes_lidas.get(caminho)
+    if lida is None or lida[0] != assinatura:
+        uri = "file:" + os.path.abspath(caminho) + "?mode=ro"
+        conn = sqlite3.connect(uri, uri=True)
+        try:
+            versao = conn.execute("PRAGMA user_version").fetchone()[0]
+        finally:
+            conn.close()
+        lida = _versoes_lidas[caminho] = (assinatura, versao)
+    return lida[1]
+
+
+def banco_disponivel(caminho=CAMINHO_BANCO):
+    """O banco existe e está no formato atual (senão, o app usa o cartas.json)."""
+    try:
+        return versao_esquema(caminho) == VERSAO_ESQUEMA
+    except (OSError, sqlite3.Error):
+        return False
+
+
+def listar_jogadores(conn):
+    return [
+        {"nome": nome, "whatsapp": whatsapp}
+        for nome, whatsapp in conn.execute("SELECT nome, whatsapp FROM jogadores ORDER BY id")
+    ]
+
+
+def cartas_do_jogador(conn, nome_jogador, tipo="have"):
+    linhas = conn.execute(
+        SELECT_CARTA
+        + " WHERE o.tipo = ? AND o.jogador_id = ("
+        "   SELECT id FROM jogadores WHERE nome_normalizado = ? ORDER BY id LIMIT 1"
+        " ) ORDER BY o.id",
+        (tipo, (nome_jogador or "").strip().lower()),
+    )
+    return [_linha_para_carta(linha) for linha in linhas]
+
+
+_indices_nomes = {}  # (caminho, tipo) -> ((mtime, tamanho), IndiceNomes)
+_indices_lock = threading.Lock()
+LOTE_CARTAS = 50  # cartas por consulta das ofertas
+
+
+def indice_nomes(conn, tipo="have"):
+    """
+    IndiceNomes (busca_cartas.py) das cartas com ofertas `tipo`, montado das
+    linhas de `cartas` (só os nomes distintos, não as ofertas) na ordem da
+    primeira oferta de cada uma, como o IndiceBusca do cartas.json. Um por
+    arquivo, remontado quando o scraper grava o banco de novo.
+    """
+    from busca_cartas import IndiceNomes
+
+    caminho = conn.execute("PRAGMA database_list").fetchone()[2]
+    info = os.stat(caminho)
+    assinatura = (info.st_mtime_ns, info.st_size)
+    with _indices_lock:
+        guardado = _indices_nomes.get((caminho, tipo))
+        if guardado is not None and guardado[0] == assinatura:
+            return guardado[1]
+    indice = IndiceNomes()
+    linhas = conn.execute(
+        """
+        SELECT c.chave, c.nome FROM cartas c
+        JOIN (SELECT carta_id, MIN(id) AS primeira FROM ofertas WHERE tipo = ? GROUP BY carta_id) o
+          ON o.carta_id = c.id
+        ORDER BY o.primeira
+        """,
+        (tipo,),
+    )
+    for chave, nome in linhas:
+        indice.adicionar(chave, nome)
+    with _indices_lock:
+        _indices_nomes[(caminho, tipo)] = (assinatura, indice)
+    return indice
+
+
+def buscar_ofertas(conn, busca, tipo="have", limite=None):
+    """
+    Busca ofertas cujo nome (PT ou EN) contenha a busca, com as mesmas regras
+    do IndiceBusca em memória: trecho do nome sem acentos, " / " dividindo a
+    busca, ranking (exato, prefixo, palavra, trecho) e o mesmo limite.
+
+    Retorna:
+      Lista de dicts com Jogador, WhatsApp, Carta e Qtd, no formato usado
+      pelo resultado da busca do app.
+    """
+    from busca_cartas import LIMITE_BUSCA
+
+    limite = LIMITE_BUSCA if limite is None else limite
+    indice = indice_nomes(conn, tipo)
+    chaves = [indice.chaves[posicao] for posicao in indice.posicoes(busca)]
+    resultado = []
+    # As ofertas saem carta a carta, na ordem do ranking, em lotes
+    for inicio in range(0, len(chaves), LOTE_CARTAS):
+        lote = chaves[inicio:inicio + LOTE_CARTAS]
+        linhas = conn.execute(
+            f"""
+            SELECT c.chave, j.nome, j.whatsapp, c.nome, o.quantidade
+            FROM cartas c
+            JOIN ofertas o ON o.carta_id = c.id AND o.tipo = ?
+            JOIN jogadores j ON j.id = o.jogador_id
+            WHERE c.chave IN ({", ".join("?" * len(lote))})
+            ORDER BY o.id
+            """,
+            (tipo, *lote),
+        )
+        por_chave = {}
+        for chave, jogador, whatsapp, carta, qtd in linhas:
+            por_chave.setdefault(chave, []).append(
+                {"Jogador": jogador, "WhatsApp": whatsapp, "Carta": carta, "Qtd": qtd})
+        for chave in lote:
+            for oferta in por_chave.get(chave, []):
+                resultado.append(oferta)
+                if len(resultado) >= limite:
+                    return resultado
+    return resultado
+
+
+def versao_banco(caminho=CAMINHO_BANCO):
+    """Versão do banco para chaves de cache (muda a cada gravação do scraper)."""
+    info = os.stat(caminho)
+    return f"sqlite:{info.st_mtime_ns}:{info.st_size}"
@@ -0,0 +1,2 @@
+# Benchmarks da LigaSBS: comunidades sintéticas no formato do cartas.json e
+# medição de carga, busca, comparativo e renderização das tabelas.
@@ -0,0 +1,100 @@
+import argparse
+import json
+import platform
+from datetime import datetime, timezone
+
+from benchmarks.executar import commit_atual, cronometrar
+from benchmarks.gerador import gerar_comunidade
+from ciclos_trocas import CiclosTrocas
+
+# ======================== BENCHMARK DAS TROCAS EM CADEIA ============
+#
+#   python -m benchmarks.ciclos --saida resultados_ciclos.json
+#   python -m benchmarks.ciclos --tamanhos 30 300 3000 5000 --max-tamanho 5
+#
+# Para cada tamanho de comunidade sintética mede a montagem do grafo
+# (arestas em CSR + componentes fortemente conexas), a busca dos melhores
+# ciclos da liga e a busca por jogador. Nas comunidades pequenas confere o
+# resultado com a enumeração por força bruta de todos os ciclos.
+
+TAMANHOS_PADRAO = [30, 300, 3000]
+LIMITE_FORCA_BRUTA = 30
+JOGADORES_AMOSTRA = 20
+
+
+def ciclos_forca_bruta(motor, max_tamanho, min_tamanho):
+    """Todos os ciclos (cartas, caminho), cada um a partir do seu menor índice."""
+    total = len(motor.nomes)
+    pesos = [dict(zip(*(lista.tolist() for lista in motor.saidas(a)))) for a in range(total)]
+    encontrados = []
+
+    def seguir(caminho, cartas):
+        atual, origem = caminho[-1], caminho[0]
+        if len(caminho) >= min_tamanho and origem in pesos[atual]:
+            encontrados.append((cartas + pesos[atual][origem], list(caminho)))
+        if len(caminho) == max_tamanho:
+            return
+        for proximo in range(origem + 1, total):
+            if proximo not in caminho and proximo in pesos[atual]:
+                caminho.append(proximo)
+                seguir(caminho, cartas + pesos[atual][proximo])
+                caminho.pop()
+
+    for origem in range(total):
+        seguir([origem], 0)
+    return encontrados
+
+
+def executar_tamanho(total_jogadores, max_tamanho=4, limite=20, semente=42):
+    jogadores = gerar_comunidade(total_jogadores, semente)
+    resultado = {}
+    motor, resultado["montagem"] = cronometrar(lambda: CiclosTrocas(jogadores), repeticoes=1)
+    resultado["arestas"] = motor.arestas
+    resultado["componentes"] = int(motor.componente.max()) + 1
+    resultado["jogadores_em_ciclos"] = int((motor.componente >= 0).sum())
+
+    ciclos, resultado["liga"] = cronometrar(lambda: motor.ciclos(max_tamanho, limite=limite))
+    resultado["melhor_ciclo_cartas"] = ciclos[0]["cartas"] if ciclos else 0
+
+    amostra = [j["nome"] for j in jogadores[::max(1, total_jogadores // JOGADORES_AMOSTRA)]]
+
+    def por_jogador():
+        motor._por_jogador.clear()  # sem a memoização, para medir a busca
+        return [motor.ciclos_do_jogador(nome, max_tamanho) for nome in amostra]
+    _, resultado["por_jogador_amostra"] = cronometrar(por_jogador)
+    resultado["jogadores_amostra"] = len(amostra)
+
+    if total_jogadores <= LIMITE_FORCA_BRUTA:
+        todos, resultado["forca_bruta"] = cronometrar(
+            lambda: ciclos_forca_bruta(motor, max_tamanho, 3), repeticoes=1)
+        esperado = sorted((cartas for cartas, _ in todos), reverse=True)[:limite]
+        resultado["ciclos_total"] = len(todos)
+        resultado["confere_forca_bruta"] = [c["cartas"] for c in ciclos] == esperado
+    return resultado
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark da busca de trocas em cadeia.")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=TAMANHOS_PADRAO,
+                        help="quantidades de jogadores das comunidades sintéticas")
+    parser.add_argument("--max-tamanho", type=int, default=4, help="máximo de jogadores por ciclo")
+    parser.add_argument("--limite", type=int, default=20, help="quantos ciclos buscar na liga")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--saida", default="resultados_ciclos.json")
+    args = parser.parse_args()
+
+    relatorio = {
+        "commit": commit_atual(),
+        "data": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "max_tamanho": args.max_tamanho,
+        "resultados": {},
+    }
+    for tamanho in args.tamanhos:
+        print(f"Comunidade com {tamanho} jogadores...")
+        relatorio["resultados"][str(tamanho)] = executar_tamanho(
+            tamanho, args.max_tamanho, args.limite, args.semente)
+
+    with open(args.saida, "w", encoding="utf-8") as f:
+        json.dump(relatorio, f, ensure_ascii=False, indent=2)
+    print(f"Resultados salvos em {args.saida}.")
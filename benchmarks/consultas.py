@@ -0,0 +1,120 @@
+import argparse
+import json
+import os
+import platform
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from armazem_cartas import ArmazemCartas
+from benchmarks.executar import commit_atual, consultas_de_busca
+from benchmarks.gerador import gerar_comunidade, salvar_comunidade
+from servidor_consultas import ServidorConsultas, consultar, percentil
+
+# ======================== BENCHMARK DA API DE CONSULTAS =============
+#
+#   python -m benchmarks.consultas --saida resultados_consultas.json
+#   python -m benchmarks.consultas --tamanhos 300 3000 --clientes 16
+#
+# Sobe o servidor_consultas.py numa porta livre com uma comunidade
+# sintética e dispara requisições de `clientes` threads ao mesmo tempo
+# (busca, listas, comparativo e ciclos misturados). Mede a latência vista
+# pelo cliente (p50/p99 por rota) e guarda também o /metricas do servidor.
+# Cliente e servidor dividem o mesmo processo (e o GIL): a latência do
+# cliente é um teto; a do /metricas é a do servidor sozinho.
+
+TAMANHOS_PADRAO = [30, 300, 3000]
+CLIENTES_PADRAO = 8
+REQUISICOES_PADRAO = 2000
+
+
+def _requisicoes(jogadores, total, rng):
+    """Mistura parecida com a de um bot: muita busca, algumas listas e trocas."""
+    buscas = consultas_de_busca(jogadores)
+    nomes = [j["nome"] for j in jogadores]
+    pedidos = []
+    for _ in range(total):
+        sorteio = rng.random()
+        if sorteio < 0.6:
+            pedidos.append(("/busca", "/busca", {"q": rng.choice(buscas), "limite": 50}))
+        else:
+            consulta = "have" if sorteio < 0.75 else "want" if sorteio < 0.85 else "trocas" if sorteio < 0.97 else "ciclos"
+            pedidos.append((f"/jogadores/{{nome}}/{consulta}", ["jogadores", rng.choice(nomes), consulta], {}))
+    return pedidos
+
+
+def executar_tamanho(total_jogadores, pasta, clientes, requisicoes, semente=42):
+    caminho = os.path.join(pasta, f"cartas_{total_jogadores}.json")
+    jogadores = gerar_comunidade(total_jogadores, semente)
+    salvar_comunidade(jogadores, caminho)
+
+    servidor = ServidorConsultas(("127.0.0.1", 0), ArmazemCartas(caminho))
+    inicio = time.perf_counter()
+    indice = servidor.indice()
+    indice.ciclos()
+    resultado = {"montagem_ms": round((time.perf_counter() - inicio) * 1000, 3)}
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{servidor.server_address[1]}"
+
+    tempos = {}
+    lock = threading.Lock()
+
+    def pedir(pedido):
+        rota, caminho_url, parametros = pedido
+        inicio = time.perf_counter()
+        consultar(url, caminho_url, timeout=30, **parametros)
+        ms = (time.perf_counter() - inicio) * 1000
+        with lock:
+            tempos.setdefault(rota, []).append(ms)
+
+    pedidos = _requisicoes(jogadores, requisicoes, random.Random(semente))
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clientes) as executor:
+        list(executor.map(pedir, pedidos))
+    segundos = time.perf_counter() - inicio
+
+    resultado["requisicoes_por_s"] = round(len(pedidos) / segundos, 1)
+    resultado["cliente"] = {
+        rota: {
+            "requisicoes": len(lista),
+            "p50_ms": round(percentil(sorted(lista), 50), 3),
+            "p99_ms": round(percentil(sorted(lista), 99), 3),
+        }
+        for rota, lista in sorted(tempos.items())
+    }
+    resultado["servidor"] = consultar(url, "/metricas")
+    servidor.shutdown()
+    servidor.server_close()
+    os.remove(caminho)
+    return resultado
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de latência da API de consultas.")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=TAMANHOS_PADRAO,
+                        help="quantidades de jogadores das comunidades sintéticas")
+    parser.add_argument("--clientes", type=int, default=CLIENTES_PADRAO, help="requisições simultâneas")
+    parser.add_argument("--requisicoes", type=int, default=REQUISICOES_PADRAO)
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--saida", default="resultados_consultas.json")
+    args = parser.parse_args()
+
+    relatorio = {
+        "commit": commit_atual(),
+        "data": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "clientes": args.clientes,
+        "resultados": {},
+    }
+    with tempfile.TemporaryDirectory() as pasta:
+        for tamanho in args.tamanhos:
+            print(f"Comunidade com {tamanho} jogadores...")
+            relatorio["resultados"][str(tamanho)] = executar_tamanho(
+                tamanho, pasta, args.clientes, args.requisicoes, args.semente)
+
+    with open(args.saida, "w", encoding="utf-8") as f:
+        json.dump(relatorio, f, ensure_ascii=False, indent=2)
+    print(f"Resultados salvos em {args.saida}.")
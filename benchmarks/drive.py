@@ -0,0 +1,186 @@
+import argparse
+import hashlib
+import json
+import platform
+import re
+import sys
+from datetime import datetime, timezone
+
+from benchmarks.executar import commit_atual
+from envio_drive import ATUALIZADO, CRIADO, IGUAL, enviar_csv
+
+# ======================== CONFERÊNCIA DO ENVIO AO DRIVE =============
+#
+#   python -m benchmarks.drive --saida resultados_drive.json
+#
+# Sem Google: um Drive falso em memória com a interface files().list/
+# create/update do googleapiclient (consultas por appProperties, pastas e
+# upload resumível parte a parte). Confere que envio_drive.enviar_csv:
+#
+#   - cria o arquivo no primeiro envio, em várias partes;
+#   - pula o envio quando o conteúdo não mudou;
+#   - atualiza no lugar (mesmo id, sem cópia nova) quando mudou;
+#   - não mexe no arquivo de outro usuário com a mesma lista;
+#   - separa a mesma lista do mesmo usuário em pastas diferentes;
+#   - recusa enviar quando há mais de um arquivo com as mesmas marcas.
+#
+# Termina com status 1 se alguma conferência falhar.
+
+TAMANHO_PARTE = 256 * 1024  # a menor parte que o Drive aceita
+
+_LITERAL = r"'((?:[^'\\]|\\.)*)'"
+_MARCA = re.compile(r"appProperties has \{ key=" + _LITERAL + r" and value=" + _LITERAL + r" \}")
+_PASTA = re.compile(_LITERAL + r" in parents")
+
+
+def _texto(literal):
+    return re.sub(r"\\(.)", r"\1", literal)
+
+
+class _Requisicao:
+    def __init__(self, executar):
+        self._executar = executar
+
+    def execute(self):
+        return self._executar()
+
+
+class _Upload:
+    """Upload resumível falso: lê a mídia parte a parte, como o next_chunk do googleapiclient."""
+
+    def __init__(self, drive, media, concluir):
+        self.drive = drive
+        self.media = media
+        self.concluir = concluir
+        self.enviado = b""
+
+    def next_chunk(self, num_retries=0):
+        parte = self.media.getbytes(len(self.enviado), self.media.chunksize())
+        self.enviado += parte
+        self.drive.chamadas["partes"] += 1
+        if len(self.enviado) < self.media.size():
+            return None, None
+        return None, self.concluir(self.enviado)
+
+
+class DriveFalso:
+    def __init__(self):
+        self.arquivos = {}
+        self.chamadas = {"list": 0, "create": 0, "update": 0, "partes": 0}
+        self._proximo_id = 1
+
+    def files(self):
+        return self
+
+    def adicionar(self, nome, conteudo, propriedades=None, pasta=None):
+        """Arquivo criado por fora do envio_drive (ex.: um upload antigo repetido)."""
+        id_arquivo = f"arquivo{self._proximo_id}"
+        self._proximo_id += 1
+        self.arquivos[id_arquivo] = {
+            "id": id_arquivo, "name": nome, "appProperties": dict(propriedades or {}),
+            "parents": [pasta] if pasta else ["raiz"], "conteudo": conteudo,
+            "md5Checksum": hashlib.md5(conteudo).hexdigest(),
+        }
+        return id_arquivo
+
+    def _atende(self, arquivo, q):
+        for chave, valor in _MARCA.findall(q):
+            if arquivo["appProperties"].get(_texto(chave)) != _texto(valor):
+                return False
+        return all(_texto(pasta) in arquivo["parents"] for pasta in _PASTA.findall(q))
+
+    def list(self, q, spaces="drive", fields=None, pageSize=100):
+        def executar():
+            self.chamadas["list"] += 1
+            achados = [a for a in self.arquivos.values() if self._atende(a, q)]
+            return {"files": [{"id": a["id"], "md5Checksum": a["md5Checksum"]} for a in achados[:pageSize]]}
+        return _Requisicao(executar)
+
+    def create(self, body, media_body, fields=None):
+        self.chamadas["create"] += 1
+
+        def concluir(conteudo):
+            pasta = (body.get("parents") or [None])[0]
+            return {"id": self.adicionar(body["name"], conteudo, body.get("appProperties"), pasta)}
+        return _Upload(self, media_body, concluir)
+
+    def update(self, fileId, media_body, fields=None):
+        self.chamadas["update"] += 1
+
+        def concluir(conteudo):
+            arquivo = self.arquivos[fileId]
+            arquivo["conteudo"] = conteudo
+            arquivo["md5Checksum"] = hashlib.md5(conteudo).hexdigest()
+            return {"id": fileId}
+        return _Upload(self, media_body, concluir)
+
+
+def _csv(linhas, carta="Sol Ring"):
+    return ("Carta,Quantidade\n" + f"{carta},1\n" * linhas).encode("utf-8")
+
+
+def conferir():
+    drive = DriveFalso()
+    conferencias = {}
+
+    def enviar(usuario, conteudo, pasta_id=None):
+        antes = dict(drive.chamadas)
+        retorno = enviar_csv(usuario, "HAVE.csv", conteudo, pasta_id, servico=drive, tamanho_parte=TAMANHO_PARTE)
+        return retorno, {k: drive.chamadas[k] - antes[k] for k in antes}
+
+    grande = _csv(60_000)  # ~660 KB
+    partes = -(-len(grande) // TAMANHO_PARTE)
+    (id_belandra, situacao), chamadas = enviar("Belandra", grande)
+    conferencias["cria_no_primeiro_envio"] = (
+        situacao == CRIADO and chamadas["create"] == 1 and chamadas["partes"] == partes > 1
+        and drive.arquivos[id_belandra]["conteudo"] == grande
+        and drive.arquivos[id_belandra]["name"] == "Belandra - HAVE.csv")
+
+    (id_igual, situacao), chamadas = enviar("Belandra", grande)
+    conferencias["mesmo_conteudo_sem_envio"] = (
+        situacao == IGUAL and id_igual == id_belandra and chamadas["partes"] == 0)
+
+    novo = _csv(10, "Counterspell")
+    (id_atualizado, situacao), chamadas = enviar("Belandra", novo)
+    conferencias["atualiza_no_lugar"] = (
+        situacao == ATUALIZADO and id_atualizado == id_belandra and chamadas["create"] == 0
+        and drive.arquivos[id_belandra]["conteudo"] == novo and len(drive.arquivos) == 1)
+
+    (id_tamires, situacao), _ = enviar("Tamires", _csv(3))
+    conferencias["outro_usuario_nao_sobrescreve"] = (
+        situacao == CRIADO and id_tamires != id_belandra and drive.arquivos[id_belandra]["conteudo"] == novo)
+
+    (id_pasta, situacao), _ = enviar("Belandra", novo, pasta_id="pasta_liga")
+    conferencias["pasta_separada"] = situacao == CRIADO and id_pasta not in (id_belandra, id_tamires)
+
+    # Dois HAVE.csv do mesmo usuário (ex.: criados à mão): não escolhe um ao acaso
+    drive.adicionar("Tamires - HAVE (1).csv", _csv(2), {"usuario": "Tamires", "lista": "HAVE.csv"})
+    try:
+        enviar("Tamires", _csv(5))
+        conferencias["duplicados_recusados"] = False
+    except ValueError:
+        conferencias["duplicados_recusados"] = drive.arquivos[id_tamires]["conteudo"] == _csv(3)
+
+    return {"chamadas_api": drive.chamadas, "arquivos": len(drive.arquivos), "confere": conferencias}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Confere o envio de CSVs com um Drive falso.")
+    parser.add_argument("--saida", default="resultados_drive.json")
+    args = parser.parse_args()
+
+    relatorio = {
+        "commit": commit_atual(),
+        "data": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "resultados": conferir(),
+    }
+    with open(args.saida, "w", encoding="utf-8") as f:
+        json.dump(relatorio, f, ensure_ascii=False, indent=2)
+
+    falhas = [nome for nome, ok in relatorio["resultados"]["confere"].items() if not ok]
+    print(f"Resultados salvos em {args.saida}.")
+    if falhas:
+        print("Não confere: " + "; ".join(falhas))
+        sys.exit(1)
+    print("Envio ao Drive confere.")
@@ -0,0 +1,192 @@
+import argparse
+import gc
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+from armazem_cartas import ArmazemCartas
+from benchmarks import legado
+from benchmarks.gerador import gerar_comunidade, salvar_comunidade
+from busca_cartas import IndiceBusca, dobrar_acentos
+from tabelas_html import tabela_html_cartas
+from trocas import MotorTrocas
+from valores_cartas import preco_centavos, quantidade_int
+from visao_ofertas import VisaoOfertas
+
+# ======================== BENCHMARKS ================================
+#
+#   python -m benchmarks.executar --saida resultados.json
+#   python -m benchmarks.executar --tamanhos 30 300 3000 30000
+#
+# Para cada tamanho de comunidade gera um cartas.json sintético e mede a
+# carga das cartas (tempo e memória), a busca por nome, o comparativo
+# entre jogadores, o valor das listas/faixa de preço, os filtros por faceta
+# e a renderização das tabelas. As versões antigas (legado.py) só rodam nas
+# comunidades pequenas: a carga relê o arquivo inteiro a cada chamada e o
+# comparativo cruza todos os pares de jogadores.
+
+TAMANHOS_PADRAO = [30, 300, 3000]  # 30000 precisa de ~5 GB de RAM
+LIMITE_LEGADO_CARGA = 30
+LIMITE_LEGADO = 300
+COLUNAS_HAVE = ["Nome", "Quantidade", "Qualidade", "Extra", "Idioma", "Preço Venda (R$)"]
+COLUNAS_WANT = ["Nome", "Quantidade", "Qualidade", "Extra", "Idioma"]
+
+
+def cronometrar(funcao, repeticoes=3):
+    """Roda a função `repeticoes` vezes e devolve o último retorno e os tempos em ms."""
+    tempos = []
+    retorno = None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        retorno = funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return retorno, {"min_ms": round(min(tempos), 3), "mediana_ms": round(statistics.median(tempos), 3)}
+
+
+def memoria_carga(caminho, compactar):
+    """MB que continuam alocados depois da carga das cartas (tracemalloc)."""
+    gc.collect()
+    tracemalloc.start()
+    jogadores = ArmazemCartas(caminho, compactar=compactar).jogadores()
+    gc.collect()
+    memoria = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del jogadores
+    return round(memoria / 1024 / 1024, 1)
+
+
+def memoria_em_processo_novo(caminho, compactar):
+    # Processo limpo para cada medição: textos internados, catálogo de ids e
+    # caches de uma carga não podem ser aproveitados pela outra
+    with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn")) as processo:
+        return processo.submit(memoria_carga, caminho, compactar).result()
+
+
+def consultas_de_busca(jogadores, quantidade=20):
+    """Buscas parecidas com as reais: começo do nome PT, palavra do EN e 2 letras."""
+    nomes = [c["Nome"] for j in jogadores for c in j["have"]][::97][:quantidade]
+    consultas = []
+    for nome in nomes:
+        nome_pt, _, nome_en = nome.partition(" / ")
+        consultas.append(dobrar_acentos(nome_pt)[:6])
+        consultas.append(nome_en.split()[0].lower())
+    consultas.append("ab")
+    return consultas
+
+
+def executar_tamanho(total_jogadores, pasta, semente=42):
+    caminho = os.path.join(pasta, f"cartas_{total_jogadores}.json")
+    salvar_comunidade(gerar_comunidade(total_jogadores, semente), caminho)
+    resultado = {"arquivo_bytes": os.path.getsize(caminho)}
+
+    # --- carga das cartas (extrair_cartas_ligamagic) ---
+    armazem = ArmazemCartas(caminho)
+    inicio = time.perf_counter()
+    jogadores = armazem.jogadores()
+    resultado["carga_fria_ms"] = round((time.perf_counter() - inicio) * 1000, 3)
+    resultado["ofertas_have"] = sum(len(j["have"]) for j in jogadores)
+    resultado["ofertas_want"] = sum(len(j["want"]) for j in jogadores)
+
+    def consultar_todos():
+        for jogador in jogadores:
+            armazem.cartas_do_jogador(jogador["nome"], "have")
+            armazem.cartas_do_jogador(jogador["nome"], "want")
+    _, resultado["carga_por_rerun"] = cronometrar(consultar_todos)
+    if total_jogadores <= LIMITE_LEGADO_CARGA:
+        def consultar_todos_legado():
+            for jogador in jogadores:
+                legado.extrair_cartas_ligamagic(caminho, jogador["nome"], "have")
+                legado.extrair_cartas_ligamagic(caminho, jogador["nome"], "want")
+        _, resultado["carga_por_rerun_legado"] = cronometrar(consultar_todos_legado, repeticoes=1)
+
+    # --- memória das cartas carregadas: dicts do JSON x Carta (carta_compacta.py) ---
+    resultado["memoria_dicts_mb"] = memoria_em_processo_novo(caminho, compactar=False)
+    resultado["memoria_compacta_mb"] = memoria_em_processo_novo(caminho, compactar=True)
+    resultado["memoria_economia"] = round(1 - resultado["memoria_compacta_mb"] / resultado["memoria_dicts_mb"], 3)
+
+    # --- busca por nome ---
+    consultas = consultas_de_busca(jogadores)
+    resultado["consultas_busca"] = len(consultas)
+    indice, resultado["busca_montagem_indice"] = cronometrar(lambda: IndiceBusca(jogadores), repeticoes=1)
+    _, resultado["busca_consultas"] = cronometrar(lambda: [indice.buscar(c) for c in consultas])
+    if total_jogadores <= LIMITE_LEGADO * 10:
+        _, resultado["busca_consultas_legado"] = cronometrar(
+            lambda: [legado.buscar(jogadores, c) for c in consultas], repeticoes=1)
+
+    # --- comparativo entre jogadores ---
+    motor, resultado["comparativo_montagem"] = cronometrar(lambda: MotorTrocas(jogadores), repeticoes=1)
+    _, resultado["comparativo_todos"] = cronometrar(
+        lambda: sum(len(motor.comparativo(j["nome"])) for j in jogadores))
+    if total_jogadores <= LIMITE_LEGADO:
+        _, resultado["comparativo_todos_legado"] = cronometrar(
+            lambda: legado.comparar_todos(jogadores), repeticoes=1)
+
+    # --- valor das listas e faixa de preço ---
+    visao, resultado["valores_montagem"] = cronometrar(lambda: VisaoOfertas(jogadores), repeticoes=1)
+    _, resultado["valores_por_jogador"] = cronometrar(visao.valor_por_jogador)
+    _, resultado["valores_faixa_ordenada"] = cronometrar(
+        lambda: [visao.selecionar(j["nome"], 100, 1000, "asc") for j in jogadores])
+    _, resultado["facetas_montagem"] = cronometrar(visao.facetas, repeticoes=1)
+    _, resultado["facetas_filtro"] = cronometrar(
+        lambda: visao.filtrar({"Qualidade": ["NM"], "Extra": ["Foil"], "Preço": ["Até R$ 1", "R$ 1 a 5"]}))
+    if total_jogadores <= LIMITE_LEGADO * 10:
+        # Como seria sem os campos numéricos: reinterpretar os textos a cada consulta
+        def valores_por_texto():
+            return {
+                j["nome"]: sum(quantidade_int(c["Quantidade"]) * (preco_centavos(c["Preço Venda (R$)"]) or 0)
+                               for c in j["have"])
+                for j in jogadores
+            }
+        _, resultado["valores_por_jogador_texto"] = cronometrar(valores_por_texto, repeticoes=1)
+
+    # --- renderização das tabelas ---
+    def renderizar():
+        total = 0
+        for jogador in jogadores:
+            total += len(tabela_html_cartas(jogador["have"], colunas_desejadas=COLUNAS_HAVE))
+            total += len(tabela_html_cartas(jogador["want"], colunas_desejadas=COLUNAS_WANT))
+        return total
+    resultado["html_bytes"], resultado["renderizacao"] = cronometrar(renderizar)
+
+    os.remove(caminho)
+    return resultado
+
+
+def commit_atual():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks de carga, busca, comparativo e renderização.")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=TAMANHOS_PADRAO,
+                        help="quantidades de jogadores das comunidades sintéticas")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--saida", default="resultados_benchmark.json")
+    args = parser.parse_args()
+
+    relatorio = {
+        "commit": commit_atual(),
+        "data": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "resultados": {},
+    }
+    with tempfile.TemporaryDirectory() as pasta:
+        for tamanho in args.tamanhos:
+            print(f"Comunidade com {tamanho} jogadores...")
+            relatorio["resultados"][str(tamanho)] = executar_tamanho(tamanho, pasta, args.semente)
+
+    with open(args.saida, "w", encoding="utf-8") as f:
+        json.dump(relatorio, f, ensure_ascii=False, indent=2)
+    print(f"Resultados salvos em {args.saida}.")
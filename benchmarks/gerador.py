@@ -0,0 +1,99 @@
+import argparse
+import json
+import random
+
+# ======================== GERADOR DE COMUNIDADES ====================
+#
+# Gera um cartas.json sintético com o mesmo formato e formato de
+# distribuição do real: tamanhos das listas sorteados a partir das listas
+# de hoje, cartas populares aparecendo em muitas listas (Zipf) e os
+# mesmos valores de Qualidade/Extra/Idioma/Quantidade.
+
+# Tamanhos das listas Have/Want dos 29 jogadores atuais
+TAMANHOS_HAVE = [0, 0, 0, 0, 0, 0, 0, 18, 28, 56, 77, 108, 117, 120, 127, 128, 144, 145, 152,
+                 165, 179, 205, 242, 257, 352, 574, 608, 618, 672]
+TAMANHOS_WANT = [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 7, 16, 18, 26, 30, 33, 35, 37, 44, 52,
+                 53, 56, 56, 60, 131, 460]
+
+QUALIDADES = (["NM"] * 67) + (["-"] * 19) + (["M"] * 12) + ["SP", "MP"]
+EXTRAS = ([""] * 94) + ["Foil"] * 5 + ["Promo"]
+IDIOMAS = ([""] * 70) + ["-"] * 30
+QUANTIDADES = (["1x"] * 78) + (["2x"] * 13) + (["3x"] * 6) + (["4x"] * 2) + ["5x"]
+EDICOES = ["fin", "tdm", "fdn", "eoe", "dft", "mkm", "blb", "dsk", "otj", "lci", "woe", "big", "tp", "c21"]
+
+SILABAS_PT = ["a", "bra", "são", "dor", "ção", "lu", "fe", "ri", "ma", "go", "tá", "ne", "vé", "ro", "chi", "lha"]
+SILABAS_EN = ["ab", "rade", "gob", "lin", "sol", "ring", "dra", "gon", "fire", "storm", "an", "gel", "shade", "blade"]
+
+TOTAL_CARTAS = 25000
+
+
+def _palavra(rng, silabas):
+    return "".join(rng.choice(silabas) for _ in range(rng.randint(2, 4))).capitalize()
+
+
+def gerar_catalogo(rng, total=TOTAL_CARTAS):
+    catalogo = []
+    for i in range(total):
+        nome_pt = " ".join(_palavra(rng, SILABAS_PT) for _ in range(rng.randint(1, 3)))
+        nome_en = " ".join(_palavra(rng, SILABAS_EN) for _ in range(rng.randint(1, 3))) + f" {i}"
+        catalogo.append((f"{nome_pt} / {nome_en}", nome_en, rng.choice(EDICOES)))
+    return catalogo
+
+
+def _sortear_cartas(rng, catalogo, pesos, quantidade):
+    cartas = []
+    for nome, nome_en, edicao in rng.choices(catalogo, cum_weights=pesos, k=quantidade):
+        centavos = int(rng.paretovariate(1.2) * 10)
+        cartas.append({
+            "Nome": nome,
+            "Qualidade": rng.choice(QUALIDADES),
+            "Extra": rng.choice(EXTRAS),
+            "Idioma": rng.choice(IDIOMAS),
+            "Quantidade": rng.choice(QUANTIDADES),
+            "Preço Venda (R$)": f"{centavos // 100},{centavos % 100:02d}",
+            "Imagem": f"https://ligamagic.com.br/?view=cards/card&card={nome_en}&ed={edicao}",
+        })
+    return cartas
+
+
+def gerar_comunidade(jogadores, semente=42):
+    """
+    Parâmetros:
+      jogadores (int): quantidade de jogadores.
+      semente (int): semente do sorteio (mesma semente = mesmo arquivo).
+
+    Retorna:
+      Lista de jogadores no formato do cartas.json.
+    """
+    rng = random.Random(semente)
+    catalogo = gerar_catalogo(rng)
+    # Popularidade Zipf: a carta i aparece com peso 1 / (i + 1)
+    pesos, acumulado = [], 0.0
+    for i in range(len(catalogo)):
+        acumulado += 1.0 / (i + 1)
+        pesos.append(acumulado)
+
+    comunidade = []
+    for i in range(jogadores):
+        comunidade.append({
+            "nome": f"Jogador {i:05d}",
+            "whatsapp": f"(47) 9{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}" if rng.random() < 0.5 else "",
+            "have": _sortear_cartas(rng, catalogo, pesos, rng.choice(TAMANHOS_HAVE)),
+            "want": _sortear_cartas(rng, catalogo, pesos, rng.choice(TAMANHOS_WANT)),
+        })
+    return comunidade
+
+
+def salvar_comunidade(jogadores, caminho):
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump(jogadores, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gera um cartas.json sintético.")
+    parser.add_argument("jogadores", type=int)
+    parser.add_argument("saida")
+    parser.add_argument("--semente", type=int, default=42)
+    args = parser.parse_args()
+    salvar_comunidade(gerar_comunidade(args.jogadores, args.semente), args.saida)
+    print(f"{args.saida} gerado com {args.jogadores} jogadores.")
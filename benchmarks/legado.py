@@ -0,0 +1,48 @@
+import json
+
+# ======================== IMPLEMENTAÇÕES ANTIGAS ====================
+#
+# Cópias dos laços que o app.py usava antes do armazém, do índice de busca
+# e do motor de trocas, para comparar nos benchmarks.
+
+
+def extrair_cartas_ligamagic(caminho, nome_jogador, tipo='have'):
+    with open(caminho, encoding="utf-8") as f:
+        jogadores = json.load(f)
+
+    for jogador in jogadores:
+        if jogador["nome"].strip().lower() == nome_jogador.strip().lower():
+            return jogador.get(tipo, [])
+    return []
+
+
+def buscar(jogadores, busca):
+    busca_normalizada = busca.strip().lower()
+    resultado = []
+    for jogador in jogadores:
+        for carta in jogador.get("have", []):
+            if busca_normalizada in carta.get("Nome", "").lower():
+                resultado.append({
+                    "Jogador": jogador["nome"],
+                    "WhatsApp": jogador["whatsapp"],
+                    "Carta": carta["Nome"],
+                    "Qtd": carta.get("Quantidade", "")
+                })
+    return resultado
+
+
+def comparar_todos(jogadores):
+    total = 0
+    for jogador in jogadores:
+        for outro in jogadores:
+            if outro["nome"] == jogador["nome"]:
+                continue
+            nomes_have = {c["Nome"] for c in jogador["have"] if "Nome" in c}
+            nomes_want_outro = {c["Nome"] for c in outro["want"] if "Nome" in c}
+            em_demand = nomes_have & nomes_want_outro
+            nomes_want = {c["Nome"] for c in jogador["want"] if "Nome" in c}
+            nomes_have_outro = {c["Nome"] for c in outro["have"] if "Nome" in c}
+            pode_trocar = nomes_want & nomes_have_outro
+            if em_demand or pode_trocar:
+                total += 1
+    return total
@@ -0,0 +1,160 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from benchmarks.executar import commit_atual
+from cache_planilha import CachePlanilha
+
+# ======================== CONFERÊNCIA DO CACHE DA PLANILHA ==========
+#
+#   python -m benchmarks.planilha --saida resultados_planilha.json
+#
+# Sem Google: uma aba falsa (get_all_values/get_all_records, com latência
+# de API simulada) e uma revisão falsa no lugar do Drive. Para as duas
+# formas de revalidar (revisão do Drive e hash das células) confere que:
+#
+#   - dentro do ttl o snapshot sai do disco, sem chamar a API;
+#   - vencido o ttl, ler() devolve o snapshot na hora e revalida em
+#     segundo plano (stale-while-revalidate);
+#   - sem edição, a revalidação não relê a planilha inteira (e, com a
+#     revisão do Drive, nem abre a aba);
+#   - uma edição fora da primeira coluna (ex.: o WhatsApp) chega ao app;
+#   - com a API fora do ar, o último snapshot continua sendo servido.
+#
+# Termina com status 1 se alguma conferência falhar.
+
+LATENCIA_API = 0.2  # segundos por chamada da aba falsa
+
+
+class AbaFalsa:
+    def __init__(self, linhas):
+        self.linhas = [list(linha) for linha in linhas]
+        self.revisao = 1
+        self.fora_do_ar = False
+        self.chamadas = {"abrir": 0, "get_all_values": 0, "get_all_records": 0, "revisao": 0}
+
+    def _chamar(self, nome):
+        time.sleep(LATENCIA_API)
+        self.chamadas[nome] += 1
+        if self.fora_do_ar:
+            raise ConnectionError("API do Google indisponível (simulado)")
+
+    def abrir(self):
+        """No lugar de open_by_url(...).worksheet(...): uma chamada à API do Sheets."""
+        self._chamar("abrir")
+        return self
+
+    def get_all_values(self):
+        self._chamar("get_all_values")
+        return [list(linha) for linha in self.linhas]
+
+    def get_all_records(self):
+        self._chamar("get_all_records")
+        cabecalho, *linhas = self.linhas
+        return [dict(zip(cabecalho, linha)) for linha in linhas]
+
+    def obter_revisao(self):
+        self._chamar("revisao")
+        return self.revisao
+
+    def editar(self, linha, coluna, valor):
+        self.linhas[linha][coluna] = valor
+        self.revisao += 1
+
+
+def _esperar_revalidacao(cache, timeout=10):
+    limite = time.time() + timeout
+    while cache._revalidando and time.time() < limite:
+        time.sleep(0.01)
+
+
+def _ler(cache):
+    inicio = time.perf_counter()
+    registros = cache.ler()
+    return registros, round((time.perf_counter() - inicio) * 1000, 3)
+
+
+def conferir(modo, pasta):
+    aba = AbaFalsa([
+        ["Jogador", "Whatsapp (opcional)", "Link do Have", "Link do Want"],
+        ["Belandra", "47 99999-0001", "https://ligamagic.com.br/?view=colecao&id=1", ""],
+        ["Tamires", "", "https://ligamagic.com.br/?view=colecao&id=2", ""],
+    ])
+    cache = CachePlanilha(
+        aba.abrir, caminho=os.path.join(pasta, f"cache_{modo}.json"), ttl=60,
+        obter_revisao=aba.obter_revisao if modo == "revisao_drive" else None,
+    )
+    conferencias = {}
+    tempos = {}
+
+    registros, tempos["primeira_leitura_ms"] = _ler(cache)
+    conferencias["primeira_leitura_completa"] = (
+        cache.estatisticas["leituras_completas"] == 1 and registros[0]["Jogador"] == "Belandra")
+
+    chamadas = dict(aba.chamadas)
+    _, tempos["dentro_do_ttl_ms"] = _ler(cache)
+    conferencias["dentro_do_ttl_sem_api"] = aba.chamadas == chamadas
+
+    # ttl vencido, planilha sem edição: resposta imediata e revalidação sem releitura
+    cache.ttl = 0
+    aberturas = aba.chamadas["abrir"]
+    registros, tempos["ttl_vencido_ms"] = _ler(cache)
+    conferencias["ttl_vencido_sem_esperar_api"] = tempos["ttl_vencido_ms"] < LATENCIA_API * 1000 / 2
+    _esperar_revalidacao(cache)
+    conferencias["sem_edicao_sem_releitura"] = (
+        cache.estatisticas["revalidacoes"] == 2 and cache.estatisticas["leituras_completas"] == 1)
+    if modo == "revisao_drive":
+        conferencias["sem_edicao_sem_abrir_aba"] = aba.chamadas["abrir"] == aberturas
+
+    # Edição só no WhatsApp: a próxima revalidação traz a planilha nova
+    aba.editar(1, 1, "47 99999-0002")
+    velhos, _ = _ler(cache)
+    _esperar_revalidacao(cache)
+    novos, _ = _ler(cache)
+    _esperar_revalidacao(cache)
+    conferencias["edicao_fora_da_primeira_coluna"] = (
+        velhos[0]["Whatsapp (opcional)"] == "47 99999-0001"
+        and novos[0]["Whatsapp (opcional)"] == "47 99999-0002")
+
+    # API fora do ar: o snapshot continua valendo e o erro fica registrado
+    aba.fora_do_ar = True
+    registros, _ = _ler(cache)
+    _esperar_revalidacao(cache)
+    registros_depois, _ = _ler(cache)
+    _esperar_revalidacao(cache)
+    conferencias["api_fora_do_ar_serve_snapshot"] = (
+        registros == novos and registros_depois == novos and cache.ultimo_erro is not None)
+
+    return {"tempos": tempos, "chamadas_api": aba.chamadas, "estatisticas": cache.estatisticas,
+            "confere": conferencias}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Confere o cache da planilha com uma aba falsa.")
+    parser.add_argument("--saida", default="resultados_planilha.json")
+    args = parser.parse_args()
+
+    relatorio = {
+        "commit": commit_atual(),
+        "data": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "resultados": {},
+    }
+    with tempfile.TemporaryDirectory() as pasta:
+        for modo in ("revisao_drive", "hash_celulas"):
+            relatorio["resultados"][modo] = conferir(modo, pasta)
+    with open(args.saida, "w", encoding="utf-8") as f:
+        json.dump(relatorio, f, ensure_ascii=False, indent=2)
+
+    falhas = [f"{modo}: {nome}" for modo, r in relatorio["resultados"].items()
+              for nome, ok in r["confere"].items() if not ok]
+    print(f"Resultados salvos em {args.saida}.")
+    if falhas:
+        print("Não confere: " + "; ".join(falhas))
+        sys.exit(1)
+    print("Cache da planilha confere.")
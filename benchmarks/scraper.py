@@ -0,0 +1,196 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import scrapinglocal
+from benchmarks.executar import commit_atual, cronometrar
+from scrapinglocal import criar_sessao, extrair_cartas_da_pagina, extrair_cartas_lxml, raspar_listas_http
+
+# ======================== CONFERÊNCIA DO SCRAPER HTTP ===============
+#
+#   python -m benchmarks.scraper --saida resultados_scraper.json
+#
+# Sem rede e sem Chrome: as páginas salvas em benchmarks/paginas/ são
+# servidas por um http.server local no lugar da Ligamagic.
+#
+#   - cada página é lida pelos dois leitores (lxml do motor http e o
+#     BeautifulSoup do motor selenium), que precisam dar as mesmas cartas;
+#   - raspar_listas_http percorre as listas do servidor local (uma com duas
+#     páginas, uma que responde 404 e uma que responde 500) e precisa
+#     devolver as páginas da lista boa e listas vazias para as quebradas,
+#     sem interromper as outras;
+#   - aprendido o tamanho de página (lista_1.html: 7 linhas, uma delas
+#     malformada), uma lista de uma página curta é lida com um pedido só,
+#     sem buscar a página seguinte;
+#   - com um Chrome que não abre, as listas que precisam dele terminam com
+#     o erro em vez de deixar threads esperando o pool para sempre.
+#
+# Termina com status 1 se alguma conferência falhar.
+
+PASTA_PAGINAS = os.path.join(os.path.dirname(__file__), "paginas")
+
+# Lista do servidor local -> páginas (a partir da 1); depois da última, "vazia.html"
+LISTAS = {
+    "lista": ["lista_1.html", "lista_2.html"],
+    "curta": ["lista_2.html"],
+    "sem_tabela": ["sem_tabela.html"],
+}
+STATUS_ERRO = {"quebrada": 404, "instavel": 500}
+PEDIDOS = []  # (lista, página) de cada GET recebido pelo servidor local
+
+
+def ler_pagina(arquivo):
+    with open(os.path.join(PASTA_PAGINAS, arquivo), "rb") as f:
+        return f.read()
+
+
+class _PaginaSalva(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlparse(self.path)
+        lista = url.path.strip("/")
+        page = int(parse_qs(url.query).get("page", ["1"])[0])
+        PEDIDOS.append((lista, page))
+        if lista in STATUS_ERRO:
+            self.send_error(STATUS_ERRO[lista])
+            return
+        if lista not in LISTAS:
+            self.send_error(404)
+            return
+        paginas = LISTAS[lista]
+        corpo = ler_pagina(paginas[page - 1] if page <= len(paginas) else "vazia.html")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, formato, *args):
+        pass
+
+
+def conferir_leitores():
+    """Mesmas cartas nos dois leitores, página a página, e o tempo de cada um."""
+    resultado = {}
+    for arquivo in sorted(os.listdir(PASTA_PAGINAS)):
+        conteudo = ler_pagina(arquivo)
+        cartas_lxml, tempo_lxml = cronometrar(lambda: extrair_cartas_lxml(conteudo), repeticoes=20)
+        cartas_bs4, tempo_bs4 = cronometrar(lambda: extrair_cartas_da_pagina(conteudo.decode("utf-8")),
+                                            repeticoes=20)
+        resultado[arquivo] = {
+            "cartas": len(cartas_bs4),
+            "lxml": tempo_lxml,
+            "beautifulsoup": tempo_bs4,
+            # Sem a tabela, o lxml devolve None (vai para o Chrome) e o BeautifulSoup, []
+            "confere": (cartas_lxml or []) == cartas_bs4,
+        }
+    return resultado
+
+
+@contextmanager
+def servidor_local():
+    """Sobe o http.server com as páginas salvas; devolve a URL base."""
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), _PaginaSalva)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    try:
+        yield f"http://127.0.0.1:{servidor.server_address[1]}"
+    finally:
+        servidor.shutdown()
+        servidor.server_close()
+
+
+def conferir_raspagem():
+    """raspar_listas_http contra o servidor local, com listas boas e quebradas."""
+    with servidor_local() as base:
+        urls = [f"{base}/lista", f"{base}/quebrada", "", f"{base}/instavel", f"{base}/lista"]
+        sessao = criar_sessao(conexoes=2, tentativas=1)
+        listas, tempo = cronometrar(lambda: raspar_listas_http(urls, workers=2, sessao=sessao), repeticoes=1)
+    esperado = [carta for arquivo in LISTAS["lista"] for carta in extrair_cartas_da_pagina(
+        ler_pagina(arquivo).decode("utf-8"))]
+    return {
+        "tempo": tempo,
+        "cartas_por_lista": [len(cartas) for cartas in listas],
+        "confere": listas == [esperado, [], [], [], esperado],
+    }
+
+
+def conferir_fim_das_listas():
+    """Segunda execução incremental: a lista nova e curta termina sem pedir a página 2."""
+    estado = {}
+    with servidor_local() as base:
+        sessao = criar_sessao(conexoes=2, tentativas=1)
+        raspar_listas_http([f"{base}/lista"], workers=2, sessao=sessao, estado=estado)
+        PEDIDOS.clear()
+        listas = raspar_listas_http([f"{base}/lista", f"{base}/curta"], workers=2, sessao=sessao, estado=estado)
+    pedidos = sorted(PEDIDOS)
+    esperado = extrair_cartas_da_pagina(ler_pagina("lista_2.html").decode("utf-8"))
+    return {
+        "pedidos": [f"{lista}?page={page}" for lista, page in pedidos],
+        # "lista" não mudou (só a página 1); "curta" tem menos linhas que uma página cheia
+        "confere": pedidos == [("curta", 1), ("lista", 1)] and listas[1] == esperado,
+    }
+
+
+def _chrome_que_nao_abre():
+    raise RuntimeError("Chrome não abriu (simulado)")
+
+
+def conferir_chrome_falho(timeout=30):
+    """Páginas sem a tabela com o Chrome quebrado: o erro sobe, ninguém fica preso no pool."""
+    resultado = {}
+
+    def rodar():
+        try:
+            raspar_listas_http([f"{base}/sem_tabela"] * 4, workers=4, sessao=criar_sessao(4, tentativas=1),
+                               drivers_reserva=1)
+        except RuntimeError as e:
+            resultado["erro"] = str(e)
+
+    criar_driver, espera = scrapinglocal.criar_driver, scrapinglocal.ESPERA_DRIVER
+    scrapinglocal.criar_driver, scrapinglocal.ESPERA_DRIVER = _chrome_que_nao_abre, 0.2
+    try:
+        with servidor_local() as base:
+            thread = threading.Thread(target=rodar, daemon=True)
+            thread.start()
+            thread.join(timeout)
+    finally:
+        scrapinglocal.criar_driver, scrapinglocal.ESPERA_DRIVER = criar_driver, espera
+    return {"terminou": not thread.is_alive(), "erro": resultado.get("erro"),
+            "confere": not thread.is_alive() and "erro" in resultado}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Confere o scraper HTTP contra páginas salvas.")
+    parser.add_argument("--saida", default="resultados_scraper.json")
+    args = parser.parse_args()
+
+    relatorio = {
+        "commit": commit_atual(),
+        "data": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "leitores": conferir_leitores(),
+        "raspagem": conferir_raspagem(),
+        "fim_das_listas": conferir_fim_das_listas(),
+        "chrome_falho": conferir_chrome_falho(),
+    }
+    with open(args.saida, "w", encoding="utf-8") as f:
+        json.dump(relatorio, f, ensure_ascii=False, indent=2)
+
+    falhas = [arquivo for arquivo, r in relatorio["leitores"].items() if not r["confere"]]
+    if not relatorio["raspagem"]["confere"]:
+        falhas.append("raspar_listas_http")
+    if not relatorio["fim_das_listas"]["confere"]:
+        falhas.append("fim das listas pelo tamanho de página")
+    if not relatorio["chrome_falho"]["confere"]:
+        falhas.append("pool de Chromes com falha ao abrir")
+    print(f"Resultados salvos em {args.saida}.")
+    if falhas:
+        print(f"Não confere: {', '.join(falhas)}")
+        sys.exit(1)
+    print("Leitores lxml e BeautifulSoup e raspagem HTTP conferem.")
@@ -0,0 +1,152 @@
+import time
+import unicodedata
+
+# ======================== ÍNDICE DE BUSCA POR NOME ==================
+#
+# Índice invertido de trigramas sobre as metades PT e EN do "Nome" de cada
+# carta, já sem acentos ("Abrasão" e "abrasao" caem nos mesmos trigramas).
+# É montado uma vez por versão dos dados; cada busca só intersecta alguns
+# conjuntos de inteiros e confirma os candidatos com uma comparação direta.
+#
+# As entradas são os ids canônicos das cartas (ids_cartas.py): todas as
+# traduções de uma carta apontam para o mesmo id, e achar qualquer uma
+# delas traz as ofertas de todas.
+
+
+def dobrar_acentos(texto):
+    """Minúsculas e sem acentos: 'Abrasão' -> 'abrasao'."""
+    decomposto = unicodedata.normalize("NFKD", texto or "")
+    return "".join(c for c in decomposto if not unicodedata.combining(c)).lower().strip()
+
+
+def trigramas(texto):
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+
+# Ordem do ranking: nome exato, começo do nome, começo de palavra, trecho
+EXATO, PREFIXO, PALAVRA, TRECHO = range(4)
+LIMITE_BUSCA = 200  # ofertas devolvidas por busca, em memória ou no banco
+
+
+def _posicao(busca, metade):
+    if metade == busca:
+        return EXATO
+    if metade.startswith(busca):
+        return PREFIXO
+    posicao = metade.find(busca)
+    if posicao < 0:
+        return None
+    if metade[posicao - 1] in " -,'":
+        return PALAVRA
+    return TRECHO
+
+
+class IndiceNomes:
+    """
+    Só a parte dos nomes: trigramas das metades de cada carta, na ordem em
+    que as cartas foram adicionadas. Serve ao IndiceBusca (ofertas em
+    memória) e à busca do banco SQLite, que assim acham as mesmas cartas na
+    mesma ordem.
+    """
+
+    def __init__(self):
+        self.chaves = []       # posição -> chave da carta (id_carta, chave do banco...)
+        self.nomes = []        # posição -> Nome (o primeiro visto)
+        self.metades = []      # posição -> {metades PT/EN normalizadas de todas as traduções}
+        self.postings = {}     # trigrama -> {posições}
+        self._posicoes = {}    # chave -> posição
+        self._vistos = set()   # (posição, Nome) já indexados
+
+    def adicionar(self, chave, nome):
+        """Indexa mais um Nome da carta `chave`; retorna a posição dela."""
+        posicao = self._posicoes.get(chave)
+        if posicao is None:
+            posicao = self._posicoes[chave] = len(self.nomes)
+            self.chaves.append(chave)
+            self.nomes.append(nome)
+            self.metades.append(set())
+        if (posicao, nome) not in self._vistos:
+            self._vistos.add((posicao, nome))
+            for metade in (dobrar_acentos(m) for m in nome.split(" / ", 1)):
+                if metade not in self.metades[posicao]:
+                    self.metades[posicao].add(metade)
+                    for tri in trigramas(metade):
+                        self.postings.setdefault(tri, set()).add(posicao)
+        return posicao
+
+    def _candidatos(self, busca):
+        tris = trigramas(busca)
+        if not tris:
+            # Buscas de 1 ou 2 letras: varre os nomes distintos
+            return range(len(self.nomes))
+        conjuntos = sorted((self.postings.get(t, set()) for t in tris), key=len)
+        candidatos = set(conjuntos[0])
+        for conjunto in conjuntos[1:]:
+            candidatos &= conjunto
+            if not candidatos:
+                break
+        return candidatos
+
+    def posicoes(self, busca):
+        """
+        Posições das cartas cujo nome contém a busca, em ordem de ranking
+        (exato, prefixo, começo de palavra, trecho; depois Nome e posição).
+
+        Uma busca com " / " (ex.: o Nome inteiro copiado de uma tabela) é
+        dividida como o Nome: cada parte precisa aparecer em alguma metade.
+        """
+        partes = [p.strip() for p in dobrar_acentos(busca).split(" / ")]
+        partes = [p for p in partes if p]
+        if not partes:
+            return []
+        candidatos = None
+        for parte in partes:
+            da_parte = self._candidatos(parte)
+            candidatos = set(da_parte) if candidatos is None else candidatos & set(da_parte)
+        acertos = []
+        for posicao in candidatos:
+            pior = EXATO  # a parte com o pior ranking define o da carta
+            for parte in partes:
+                ranking = [r for r in (_posicao(parte, m) for m in self.metades[posicao]) if r is not None]
+                if not ranking:
+                    break
+                pior = max(pior, min(ranking))
+            else:
+                acertos.append((pior, self.nomes[posicao], posicao))
+        acertos.sort()
+        return [posicao for _, _, posicao in acertos]
+
+
+class IndiceBusca(IndiceNomes):
+    def __init__(self, jogadores, tipo="have"):
+        """
+        Parâmetros:
+          jogadores (list): dicts com "nome", "whatsapp" e listas "have"/"want".
+          tipo (str): qual lista indexar.
+        """
+        from ids_cartas import obter_catalogo  # ids_cartas importa dobrar_acentos daqui
+
+        inicio = time.perf_counter()
+        super().__init__()
+        catalogo = obter_catalogo()
+        self.ofertas = []      # posição -> [(jogador, carta), ...]
+        for jogador in jogadores:
+            for carta in jogador.get(tipo, []):
+                posicao = self.adicionar(catalogo.id_carta(carta), carta.get("Nome", ""))
+                if posicao == len(self.ofertas):
+                    self.ofertas.append([])
+                self.ofertas[posicao].append((jogador, carta))
+        self.tempo_montagem_ms = (time.perf_counter() - inicio) * 1000
+
+    def buscar(self, busca, limite=LIMITE_BUSCA):
+        """
+        Retorna até `limite` ofertas (jogador, carta) cujo nome contém a busca,
+        com acertos exatos e de prefixo primeiro (ver IndiceNomes.posicoes).
+        """
+        resultado = []
+        for posicao in self.posicoes(busca):
+            for oferta in self.ofertas[posicao]:
+                resultado.append(oferta)
+                if len(resultado) >= limite:
+                    return resultado
+        return resultado
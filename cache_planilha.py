@@ -0,0 +1,167 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+# ======================== CACHE DA PLANILHA EM DISCO ================
+#
+# Guarda o último get_all_records() da planilha de jogadores num arquivo
+# compartilhado por todos os processos/réplicas do app:
+#
+#   - dentro do `ttl`, o snapshot é servido direto do disco;
+#   - vencido, o snapshot é servido na hora e a revalidação roda em segundo
+#     plano (stale-while-revalidate), um processo por vez (arquivo .lock);
+#   - a revalidação pega só a revisão da planilha (version/modifiedTime do
+#     Drive, que muda a cada edição em qualquer célula); se ela não mudou, o
+#     snapshot é mantido sem nem abrir a planilha (até `ttl_completo`).
+#     Sem `obter_revisao`, a revisão é o hash de todas as células;
+#   - se a API do Google falhar, o último snapshot bom continua valendo.
+
+ARQUIVO_CACHE = "planilha_cache.json"
+
+
+class CachePlanilha:
+    def __init__(self, obter_aba, caminho=ARQUIVO_CACHE, ttl=300, ttl_completo=3600, timeout_lock=120,
+                 obter_revisao=None):
+        """
+        Parâmetros:
+          obter_aba: função sem argumentos que devolve a aba do gspread (ou
+            um objeto com get_all_values() e get_all_records(), nos testes).
+          ttl (int): segundos em que o snapshot vale sem revalidar.
+          ttl_completo (int): segundos até forçar uma leitura completa mesmo
+            sem mudança na revisão.
+          obter_revisao: função sem argumentos que devolve a revisão atual da
+            planilha (ex.: version do Drive); None para usar o hash das células.
+          timeout_lock (int): idade em que um .lock esquecido é descartado.
+        """
+        self.obter_aba = obter_aba
+        self.caminho = caminho
+        self.ttl = ttl
+        self.ttl_completo = ttl_completo
+        self.timeout_lock = timeout_lock
+        self.obter_revisao = obter_revisao
+        self.ultimo_erro = None
+        self.estatisticas = {"disco": 0, "revalidacoes": 0, "leituras_completas": 0, "erros": 0}
+        self._lock = threading.Lock()
+        self._revalidando = False
+        self._proxima_tentativa = 0.0
+
+    # -------------------- disco --------------------
+
+    def _ler_snapshot(self):
+        try:
+            with open(self.caminho, encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _gravar_snapshot(self, snapshot):
+        temporario = f"{self.caminho}.{os.getpid()}.tmp"
+        with open(temporario, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, ensure_ascii=False)
+        os.replace(temporario, self.caminho)
+
+    def _travar(self):
+        """Lock entre processos: só um revalida por vez."""
+        trava = self.caminho + ".lock"
+        try:
+            if time.time() - os.path.getmtime(trava) > self.timeout_lock:
+                os.remove(trava)
+        except OSError:
+            pass
+        try:
+            os.close(os.open(trava, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return True
+        except FileExistsError:
+            return False
+
+    def _destravar(self):
+        try:
+            os.remove(self.caminho + ".lock")
+        except FileNotFoundError:
+            pass
+
+    # -------------------- revalidação --------------------
+
+    def _revisao(self):
+        """(revisão atual, aba já aberta ou None). Com obter_revisao, a planilha nem é aberta."""
+        if self.obter_revisao is not None:
+            return str(self.obter_revisao()), None
+        aba = self.obter_aba()
+        valores = aba.get_all_values()
+        return hashlib.sha1(json.dumps(valores, ensure_ascii=False).encode("utf-8")).hexdigest(), aba
+
+    def revalidar(self, snapshot=None):
+        """Confere a planilha e atualiza o snapshot. Retorna o snapshot vigente."""
+        agora = time.time()
+        self.estatisticas["revalidacoes"] += 1
+        try:
+            revisao, aba = self._revisao()
+            if (snapshot and snapshot.get("revisao") == revisao
+                    and agora - snapshot.get("salvo_em", 0) < self.ttl_completo):
+                snapshot["checado_em"] = agora
+            else:
+                aba = aba or self.obter_aba()
+                self.estatisticas["leituras_completas"] += 1
+                snapshot = {
+                    "salvo_em": agora,
+                    "checado_em": agora,
+                    "revisao": revisao,
+                    "registros": aba.get_all_records(),
+                }
+            self._gravar_snapshot(snapshot)
+            self.ultimo_erro = None
+        except Exception as e:
+            self.estatisticas["erros"] += 1
+            self.ultimo_erro = e
+            self._proxima_tentativa = agora + self.ttl  # não insiste a cada leitura
+            if snapshot is None:
+                raise
+        return snapshot
+
+    def _revalidar_em_segundo_plano(self, snapshot):
+        with self._lock:
+            if self._revalidando:
+                return
+            self._revalidando = True
+
+        def tarefa():
+            try:
+                if self._travar():
+                    try:
+                        self.revalidar(snapshot)
+                    finally:
+                        self._destravar()
+            except Exception:
+                pass  # ultimo_erro já registrado; o snapshot antigo continua valendo
+            finally:
+                self._revalidando = False
+
+        threading.Thread(target=tarefa, name="revalidar-planilha", daemon=True).start()
+
+    # -------------------- leitura --------------------
+
+    def ler(self):
+        """Registros da planilha (lista de dicts, como get_all_records())."""
+        snapshot = self._ler_snapshot()
+        if snapshot is None:
+            return self.revalidar()["registros"]
+        self.estatisticas["disco"] += 1
+        agora = time.time()
+        if agora - snapshot.get("checado_em", 0) >= self.ttl and agora >= self._proxima_tentativa:
+            self._revalidar_em_segundo_plano(snapshot)
+        return snapshot["registros"]
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def obter_cache(obter_aba, caminho=ARQUIVO_CACHE, **opcoes):
+    """Retorna o cache único do processo para o arquivo informado."""
+    chave = os.path.abspath(caminho)
+    with _caches_lock:
+        if chave not in _caches:
+            _caches[chave] = CachePlanilha(obter_aba, caminho, **opcoes)
+        return _caches[chave]
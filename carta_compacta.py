@@ -0,0 +1,150 @@
+import re
+import sys
+from collections.abc import MutableMapping
+from functools import lru_cache
+
+# ======================== CARTAS COMPACTAS NA MEMÓRIA ===============
+#
+# Cada carta do cartas.json viraria um dict com 7 chaves de texto (e mais 6
+# depois da ingestão), com cópias próprias de "NM", "", "1x"... e a URL
+# inteira da carta. Na carga, o armazém troca esses dicts por objetos Carta:
+#
+#   - um atributo por campo (__slots__), sem dict por carta;
+#   - textos internados (sys.intern): "NM", "1x", "0,10" e o nome de uma
+#     carta que aparece nas listas de vários jogadores existem uma vez só;
+#   - o link da Ligamagic guarda só o card= e o ed= e é remontado quando
+#     pedido ("Imagem"); links fora desse formato ficam inteiros.
+#
+# A Carta é um MutableMapping e responde como o dict de antes
+# (carta.get("Nome"), carta["Nome"], "Nome" in carta, carta["quantidade"] = 2,
+# {**carta}, pd.DataFrame([carta])...), então o resto do código não precisa
+# saber qual das duas recebeu. get() e `in` são reescritos só por velocidade.
+
+_PREFIXO_URL = "https://ligamagic.com.br/?view=cards/card&card="
+_PADRAO_URL = re.compile(r"https://ligamagic\.com\.br/\?view=cards/card&card=([^&#]*)&ed=([^&#]*)")
+_AUSENTE = object()
+_DERIVADA = object()  # "Imagem" no formato padrão: remontada de card= e ed=
+
+# Campo (do cartas.json ou da ingestão) -> atributo; "Imagem" é tratado à parte
+CAMPOS = {
+    "Nome": "nome",
+    "Qualidade": "qualidade",
+    "Extra": "extra",
+    "Idioma": "idioma",
+    "Quantidade": "quantidade_texto",
+    "Preço Venda (R$)": "preco_texto",
+    "quantidade": "quantidade",
+    "preco_centavos": "preco_centavos",
+    "chave": "chave",
+    "edicao": "edicao",
+    "id_carta": "id_carta",
+    "id_impressao": "id_impressao",
+}
+ORDEM_CAMPOS = ["Nome", "Qualidade", "Extra", "Idioma", "Quantidade", "Preço Venda (R$)", "Imagem",
+                "quantidade", "preco_centavos", "chave", "edicao", "id_carta", "id_impressao"]
+
+
+@lru_cache(maxsize=65536)  # o mesmo link aparece nas listas de vários jogadores
+def _partes_url(url):
+    """(card, ed) internados se o link está no formato padrão; senão None."""
+    encontrado = _PADRAO_URL.fullmatch(url)
+    if not encontrado:
+        return None
+    return sys.intern(encontrado.group(1)), sys.intern(encontrado.group(2))
+
+
+class Carta(MutableMapping):
+    __slots__ = (*CAMPOS.values(), "_card", "_ed", "_imagem", "_outros")
+
+    def __init__(self, dados=None):
+        # Campo ausente = _AUSENTE (não um slot vazio): consultar um campo que
+        # falta não custa uma AttributeError
+        self.nome = self.qualidade = self.extra = self.idioma = _AUSENTE
+        self.quantidade_texto = self.preco_texto = self.quantidade = self.preco_centavos = _AUSENTE
+        self.chave = self.edicao = self.id_carta = self.id_impressao = self._imagem = _AUSENTE
+        self._outros = None  # campos fora de CAMPOS (ex.: "Link Detalhe")
+        for campo, valor in (dados or {}).items():
+            atributo = CAMPOS.get(campo)
+            if atributo is not None and type(valor) is str:
+                setattr(self, atributo, sys.intern(valor))  # caminho da carga, sem passar por __setitem__
+            else:
+                self[campo] = valor
+
+    def get(self, campo, padrao=None):
+        atributo = CAMPOS.get(campo)
+        if atributo is None:
+            return self._outro(campo, padrao)
+        valor = getattr(self, atributo)
+        return padrao if valor is _AUSENTE else valor
+
+    def __getitem__(self, campo):
+        atributo = CAMPOS.get(campo)
+        valor = self._outro(campo, _AUSENTE) if atributo is None else getattr(self, atributo)
+        if valor is _AUSENTE:
+            raise KeyError(campo)
+        return valor
+
+    def _outro(self, campo, padrao):
+        """"Imagem" (remontada do card=/ed=) e campos fora de CAMPOS."""
+        if campo == "Imagem":
+            imagem = self._imagem
+            if imagem is _DERIVADA:
+                return _PREFIXO_URL + self._card + "&ed=" + self._ed
+            return padrao if imagem is _AUSENTE else imagem
+        return padrao if self._outros is None else self._outros.get(campo, padrao)
+
+    def __setitem__(self, campo, valor):
+        if type(valor) is str:
+            valor = sys.intern(valor)
+        atributo = CAMPOS.get(campo)
+        if atributo is not None:
+            setattr(self, atributo, valor)
+        elif campo == "Imagem":
+            partes = _partes_url(valor) if isinstance(valor, str) else None
+            if partes:
+                self._card, self._ed = partes
+                self._imagem = _DERIVADA
+            else:
+                self._imagem = valor
+        else:
+            if self._outros is None:
+                self._outros = {}
+            self._outros[campo] = valor
+
+    def __delitem__(self, campo):
+        if campo not in self:
+            raise KeyError(campo)
+        atributo = CAMPOS.get(campo)
+        if atributo is not None:
+            setattr(self, atributo, _AUSENTE)
+        elif campo == "Imagem":
+            self._imagem = _AUSENTE
+        else:
+            del self._outros[campo]
+
+    def __contains__(self, campo):
+        atributo = CAMPOS.get(campo)
+        if atributo is None:
+            return self._outro(campo, _AUSENTE) is not _AUSENTE
+        return getattr(self, atributo) is not _AUSENTE
+
+    def __iter__(self):
+        for campo in ORDEM_CAMPOS:
+            if campo in self:
+                yield campo
+        yield from self._outros or ()
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __reduce__(self):
+        # pickle/copy pela forma de dict: o marcador _AUSENTE não sobrevive a um pickle
+        return Carta, (dict(self.items()),)
+
+    def __repr__(self):
+        return f"Carta({dict(self.items())!r})"
+
+
+def carta_ou_dict(objeto):
+    """object_hook do json: objetos com "Nome" (as cartas) viram Carta; os demais ficam dict."""
+    return Carta(objeto) if "Nome" in objeto else objeto
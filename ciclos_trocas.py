@@ -0,0 +1,273 @@
+import heapq
+import time
+
+import numpy as np
+
+from ids_cartas import obter_catalogo
+
+# ======================== TROCAS EM CADEIA ==========================
+#
+# Trocas entre 3 ou mais jogadores: A tem o que B quer, B tem o que C quer
+# e C tem o que A quer. O grafo fica em listas de adjacência no formato CSR
+# (arrays NumPy): as saídas do jogador `a` são destino[inicio[a]:inicio[a + 1]],
+# com peso = quantas cartas `a` tem e o destino quer. Só os pares que trocam
+# alguma carta ocupam memória; não há matriz N x N. A mesma estrutura ao
+# contrário (entradas de cada jogador) serve para fechar os ciclos.
+#
+# A busca dos ciclos:
+#   - decompõe o grafo em componentes fortemente conexas (Tarjan iterativo
+#     sobre as listas de adjacência); um ciclo nunca sai da sua componente,
+#     e jogadores fora de qualquer ciclo são descartados de cara;
+#   - enumera cada ciclo uma vez só, a partir do seu jogador de menor índice,
+#     até `max_tamanho` jogadores;
+#   - guarda os `limite` melhores num heap e poda todo caminho cujo teto
+#     (cartas já somadas + maior peso possível nos passos que faltam) não
+#     supera o pior ciclo guardado. Os vizinhos são visitados do maior peso
+#     para o menor, então o heap enche cedo com ciclos bons e a poda corta
+#     quase tudo;
+#   - o último passo (fechar o ciclo) é calculado de uma vez para todos os
+#     candidatos.
+
+
+def _csr(linhas, total):
+    """[(colunas, pesos)] por linha -> (inicio, colunas int32, pesos no menor inteiro que cabe)."""
+    tamanhos = np.array([len(colunas) for colunas, _ in linhas], dtype=np.int64)
+    inicio = np.zeros(total + 1, dtype=np.int64)
+    np.cumsum(tamanhos, out=inicio[1:])
+    colunas = np.concatenate([c for c, _ in linhas]).astype(np.int32) if total else np.zeros(0, np.int32)
+    pesos = np.concatenate([p for _, p in linhas]) if total else np.zeros(0, np.int64)
+    tipo = np.uint16 if not len(pesos) or pesos.max() <= np.iinfo(np.uint16).max else np.int32
+    return inicio, colunas, pesos.astype(tipo)
+
+
+class CiclosTrocas:
+    def __init__(self, jogadores):
+        """
+        Parâmetros:
+          jogadores (list): dicts com "nome", "have" e "want".
+        """
+        inicio = time.perf_counter()
+        self.catalogo = obter_catalogo()
+        self.nomes = []
+        self.indice = {}
+        self.tem = []
+        self.quer = []
+        for jogador in jogadores:
+            nome = jogador["nome"]
+            if nome in self.indice:
+                continue
+            self.indice[nome] = len(self.nomes)
+            self.nomes.append(nome)
+            self.tem.append({self.catalogo.id_carta(c) for c in jogador.get("have", []) if "Nome" in c})
+            self.quer.append({self.catalogo.id_carta(c) for c in jogador.get("want", []) if "Nome" in c})
+
+        total = len(self.nomes)
+        quem_quer = {}
+        for i, cartas in enumerate(self.quer):
+            for carta in cartas:
+                quem_quer.setdefault(carta, []).append(i)
+        quem_quer = {carta: np.array(lista, dtype=np.int32) for carta, lista in quem_quer.items()}
+
+        # Uma linha por jogador: quem quer cada carta que ele tem, contado
+        # por destino (np.unique já devolve os destinos em ordem)
+        vazio = (np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int64))
+        saidas = []
+        for a, cartas in enumerate(self.tem):
+            listas = [quem_quer[carta] for carta in cartas if carta in quem_quer]
+            if not listas:
+                saidas.append(vazio)
+                continue
+            destinos, pesos = np.unique(np.concatenate(listas), return_counts=True)
+            proprio = destinos != a
+            saidas.append((destinos[proprio], pesos[proprio]))
+        self.inicio, self.destino, self.peso = _csr(saidas, total)
+
+        # Entradas de cada jogador: as mesmas arestas ordenadas pelo destino
+        origem_aresta = np.repeat(np.arange(total, dtype=np.int32), np.diff(self.inicio))
+        ordem = np.argsort(self.destino, kind="stable")
+        self.inicio_reverso = np.zeros(total + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.destino, minlength=total), out=self.inicio_reverso[1:])
+        self.origem_reversa = origem_aresta[ordem]
+        self.peso_reverso = self.peso[ordem]
+        self.maior_saida = np.zeros(total, dtype=np.int64)
+        np.maximum.at(self.maior_saida, origem_aresta, self.peso)
+        del origem_aresta, ordem
+
+        self.componente = self._componentes_fortes()
+        self.peso_maximo = int(self.peso.max()) if len(self.peso) else 0
+        self._por_jogador = {}
+        self.tempo_montagem_ms = (time.perf_counter() - inicio) * 1000
+
+    @property
+    def arestas(self):
+        return len(self.destino)
+
+    def saidas(self, jogador):
+        """(destinos, pesos) das arestas que saem de `jogador` (índice)."""
+        inicio, fim = self.inicio[jogador], self.inicio[jogador + 1]
+        return self.destino[inicio:fim], self.peso[inicio:fim]
+
+    # -------------------- componentes fortemente conexas --------------------
+
+    def _componentes_fortes(self):
+        """
+        Retorna:
+          Array com o número da componente de cada jogador; -1 para quem não
+          está em nenhum ciclo (componente de um jogador só).
+        """
+        total = len(self.nomes)
+        inicio = self.inicio.tolist()
+        destino = self.destino.tolist()
+        ordem_visita = [-1] * total
+        menor = [0] * total
+        na_pilha = [False] * total
+        pilha = []
+        componente = np.full(total, -1, dtype=np.int32)
+        proxima = 0
+        contador = 0
+        for raiz in range(total):
+            if ordem_visita[raiz] >= 0:
+                continue
+            ordem_visita[raiz] = menor[raiz] = contador
+            contador += 1
+            pilha.append(raiz)
+            na_pilha[raiz] = True
+            caminho = [(raiz, inicio[raiz])]  # (jogador, próxima aresta a olhar)
+            while caminho:
+                v, aresta = caminho[-1]
+                fim = inicio[v + 1]
+                while aresta < fim:
+                    w = destino[aresta]
+                    aresta += 1
+                    if ordem_visita[w] < 0:
+                        break
+                    if na_pilha[w] and ordem_visita[w] < menor[v]:
+                        menor[v] = ordem_visita[w]
+                else:
+                    # Todas as saídas de v vistas: fecha a componente ou volta ao pai
+                    caminho.pop()
+                    if menor[v] == ordem_visita[v]:
+                        membros = []
+                        while True:
+                            w = pilha.pop()
+                            na_pilha[w] = False
+                            membros.append(w)
+                            if w == v:
+                                break
+                        if len(membros) > 1:
+                            componente[membros] = proxima
+                            proxima += 1
+                    if caminho and menor[v] < menor[caminho[-1][0]]:
+                        menor[caminho[-1][0]] = menor[v]
+                    continue
+                caminho[-1] = (v, aresta)
+                ordem_visita[w] = menor[w] = contador
+                contador += 1
+                pilha.append(w)
+                na_pilha[w] = True
+                caminho.append((w, inicio[w]))
+        return componente
+
+    # -------------------- busca dos ciclos --------------------
+
+    def _buscar(self, origens, max_tamanho, min_tamanho, limite, so_maiores):
+        total = len(self.nomes)
+        guardados = []  # heap: o pior ciclo guardado fica na raiz
+
+        def limiar():
+            return guardados[0][0] if len(guardados) >= limite else 0
+
+        def guardar(cartas, caminho):
+            item = (cartas, -len(caminho), tuple(-i for i in caminho), caminho)
+            if len(guardados) < limite:
+                heapq.heappush(guardados, item)
+            elif item > guardados[0]:
+                heapq.heapreplace(guardados, item)
+
+        for origem in origens:
+            if self.componente[origem] < 0:
+                continue
+            permitidos = self.componente == self.componente[origem]
+            if so_maiores:
+                permitidos &= np.arange(total) > origem
+            if not permitidos.any():
+                continue
+            # Último passo: quanto cada jogador permitido dá de volta à origem
+            chegada = np.zeros(total, dtype=np.int64)
+            inicio, fim = self.inicio_reverso[origem], self.inicio_reverso[origem + 1]
+            chegada[self.origem_reversa[inicio:fim]] = self.peso_reverso[inicio:fim]
+            chegada[~permitidos] = 0
+            maior_chegada = int(chegada.max())
+            if maior_chegada == 0:
+                continue
+            livres = permitidos.copy()
+            livres[origem] = False
+
+            def explorar(atual, caminho, cartas):
+                faltam = max_tamanho - len(caminho)  # jogadores que ainda cabem
+                destinos, pesos = self.saidas(atual)
+                abertos = livres[destinos]
+                destinos, pesos = destinos[abertos], pesos[abertos].astype(np.int64)
+                if len(caminho) + 1 >= min_tamanho:
+                    # Fecha agora com um último jogador: atual -> v -> origem
+                    volta = chegada[destinos]
+                    fecha = np.where(volta > 0, cartas + pesos + volta, 0)
+                    candidatos = np.flatnonzero(fecha > limiar())
+                    if len(candidatos) > limite:
+                        candidatos = candidatos[np.argpartition(-fecha[candidatos], limite - 1)[:limite]]
+                    for k in candidatos:
+                        guardar(int(fecha[k]), caminho + [int(destinos[k])])
+                if faltam == 1:
+                    return
+                # Segue por mais um jogador; depois dele vêm até faltam - 1 jogadores e a volta
+                teto = cartas + pesos + (faltam - 1) * self.peso_maximo + maior_chegada
+                candidatos = np.flatnonzero(teto > limiar())
+                for k in candidatos[np.argsort(-pesos[candidatos], kind="stable")]:
+                    if teto[k] <= limiar():
+                        continue
+                    v = int(destinos[k])
+                    livres[v] = False
+                    explorar(v, caminho + [v], cartas + int(pesos[k]))
+                    livres[v] = True
+
+            explorar(origem, [origem], 0)
+
+        return [(cartas, caminho) for cartas, _, _, caminho in sorted(guardados, reverse=True)]
+
+    def _formatar(self, cartas, caminho):
+        trocas = []
+        for de, para in zip(caminho, caminho[1:] + caminho[:1]):
+            trocas.append({
+                "de": self.nomes[de],
+                "para": self.nomes[para],
+                "cartas": sorted(self.catalogo.nome(i) for i in self.tem[de] & self.quer[para]),
+            })
+        return {"jogadores": [self.nomes[i] for i in caminho], "cartas": cartas, "trocas": trocas}
+
+    def ciclos(self, max_tamanho=4, min_tamanho=3, limite=20):
+        """
+        Melhores trocas em cadeia da liga inteira.
+
+        Parâmetros:
+          max_tamanho (int): máximo de jogadores por ciclo.
+          min_tamanho (int): mínimo de jogadores (2 = trocas diretas também).
+          limite (int): quantos ciclos devolver.
+
+        Retorna:
+          Lista de {"jogadores": [...], "cartas": total de cartas trocadas,
+          "trocas": [{"de", "para", "cartas"}, ...]}, da que cobre mais cartas
+          para a que cobre menos (empates: ciclo menor primeiro).
+        """
+        # Começa pelos jogadores com as trocas mais pesadas: o heap enche cedo
+        origens = np.argsort(-self.maior_saida, kind="stable")
+        return [self._formatar(cartas, caminho)
+                for cartas, caminho in self._buscar(origens, max_tamanho, min_tamanho, limite, True)]
+
+    def ciclos_do_jogador(self, nome_jogador, max_tamanho=4, min_tamanho=3, limite=5):
+        """Como ciclos(), mas só os que passam por `nome_jogador` (memoizado)."""
+        chave = (nome_jogador, max_tamanho, min_tamanho, limite)
+        if chave not in self._por_jogador:
+            origem = self.indice.get(nome_jogador)
+            encontrados = [] if origem is None else self._buscar([origem], max_tamanho, min_tamanho, limite, False)
+            self._por_jogador[chave] = [self._formatar(cartas, caminho) for cartas, caminho in encontrados]
+        return self._por_jogador[chave]
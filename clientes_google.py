@@ -0,0 +1,189 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+# ======================== CLIENTES GOOGLE COMPARTILHADOS ============
+#
+# Uma credencial de service account por processo, renovada antes de
+# expirar (uma thread renova, as outras esperam), e clientes gspread/Drive
+# criados uma única vez e reaproveitados por todas as threads. O httplib2
+# do Drive não é thread-safe: o serviço é um só, e cada chamada pega
+# emprestada uma conexão autorizada de um pool pequeno (keep-alive, TLS já
+# negociado) e a devolve no fim. Cada chamada às APIs é contada e
+# cronometrada em estatisticas_api().
+
+ESCOPOS = [
+    'https://www.googleapis.com/auth/spreadsheets',
+    'https://www.googleapis.com/auth/drive',
+]
+ARQUIVO_CREDENCIAIS = "credenciais_google.json"
+MARGEM_RENOVACAO = timedelta(minutes=5)
+CONEXOES_DRIVE = 4  # conexões ociosas guardadas no pool do Drive
+
+_lock = threading.Lock()
+_lock_renovacao = threading.Lock()
+_credenciais = None
+_cliente_sheets = None
+_servico_drive = None
+_conexoes_drive = []
+_estatisticas = {}
+
+
+def _somar(api, ms):
+    with _lock:
+        dados = _estatisticas.setdefault(api, {"chamadas": 0, "total_ms": 0.0})
+        dados["chamadas"] += 1
+        dados["total_ms"] += ms
+
+
+def _registrar(api, inicio):
+    _somar(api, (time.perf_counter() - inicio) * 1000)
+
+
+def _registrar_resposta(api, resposta):
+    _somar(api, resposta.elapsed.total_seconds() * 1000)
+
+
+def carregar_info_credenciais():
+    """
+    JSON da service account: st.secrets["GOOGLE_CREDENTIALS"] (apps), a
+    variável de ambiente GOOGLE_CREDENTIALS ou o arquivo credenciais_google.json
+    (scraper local).
+    """
+    try:
+        import streamlit as st
+        segredo = st.secrets["GOOGLE_CREDENTIALS"] if "GOOGLE_CREDENTIALS" in st.secrets else None
+    except (ImportError, FileNotFoundError):
+        segredo = None  # fora do Streamlit ou sem secrets.toml
+    if segredo is not None:
+        # Secret mal formado é erro de configuração: o JSONDecodeError sobe
+        return json.loads(segredo)
+    if os.environ.get("GOOGLE_CREDENTIALS"):
+        return json.loads(os.environ["GOOGLE_CREDENTIALS"])
+    with open(ARQUIVO_CREDENCIAIS, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _renovar_se_preciso(credenciais):
+    """
+    Renova o token se já venceu ou vence em menos de MARGEM_RENOVACAO. A
+    conferência e a renovação ficam sob o mesmo lock: threads que chegam
+    juntas renovam uma vez só.
+    """
+    from google.auth.transport.requests import Request
+
+    with _lock_renovacao:
+        expira = credenciais.expiry  # datetime UTC sem fuso, como o google-auth usa
+        agora = datetime.now(timezone.utc).replace(tzinfo=None)
+        if credenciais.valid and expira and expira - agora > MARGEM_RENOVACAO:
+            return
+        inicio = time.perf_counter()
+        credenciais.refresh(Request())
+        _registrar("oauth", inicio)
+
+
+def obter_credenciais():
+    global _credenciais
+    with _lock:
+        if _credenciais is None:
+            from google.oauth2.service_account import Credentials
+            _credenciais = Credentials.from_service_account_info(carregar_info_credenciais(), scopes=ESCOPOS)
+        credenciais = _credenciais
+    _renovar_se_preciso(credenciais)
+    return credenciais
+
+
+def cliente_sheets():
+    """Cliente gspread único do processo (sessão HTTP compartilhada)."""
+    global _cliente_sheets
+    credenciais = obter_credenciais()
+    with _lock:
+        if _cliente_sheets is None:
+            import gspread
+            _cliente_sheets = gspread.authorize(credenciais)
+            # A sessão do gspread é um requests.Session: cada resposta conta como chamada
+            _cliente_sheets.session.hooks["response"].append(
+                lambda resposta, *args, **kwargs: _registrar_resposta("sheets", resposta))
+        return _cliente_sheets
+
+
+def servico_drive():
+    """
+    Serviço do Drive v3 único do processo. Só monta as requisições: quem as
+    executa são executar() e enviar_em_partes(), com uma conexão do pool.
+    """
+    global _servico_drive
+    credenciais = obter_credenciais()
+    with _lock:
+        if _servico_drive is None:
+            from googleapiclient.discovery import build
+            _servico_drive = build('drive', 'v3', credentials=credenciais, cache_discovery=False)
+        return _servico_drive
+
+
+@contextmanager
+def _conexao_drive(requisicao):
+    """
+    Conexão autorizada emprestada do pool para executar `requisicao`, ou
+    None se ela não é do googleapiclient (ex.: o Drive falso dos benchmarks).
+    """
+    from googleapiclient.http import HttpRequest, build_http
+
+    if not isinstance(requisicao, HttpRequest):
+        yield None
+        return
+    credenciais = obter_credenciais()
+    with _lock:
+        conexao = _conexoes_drive.pop() if _conexoes_drive else None
+    if conexao is None:
+        import google_auth_httplib2
+        # build_http, como o build() usa: timeout padrão e o 308 do upload
+        # resumível tratado como resposta, não como redirecionamento
+        conexao = google_auth_httplib2.AuthorizedHttp(credenciais, http=build_http())
+    try:
+        yield conexao
+    finally:
+        with _lock:
+            if len(_conexoes_drive) < CONEXOES_DRIVE:
+                _conexoes_drive.append(conexao)
+
+
+def executar(requisicao, api="drive"):
+    """Executa uma requisição do googleapiclient contando chamada e latência."""
+    with _conexao_drive(requisicao) as conexao:
+        inicio = time.perf_counter()
+        try:
+            return requisicao.execute(http=conexao) if conexao else requisicao.execute()
+        finally:
+            _registrar(api, inicio)
+
+
+def enviar_em_partes(requisicao, api="drive", tentativas=3):
+    """
+    Conclui um upload resumível parte a parte (next_chunk). Cada parte é
+    repetida até `tentativas` vezes em falhas transitórias, retomando do
+    último byte confirmado em vez de recomeçar o arquivo.
+    """
+    with _conexao_drive(requisicao) as conexao:
+        inicio = time.perf_counter()
+        try:
+            resposta = None
+            while resposta is None:
+                if conexao:
+                    _, resposta = requisicao.next_chunk(http=conexao, num_retries=tentativas)
+                else:
+                    _, resposta = requisicao.next_chunk(num_retries=tentativas)
+            return resposta
+        finally:
+            _registrar(api, inicio)
+
+
+def estatisticas_api():
+    with _lock:
+        return {
+            api: {**dados, "media_ms": dados["total_ms"] / dados["chamadas"] if dados["chamadas"] else 0.0}
+            for api, dados in _estatisticas.items()
+        }
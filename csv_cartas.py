@@ -0,0 +1,175 @@
+import io
+
+import pandas as pd
+
+from ids_cartas import chave_do_nome
+from valores_cartas import quantidade_int
+
+# ======================== LEITURA DE CSV DE CARTAS ==================
+#
+# CSVs de coleção (exportações de 200 mil linhas, com a mesma carta em
+# várias linhas) são lidos em blocos, com todas as colunas declaradas como
+# texto em vez de tipos inferidos. Cada bloco já é reduzido a uma linha por
+# carta (chave canônica de ids_cartas.py, quantidades somadas), então a
+# memória cresce com o número de cartas distintas, não com o de linhas, e
+# o merge have x want é 1 para 1. Passou de `limite_memoria_mb`, a leitura
+# para com erro em vez de derrubar o app.
+
+TAMANHO_BLOCO = 50_000  # linhas por bloco
+LIMITE_MEMORIA_MB = 256
+
+# Nomes aceitos para as colunas de carta e de quantidade (sem diferenciar maiúsculas)
+COLUNAS_CARTA = ["card", "carta", "nome", "name"]
+COLUNAS_QUANTIDADE = ["quantity", "quantidade", "qtd", "qty", "count"]
+
+
+def _achar_coluna(colunas, aceitas):
+    por_minuscula = {c.strip().lower(): c for c in colunas}
+    for nome in aceitas:
+        if nome in por_minuscula:
+            return por_minuscula[nome]
+    return None
+
+
+def _abrir_binario(arquivo):
+    """Caminho, bytes ou arquivo (ex.: UploadedFile do Streamlit) -> arquivo binário no início."""
+    if isinstance(arquivo, str):
+        return open(arquivo, "rb")
+    if isinstance(arquivo, bytes):
+        return io.BytesIO(arquivo)
+    arquivo.seek(0)
+    return arquivo
+
+
+def _cabecalho(binario):
+    """Nomes das colunas, lidos só da primeira linha."""
+    linha = binario.readline().decode("utf-8-sig")
+    binario.seek(0)
+    if not linha.strip():
+        return []
+    return list(pd.read_csv(io.StringIO(linha), nrows=0).columns)
+
+
+def _blocos_pandas(binario, colunas, tamanho_bloco):
+    yield from pd.read_csv(
+        binario, dtype={c: "string" for c in colunas}, chunksize=tamanho_bloco, encoding="utf-8-sig",
+    )
+
+
+def _quantidades(serie):
+    """'2', '2x', ' 3 ' -> inteiro; vazio ou ilegível conta 1."""
+    if pd.api.types.is_integer_dtype(serie):
+        return serie.astype("Int64").fillna(1)
+    # Poucos textos distintos: converte cada um uma vez só
+    textos = serie.astype("string").fillna("")
+    distintos = textos.unique()
+    return textos.map(pd.Series([quantidade_int(t) for t in distintos], index=distintos, dtype="Int64"))
+
+
+def dataframe_de_linhas(valores):
+    """
+    Monta o DataFrame a partir de linhas de texto, como as devolvidas pela API
+    de valores do Sheets (a primeira é o cabeçalho; linhas podem vir mais curtas).
+
+    Retorna:
+      DataFrame com os tipos declarados, sem inferência: tudo "string" (célula
+      vazia vira NA) e a coluna de quantidade, se houver, Int64.
+    """
+    if not valores:
+        return pd.DataFrame()
+    cabecalho = [str(c) for c in valores[0]]
+    largura = len(cabecalho)
+    linhas = [(linha + [""] * (largura - len(linha)))[:largura] for linha in valores[1:] if any(linha)]
+    df = pd.DataFrame(linhas, columns=cabecalho, dtype="string").replace("", pd.NA)
+    coluna_quantidade = _achar_coluna(cabecalho, COLUNAS_QUANTIDADE)
+    if coluna_quantidade is not None:
+        df[coluna_quantidade] = _quantidades(df[coluna_quantidade])
+    return df
+
+
+def agregar_por_carta(df, coluna_carta=None, coluna_quantidade=None):
+    """
+    Reduz o DataFrame a uma linha por carta.
+
+    Parâmetros:
+      df (DataFrame): linhas de cartas (CSV, planilha...).
+      coluna_carta, coluna_quantidade (str): detectadas pelos nomes usuais
+        se não informadas. Sem coluna de quantidade, cada linha vale 1.
+
+    Retorna:
+      DataFrame com "chave" (id canônico em texto), a coluna da carta (o
+      primeiro nome visto), "Quantidade" (Int64, somada), "Linhas" (quantas
+      linhas foram juntadas) e as demais colunas com o primeiro valor.
+    """
+    coluna_carta = coluna_carta or _achar_coluna(df.columns, COLUNAS_CARTA)
+    if coluna_carta is None:
+        raise ValueError(f"CSV sem coluna de carta (uma de: {', '.join(COLUNAS_CARTA)}).")
+    coluna_quantidade = coluna_quantidade or _achar_coluna(df.columns, COLUNAS_QUANTIDADE)
+
+    df = df[df[coluna_carta].notna()]
+    # Linhas já agregadas antes trazem a "chave"; as demais (ex.: da planilha) são calculadas
+    chaves = df["chave"].astype("string") if "chave" in df.columns else pd.Series(pd.NA, index=df.index, dtype="string")
+    faltam = chaves.isna()
+    if faltam.any():
+        nomes = df.loc[faltam, coluna_carta].astype("string")
+        distintos = nomes.unique()
+        chaves[faltam] = nomes.map(pd.Series([chave_do_nome(n) for n in distintos], index=distintos, dtype="string"))
+    quantidades = pd.Series(1, index=df.index, dtype="Int64")
+    if coluna_quantidade is not None:
+        quantidades = _quantidades(df[coluna_quantidade])
+    if "Quantidade" in df.columns and coluna_quantidade != "Quantidade":
+        # Mistura de linhas já agregadas com linhas cruas (ex.: CSV + planilha)
+        ja_somadas = _quantidades(df["Quantidade"]).where(df["Quantidade"].notna())
+        quantidades = ja_somadas.fillna(quantidades)
+    if "Linhas" in df.columns:
+        linhas = df["Linhas"].astype("Int64").fillna(1)  # já agregado antes: soma as contagens
+    else:
+        linhas = pd.Series(1, index=df.index, dtype="Int64")
+
+    outras = [c for c in df.columns if c not in (coluna_carta, coluna_quantidade, "chave", "Linhas", "Quantidade")]
+    base = df[[coluna_carta] + outras].assign(
+        chave=chaves.values, Quantidade=quantidades.values, Linhas=linhas.values,
+    )
+    agregacoes = {coluna_carta: "first", "Quantidade": "sum", "Linhas": "sum", **{c: "first" for c in outras}}
+    agregado = base.groupby("chave", sort=False).agg(agregacoes).reset_index()
+    return agregado[["chave", coluna_carta, "Quantidade", "Linhas"] + outras]
+
+
+def ler_csv_cartas(arquivo, tamanho_bloco=TAMANHO_BLOCO, limite_memoria_mb=LIMITE_MEMORIA_MB):
+    """
+    Lê um CSV de cartas em blocos, já agregado por carta.
+
+    Parâmetros:
+      arquivo: caminho, bytes ou arquivo aberto (ex.: o UploadedFile do Streamlit).
+      tamanho_bloco (int): linhas por bloco.
+      limite_memoria_mb (int): teto para o bloco em leitura + o agregado.
+
+    Retorna:
+      DataFrame no formato de agregar_por_carta().
+    """
+    binario = _abrir_binario(arquivo)
+    colunas = _cabecalho(binario)
+    if not colunas:
+        raise ValueError("CSV vazio.")
+    coluna_carta = _achar_coluna(colunas, COLUNAS_CARTA)
+    if coluna_carta is None:
+        raise ValueError(f"CSV sem coluna de carta (uma de: {', '.join(COLUNAS_CARTA)}).")
+    coluna_quantidade = _achar_coluna(colunas, COLUNAS_QUANTIDADE)
+
+    limite = limite_memoria_mb * 1024 * 1024
+    acumulado = None
+    for bloco in _blocos_pandas(binario, colunas, tamanho_bloco):
+        agregado = agregar_por_carta(bloco, coluna_carta, coluna_quantidade)
+        if acumulado is not None:
+            agregado = agregar_por_carta(pd.concat([acumulado, agregado], ignore_index=True),
+                                         coluna_carta, "Quantidade")
+        memoria = bloco.memory_usage(deep=True).sum() + agregado.memory_usage(deep=True).sum()
+        if memoria > limite:
+            raise ValueError(
+                f"CSV grande demais: {memoria / 1024 / 1024:.0f} MB em memória, "
+                f"acima do limite de {limite_memoria_mb} MB."
+            )
+        acumulado = agregado
+    if acumulado is None:
+        return agregar_por_carta(pd.DataFrame(columns=colunas, dtype="string"), coluna_carta, coluna_quantidade)
+    return acumulado
@@ -0,0 +1,103 @@
+import hashlib
+import io
+
+import clientes_google
+
+# ======================== ENVIO DE CSV PARA O DRIVE =================
+#
+# O CSV vai direto do buffer em memória (nada de arquivo temporário) num
+# upload resumível, em partes. Cada arquivo é marcado nas appProperties com
+# o usuário e a lista ("HAVE.csv", "WANT.csv"), e é por elas, não pelo nome,
+# que o arquivo anterior é procurado: o upload de um jogador nunca
+# sobrescreve o de outro. Com o mesmo md5 o envio é pulado; com outro
+# conteúdo, o arquivo é atualizado no lugar em vez de criar uma cópia nova.
+# Mais de um arquivo com as mesmas marcas é erro: não há como saber qual
+# atualizar.
+#
+# `servico` pode ser qualquer objeto com a interface files().list/create/
+# update do googleapiclient (o Drive falso de benchmarks/drive.py, por
+# exemplo).
+
+TAMANHO_PARTE = 1024 * 1024  # múltiplo de 256 KB, como o Drive exige
+IGUAL, ATUALIZADO, CRIADO = "igual", "atualizado", "criado"
+
+
+def md5_conteudo(conteudo):
+    return hashlib.md5(conteudo).hexdigest()
+
+
+def _literal(texto):
+    return "'" + texto.replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+
+def marcas(usuario, nome_arquivo):
+    """appProperties que identificam o arquivo de `usuario` para a lista `nome_arquivo`."""
+    return {"usuario": usuario, "lista": nome_arquivo}
+
+
+def _consulta_marcas(propriedades, pasta_id):
+    partes = [f"appProperties has {{ key={_literal(chave)} and value={_literal(valor)} }}"
+              for chave, valor in propriedades.items()]
+    partes.append("trashed = false")
+    if pasta_id:
+        partes.append(f"{_literal(pasta_id)} in parents")
+    return " and ".join(partes)
+
+
+def arquivo_existente(servico, usuario, nome_arquivo, pasta_id=None):
+    """
+    Arquivo já enviado por `usuario` para a lista `nome_arquivo`
+    ({"id", "md5Checksum"}) ou None. Mais de um: ValueError.
+    """
+    resposta = clientes_google.executar(servico.files().list(
+        q=_consulta_marcas(marcas(usuario, nome_arquivo), pasta_id),
+        spaces="drive",
+        fields="files(id, md5Checksum)",
+        pageSize=2,  # basta saber se há mais de um
+    ))
+    arquivos = resposta.get("files", [])
+    if len(arquivos) > 1:
+        raise ValueError(
+            f"Mais de um {nome_arquivo} de {usuario} no Drive "
+            f"({', '.join(a['id'] for a in arquivos)}); apague os repetidos antes de enviar."
+        )
+    return arquivos[0] if arquivos else None
+
+
+def enviar_csv(usuario, nome_arquivo, conteudo, pasta_id=None, servico=None, tamanho_parte=TAMANHO_PARTE):
+    """
+    Envia o CSV de um usuário ao Drive sem duplicar arquivos.
+
+    Parâmetros:
+      usuario (str): dono do arquivo (ex.: o nome do jogador na liga).
+      nome_arquivo (str): a lista (ex.: "HAVE.csv"); no Drive o arquivo se
+        chama "<usuario> - <nome_arquivo>".
+      conteudo (bytes): o CSV inteiro, como veio do upload.
+      pasta_id (str): pasta de destino; None para a raiz da service account.
+      servico: serviço do Drive v3; por padrão o compartilhado de clientes_google.
+
+    Retorna:
+      (id do arquivo, situação): IGUAL (nada enviado), ATUALIZADO ou CRIADO.
+    """
+    from googleapiclient.http import MediaIoBaseUpload
+
+    usuario = usuario.strip()
+    if not usuario:
+        raise ValueError("Informe o usuário dono do arquivo.")
+    servico = servico or clientes_google.servico_drive()
+    existente = arquivo_existente(servico, usuario, nome_arquivo, pasta_id)
+    if existente and existente.get("md5Checksum") == md5_conteudo(conteudo):
+        return existente["id"], IGUAL
+
+    media = MediaIoBaseUpload(io.BytesIO(conteudo), mimetype="text/csv", chunksize=tamanho_parte, resumable=True)
+    if existente:
+        requisicao = servico.files().update(fileId=existente["id"], media_body=media, fields="id")
+        situacao = ATUALIZADO
+    else:
+        metadados = {"name": f"{usuario} - {nome_arquivo}", "appProperties": marcas(usuario, nome_arquivo)}
+        if pasta_id:
+            metadados["parents"] = [pasta_id]
+        requisicao = servico.files().create(body=metadados, media_body=media, fields="id")
+        situacao = CRIADO
+    resposta = clientes_google.enviar_em_partes(requisicao)
+    return resposta.get("id"), situacao
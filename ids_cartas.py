@@ -0,0 +1,96 @@
+import re
+import threading
+from functools import lru_cache
+from urllib.parse import parse_qs, urlparse
+
+from busca_cartas import dobrar_acentos
+
+# ======================== IDS CANÔNICOS DAS CARTAS ==================
+#
+# O "Nome" varia de jogador para jogador (tradução PT diferente, só o nome
+# EN...), mas o link da carta na Ligamagic não: card=<nome EN>&ed=<edição>.
+# Na ingestão cada carta ganha os campos:
+#
+#   "chave":   nome EN do card= sem acentos/maiúsculas ("the chase is on")
+#   "edicao":  código do ed= ("mkm")
+#
+# e, na memória do processo, os inteiros "id_carta" (por chave) e
+# "id_impressao" (por chave + edição), que são o que o comparativo, as
+# trocas em cadeia e a busca comparam.
+
+_ESPACOS = re.compile(r"\s+")
+
+
+def _normalizar(texto):
+    return _ESPACOS.sub(" ", dobrar_acentos(texto))
+
+
+@lru_cache(maxsize=65536)  # a mesma carta aparece nas listas de muitos jogadores
+def chave_da_url(url):
+    """'...?card=The Chase Is On&ed=MKM' -> ('the chase is on', 'mkm'); ('', '') sem card=."""
+    parametros = parse_qs(urlparse(url or "").query)
+    carta = parametros.get("card", [""])[0]
+    return _normalizar(carta), parametros.get("ed", [""])[0].strip().lower()
+
+
+@lru_cache(maxsize=65536)
+def chave_do_nome(nome):
+    """Chave a partir do "Nome": a metade EN ou o nome inteiro, se só houver um."""
+    return _normalizar((nome or "").split(" / ", 1)[-1])
+
+
+def anotar_chave(carta):
+    """Acrescenta (se faltarem) "chave" e "edicao" à carta e a devolve."""
+    if "chave" not in carta:
+        chave, edicao = chave_da_url(carta.get("Imagem") or carta.get("Link Detalhe"))
+        if not chave:
+            chave = chave_do_nome(carta.get("Nome"))  # sem link
+        carta["chave"], carta["edicao"] = chave, edicao
+    return carta
+
+
+class CatalogoCartas:
+    """Interna chaves de carta em inteiros compactos, estáveis enquanto o processo vive."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ids = {}          # chave -> id_carta
+        self._impressoes = {}   # (chave, edicao) -> id_impressao
+        self.nomes = []         # id_carta -> primeiro "Nome" visto (para exibir)
+
+    def id_carta(self, carta):
+        """Id da carta (por nome); anota "id_carta" e "id_impressao" no dict."""
+        id_carta = carta.get("id_carta")
+        if id_carta is not None:
+            return id_carta
+        anotar_chave(carta)
+        chave = carta["chave"]
+        with self._lock:
+            id_carta = self._ids.get(chave)
+            if id_carta is None:
+                id_carta = self._ids[chave] = len(self.nomes)
+                self.nomes.append(carta.get("Nome", ""))
+            impressao = (chave, carta["edicao"])
+            id_impressao = self._impressoes.get(impressao)
+            if id_impressao is None:
+                id_impressao = self._impressoes[impressao] = len(self._impressoes)
+        carta["id_carta"], carta["id_impressao"] = id_carta, id_impressao
+        return id_carta
+
+    def anotar(self, jogadores):
+        for jogador in jogadores:
+            for tipo in ("have", "want"):
+                for carta in jogador.get(tipo, []):
+                    self.id_carta(carta)
+        return jogadores
+
+    def nome(self, id_carta):
+        return self.nomes[id_carta]
+
+
+_catalogo = CatalogoCartas()
+
+
+def obter_catalogo():
+    """Catálogo único do processo: o mesmo id para a mesma carta em todos os módulos."""
+    return _catalogo
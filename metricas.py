@@ -0,0 +1,73 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+# ======================== MÉTRICAS POR RERUN ========================
+#
+# Cada rerun do app cria um Medidor e embrulha as etapas caras em
+# `with medidor.medir("etapa"):`. Os tempos vão para o painel opcional da
+# sidebar e, se pedido, para um log local em JSON Lines. Um rerun só de um
+# fragmento usa um Medidor próprio e grava a sua linha com "fragmento".
+#
+# Funções cacheadas chamam cache_miss() no corpo: como o corpo só roda
+# quando o cache não tinha o valor, a etapa em andamento fica marcada como
+# "miss"; se ninguém chamar, ela continua "hit".
+
+ARQUIVO_LOG = "metricas.jsonl"
+
+_atual = threading.local()
+
+
+class Medidor:
+    def __init__(self):
+        self.etapas = []
+        self.inicio = time.perf_counter()
+
+    @contextmanager
+    def medir(self, nome, cacheada=False):
+        """
+        Mede uma etapa. O dict devolvido aceita campos extras, como
+        etapa["bytes"] ou etapa["itens"].
+        """
+        etapa = {"etapa": nome}
+        if cacheada:
+            etapa["cache"] = "hit"
+        anterior = getattr(_atual, "etapa", None)
+        _atual.etapa = etapa
+        inicio = time.perf_counter()
+        try:
+            yield etapa
+        finally:
+            etapa["ms"] = round((time.perf_counter() - inicio) * 1000, 3)
+            _atual.etapa = anterior
+            self.etapas.append(etapa)
+
+    def total_ms(self):
+        return round((time.perf_counter() - self.inicio) * 1000, 3)
+
+    def gravar(self, caminho=ARQUIVO_LOG, **extras):
+        """Acrescenta este rerun como uma linha JSON no log local."""
+        registro = {
+            "data": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+            "total_ms": self.total_ms(),
+            "etapas": self.etapas,
+            **extras,
+        }
+        with open(caminho, "a", encoding="utf-8") as f:
+            f.write(json.dumps(registro, ensure_ascii=False) + "\n")
+
+
+def registrar(campo, valor):
+    """Soma `valor` no campo da etapa em andamento (ex.: bytes de HTML gerados)."""
+    etapa = getattr(_atual, "etapa", None)
+    if etapa is not None:
+        etapa[campo] = etapa.get(campo, 0) + valor
+
+
+def cache_miss():
+    """Marca a etapa em andamento (nesta thread) como cache miss."""
+    etapa = getattr(_atual, "etapa", None)
+    if etapa is not None and "cache" in etapa:
+        etapa["cache"] = "miss"
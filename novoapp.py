@@ -1,73 +1,67 @@
 import streamlit as st
 import pandas as pd
 import json
-import gspread
-from google.oauth2.service_account import Credentials
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
-import tempfile
-import os
-
-# ========================
-# 🔐 Autenticação Google
-# ========================
-def autenticar_google(scopes):
-    info = json.loads(st.secrets["GOOGLE_CREDENTIALS"])
-    creds = Credentials.from_service_account_info(info, scopes=scopes)
-    return creds
+import clientes_google
+import envio_drive
+from csv_cartas import agregar_por_carta, dataframe_de_linhas, ler_csv_cartas
 
 
 # ========================
 # 📄 Autenticar Google Sheets
 # ========================
 def autenticar_planilha():
-    scopes = [
-        'https://www.googleapis.com/auth/spreadsheets',
-        'https://www.googleapis.com/auth/drive'
-    ]
-    creds = autenticar_google(scopes)
-    cliente = gspread.authorize(creds)
-    return cliente
+    # Credencial e cliente são criados uma vez por processo e reaproveitados
+    return clientes_google.cliente_sheets()
 
 
 # ========================
 # ☁️ Upload CSV para Google Drive
 # ========================
-def upload_csv_para_drive(nome_arquivo, caminho_arquivo, pasta_id=None):
-    creds = autenticar_google(['https://www.googleapis.com/auth/drive'])
-    service = build('drive', 'v3', credentials=creds)
-
-    file_metadata = {'name': nome_arquivo}
-    if pasta_id:
-        file_metadata['parents'] = [pasta_id]
-
-    media = MediaFileUpload(caminho_arquivo, mimetype='text/csv')
-
-    file = service.files().create(
-        body=file_metadata,
-        media_body=media,
-        fields='id'
-    ).execute()
-
-    return file.get('id')
+def upload_csv_para_drive(usuario, nome_arquivo, conteudo, pasta_id=None):
+    # Direto da memória, resumível; conteúdo igual não é reenviado e o
+    # arquivo do mesmo usuário e lista é atualizado no lugar (ver envio_drive.py)
+    return envio_drive.enviar_csv(usuario, nome_arquivo, conteudo, pasta_id)
 
 
 # ========================
 # 📥 Upload e salvar CSV no Drive
 # ========================
-def processar_upload_csv(tipo_lista):
+def processar_upload_csv(tipo_lista, usuario):
     uploaded_file = st.file_uploader(f"📤 Upload CSV da lista {tipo_lista}", type=["csv"])
     if uploaded_file is not None:
-        df = pd.read_csv(uploaded_file)
-
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".csv") as tmp:
-            tmp.write(uploaded_file.getvalue())
-            tmp_path = tmp.name
-
-        file_id = upload_csv_para_drive(f"{tipo_lista}.csv", tmp_path)
-        os.remove(tmp_path)
-
-        st.success(f"Arquivo {tipo_lista}.csv enviado ao Google Drive com ID: {file_id}")
+        # Em blocos, uma linha por carta (quantidades somadas) e com teto de memória
+        try:
+            df = ler_csv_cartas(uploaded_file)
+        except ValueError as e:
+            # CSV vazio, sem coluna de carta ou grande demais: não vai para o Drive
+            st.error(f"❌ Não foi possível ler o CSV: {e}")
+            return None
+
+        if not usuario:
+            st.info(f"Informe seu nome acima para guardar o {tipo_lista}.csv no Google Drive.")
+            return df
+
+        conteudo = uploaded_file.getvalue()
+        enviado = (usuario, envio_drive.md5_conteudo(conteudo))
+        chave_envio = f"md5_enviado_{tipo_lista}"
+        if st.session_state.get(chave_envio) == enviado:
+            # Rerun com o mesmo arquivo no uploader: já foi tratado
+            return df
+
+        try:
+            file_id, situacao = upload_csv_para_drive(usuario, f"{tipo_lista}.csv", conteudo)
+        except ValueError as e:
+            # Mais de um arquivo desse usuário e lista no Drive
+            st.error(f"❌ {e}")
+            return df
+        st.session_state[chave_envio] = enviado
+
+        if situacao == envio_drive.IGUAL:
+            st.info(f"Arquivo {tipo_lista}.csv já está no Google Drive sem mudanças (ID: {file_id})")
+        elif situacao == envio_drive.ATUALIZADO:
+            st.success(f"Arquivo {tipo_lista}.csv atualizado no Google Drive (ID: {file_id})")
+        else:
+            st.success(f"Arquivo {tipo_lista}.csv enviado ao Google Drive com ID: {file_id}")
 
         return df
     return None
@@ -76,13 +70,38 @@ def processar_upload_csv(tipo_lista):
 # ========================
 # 🔗 Ler dados do Google Sheets
 # ========================
-def ler_dados_planilha(sheet_url, aba):
+ABAS_PLANILHA = ["Have", "Want"]
+
+
+@st.cache_data(ttl=15, show_spinner=False)
+def revisao_planilha(sheet_url):
+    # Só metadados no Drive: barato, e muda a cada edição da planilha.
+    # O ttl curto evita repetir a consulta a cada clique num widget.
+    from gspread.utils import extract_id_from_url
+
+    servico = clientes_google.servico_drive()
+    arquivo = clientes_google.executar(
+        servico.files().get(fileId=extract_id_from_url(sheet_url), fields="version,modifiedTime")
+    )
+    return arquivo.get("version") or arquivo.get("modifiedTime")
+
+
+@st.cache_data(max_entries=8, show_spinner="Lendo a planilha...")
+def ler_abas_planilha(sheet_url, revisao, abas=tuple(ABAS_PLANILHA)):
+    # Abre a planilha uma vez e traz todas as abas num único values:batchGet;
+    # `revisao` só entra na chave do cache: planilha editada, nova leitura
     cliente = autenticar_planilha()
     planilha = cliente.open_by_url(sheet_url)
-    aba_dados = planilha.worksheet(aba)
-    dados = aba_dados.get_all_records()
-    df = pd.DataFrame(dados)
-    return df
+    resposta = planilha.values_batch_get([f"'{aba}'" for aba in abas])
+    return {
+        aba: dataframe_de_linhas(intervalo.get("values", []))
+        for aba, intervalo in zip(abas, resposta.get("valueRanges", []))
+    }
+
+
+def ler_dados_planilha(sheet_url):
+    abas = ler_abas_planilha(sheet_url, revisao_planilha(sheet_url))
+    return abas["Have"], abas["Want"]
 
 
 # ========================
@@ -102,7 +121,11 @@ def combinar_dados(df_planilha, df_csv, nome_fonte):
 # 🔍 Comparar listas HAVE x WANT
 # ========================
 def comparar_listas(df_have, df_want):
-    resultado = pd.merge(df_have, df_want, on="Card", how="inner", suffixes=('_Have', '_Want'))
+    # Uma linha por carta de cada lado antes do merge: o resultado nunca passa
+    # do número de cartas distintas (sem produto cartesiano de duplicatas)
+    have = agregar_por_carta(df_have)
+    want = agregar_por_carta(df_want)
+    resultado = pd.merge(have, want, on="chave", how="inner", suffixes=('_Have', '_Want'), validate="one_to_one")
     return resultado
 
 
@@ -113,8 +136,9 @@ st.set_page_config(page_title="Magic Card Manager", layout="wide")
 st.title("🧙‍♂️ Magic Card Manager - Listas e Comparação")
 
 st.subheader("1️⃣ Upload das listas locais (CSV)")
-df_have_csv = processar_upload_csv("HAVE")
-df_want_csv = processar_upload_csv("WANT")
+usuario = st.text_input("👤 Seu nome na liga (identifica seus arquivos no Drive)", key="usuario").strip()
+df_have_csv = processar_upload_csv("HAVE", usuario)
+df_want_csv = processar_upload_csv("WANT", usuario)
 
 st.subheader("2️⃣ Dados da Planilha Google")
 url_planilha = st.text_input("🔗 URL da sua planilha do Google Sheets", key="planilha_url")
@@ -123,8 +147,7 @@ df_planilha_want = None
 
 if url_planilha:
     try:
-        df_planilha_have = ler_dados_planilha(url_planilha, "Have")
-        df_planilha_want = ler_dados_planilha(url_planilha, "Want")
+        df_planilha_have, df_planilha_want = ler_dados_planilha(url_planilha)
         st.success("✅ Dados da planilha carregados com sucesso!")
     except Exception as e:
         st.error(f"Erro ao carregar planilha: {e}")
@@ -0,0 +1,43 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# ======================== PRÉ-AQUECIMENTO EM SEGUNDO PLANO ==========
+#
+# Na primeira execução do processo o app dispara aqui as cargas lentas
+# (planilha, cartas) e segue desenhando a página; quando precisa do dado,
+# obter() espera só o que ainda falta. As funções rodam fora do contexto do
+# Streamlit, então não podem chamar st.write/st.error.
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="preaquecimento")
+_lock = threading.Lock()
+_futuros = {}
+_iniciados = set()
+
+
+def iniciar(nome, funcao):
+    """Começa a rodar `funcao` em segundo plano, uma única vez por processo."""
+    with _lock:
+        if nome in _iniciados:
+            return
+        _iniciados.add(nome)
+        _futuros[nome] = _executor.submit(funcao)
+
+
+def obter(nome, funcao, timeout=None):
+    """
+    Retorna o resultado pré-carregado de `nome`, se houver, e o descarta
+    (o próximo pedido já vem do cache de quem chamou). Sem pré-carga,
+    roda `funcao` na hora.
+    """
+    with _lock:
+        futuro = _futuros.pop(nome, None)
+    if futuro is None:
+        return funcao()
+    return futuro.result(timeout=timeout)
+
+
+def pronto(nome):
+    """True se não há carga pendente de `nome` (terminou ou nunca começou)."""
+    with _lock:
+        futuro = _futuros.get(nome)
+    return futuro is None or futuro.done()
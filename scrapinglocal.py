@@ -1,8 +1,15 @@
+import argparse
+import hashlib
 import json
+import os
+import queue
+import threading
 import time
-import gspread
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
 import requests
-from oauth2client.service_account import ServiceAccountCredentials
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
@@ -11,12 +18,14 @@ from selenium.webdriver.support import expected_conditions as EC
 from bs4 import BeautifulSoup
 from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
 from lxml import html
+from banco_cartas import salvar_jogadores
+from ids_cartas import anotar_chave
+from valores_cartas import normalizar_carta
+import clientes_google
 
 def autenticar_planilha():
-    escopo = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
-    creds = ServiceAccountCredentials.from_json_keyfile_name("credenciais_google.json", escopo)
-    cliente = gspread.authorize(creds)
-    return cliente
+    # Lê credenciais_google.json (ou a variável GOOGLE_CREDENTIALS)
+    return clientes_google.cliente_sheets()
 
 def set_page_in_url(url, page_number):
     url_parts = list(urlparse(url))
@@ -25,101 +34,551 @@ def set_page_in_url(url, page_number):
     url_parts[4] = urlencode(query, doseq=True)
     return urlunparse(url_parts)
 
-def extrair_cartas_ligamagic(url, max_paginas=25):
+class PaginaLista(list):
+    """
+    Cartas de uma página, com `linhas` = linhas de carta que a tabela tinha,
+    contando as malformadas que a leitura pulou. É pelas linhas, não pelas
+    cartas, que se sabe se a página veio cheia.
+    """
+
+    def __init__(self, cartas=(), linhas=None):
+        super().__init__(cartas)
+        self.linhas = len(self) if linhas is None else linhas
+
+def linhas_da_pagina(cartas):
+    return getattr(cartas, "linhas", len(cartas))
+
+def criar_driver():
     chrome_options = Options()
     chrome_options.add_argument("--headless")
     chrome_options.add_argument("--disable-gpu")
     chrome_options.add_argument("--log-level=3")
-    driver = webdriver.Chrome(options=chrome_options)
+    return webdriver.Chrome(options=chrome_options)
+
+def extrair_cartas_da_pagina(page_source):
+    """Lê as linhas da tabela #listacolecao. Lista vazia = página sem cartas."""
+    soup = BeautifulSoup(page_source, 'html.parser')
+    tabela = soup.find("table", {"id": "listacolecao"})
+    if not tabela:
+        return []
+    cartas = []
+    linhas = tabela.find_all("tr")[1:]
+    for linha in linhas:
+        colunas = linha.find_all("td")
+        if len(colunas) >= 11:
+            div_nome = colunas[3].find("div", attrs={"data-tooltip": True})
+            nome_pt = ""
+            nome_en = ""
+            if div_nome:
+                nomes = div_nome.find_all("a")
+                if len(nomes) >= 2:
+                    nome_pt = nomes[0].get_text(strip=True)
+                    nome_en = nomes[1].get_text(strip=True)
+                elif len(nomes) == 1:
+                    nome_pt = nomes[0].get_text(strip=True)
+
+            if nome_en:
+                nome = f"{nome_pt} / {nome_en}"
+            else:
+                nome = nome_pt
+            link_carta_tag = colunas[3].find("a")
+            carta_url = ""
+            if link_carta_tag and link_carta_tag.get("href"):
+                raw_href = link_carta_tag.get("href")
+                if raw_href.startswith("http"):
+                    carta_url = raw_href
+                elif raw_href.startswith("/"):
+                    carta_url = "https://ligamagic.com.br" + raw_href
+                else:  
+                    carta_url = "https://ligamagic.com.br/" + raw_href.lstrip("./")
+            extra = colunas[4].get_text(strip=True)
+            idioma = colunas[5].get_text(strip=True)
+            qualidade = colunas[6].get_text(strip=True)
+            quantidade = colunas[0].get_text(strip=True)
+            preco_venda = colunas[9].get_text(strip=True).replace("R$", "").strip()
+            cartas.append(normalizar_carta(anotar_chave({
+                "Nome": nome,
+                "Qualidade": qualidade,
+                "Extra": extra,
+                "Idioma": idioma,
+                "Quantidade": quantidade,
+                "Preço Venda (R$)": preco_venda,
+                "Imagem": carta_url
+            })))
+    return PaginaLista(cartas, len(linhas))
+
+def raspar_pagina(driver, url, page):
+    driver.get(set_page_in_url(url, page))
+    try:
+        WebDriverWait(driver, 8).until(
+            EC.presence_of_element_located((By.ID, "listacolecao"))
+        )
+    except:
+        return []
+    return extrair_cartas_da_pagina(driver.page_source)
+
+def extrair_cartas_ligamagic(url, max_paginas=25, driver=None):
+    """
+    Raspa todas as páginas de uma lista Have/Want da Ligamagic, uma após a outra.
+
+    Parâmetros:
+      url (str): link da lista.
+      max_paginas (int): limite de páginas.
+      driver: Chrome já aberto para reaproveitar; se None, abre e fecha um próprio.
+    """
+    driver_proprio = driver is None
+    if driver_proprio:
+        driver = criar_driver()
     cartas = []
     page = 1
-    while page <= max_paginas:
-        url_pagina = set_page_in_url(url, page)
-        driver.get(url_pagina)
+    try:
+        while page <= max_paginas:
+            cartas_pagina = raspar_pagina(driver, url, page)
+            if not cartas_pagina:
+                break
+            cartas.extend(cartas_pagina)
+            page += 1
+    finally:
+        if driver_proprio:
+            driver.quit()
+    return cartas
+
+# ======================== SCRAPING VIA HTTP =========================
+#
+# Motor sem Selenium: as páginas da lista são baixadas com uma
+# requests.Session (keep-alive + retries) e a tabela é lida com lxml.
+# Só a primeira página de uma lista que não vier com a #listacolecao no
+# HTML (renderizada por JavaScript) é repassada para o Chrome.
+
+CABECALHOS_HTTP = {
+    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36",
+    "Accept-Language": "pt-BR,pt;q=0.9",
+}
+
+def criar_sessao(conexoes=4, tentativas=3):
+    sessao = requests.Session()
+    retry = Retry(total=tentativas, backoff_factor=0.5,
+                  status_forcelist=[429, 500, 502, 503, 504], allowed_methods=["GET"])
+    adaptador = HTTPAdapter(pool_connections=conexoes, pool_maxsize=conexoes, max_retries=retry)
+    sessao.mount("http://", adaptador)
+    sessao.mount("https://", adaptador)
+    sessao.headers.update(CABECALHOS_HTTP)
+    return sessao
+
+def _texto(elemento):
+    # Equivalente ao get_text(strip=True) do BeautifulSoup
+    return "".join(t.strip() for t in elemento.itertext())
+
+def extrair_cartas_lxml(page_source):
+    """
+    Mesmo resultado de extrair_cartas_da_pagina, lendo o HTML com lxml.
+
+    Retorna:
+      Lista de cartas, ou None se a página não tem a tabela #listacolecao.
+    """
+    documento = html.fromstring(page_source)
+    tabelas = documento.xpath("//table[@id='listacolecao']")
+    if not tabelas:
+        return None
+    cartas = []
+    linhas = tabelas[0].xpath(".//tr")[1:]
+    for linha in linhas:
+        colunas = linha.xpath(".//td")
+        if len(colunas) < 11:
+            continue
+        div_nome = colunas[3].xpath(".//div[@data-tooltip]")
+        nomes = div_nome[0].xpath(".//a") if div_nome else []
+        nome_pt = _texto(nomes[0]) if nomes else ""
+        nome_en = _texto(nomes[1]) if len(nomes) >= 2 else ""
+        nome = f"{nome_pt} / {nome_en}" if nome_en else nome_pt
+
+        links = colunas[3].xpath(".//a")
+        carta_url = ""
+        raw_href = links[0].get("href") if links else None
+        if raw_href:
+            if raw_href.startswith("http"):
+                carta_url = raw_href
+            elif raw_href.startswith("/"):
+                carta_url = "https://ligamagic.com.br" + raw_href
+            else:
+                carta_url = "https://ligamagic.com.br/" + raw_href.lstrip("./")
+        cartas.append(normalizar_carta(anotar_chave({
+            "Nome": nome,
+            "Qualidade": _texto(colunas[6]),
+            "Extra": _texto(colunas[4]),
+            "Idioma": _texto(colunas[5]),
+            "Quantidade": _texto(colunas[0]),
+            "Preço Venda (R$)": _texto(colunas[9]).replace("R$", "").strip(),
+            "Imagem": carta_url
+        })))
+    return PaginaLista(cartas, len(linhas))
+
+def raspar_pagina_http(sessao, url, page, timeout=15):
+    """
+    Retorna:
+      Cartas da página, ou None se ela precisa de JavaScript (primeira
+      página sem a tabela no HTML). Erro HTTP ou de conexão que sobrou
+      depois dos retries encerra só essa lista ([]), como no raspar_pagina.
+    """
+    try:
+        resposta = sessao.get(set_page_in_url(url, page), timeout=timeout)
+        resposta.raise_for_status()
+    except requests.RequestException as e:
+        print(f"Falha ao baixar a página {page} de {url}: {e}")
+        return []
+    cartas = extrair_cartas_lxml(resposta.content)
+    if cartas is None:
+        return None if page == 1 else []
+    return cartas
+
+# ======================== SCRAPING PARALELO =========================
+
+# Impressões das listas da última execução, para o modo --incremental
+ARQUIVO_ESTADO = "cartas_estado.json"
+
+ESPERA_DRIVER = 5  # segundos entre novas tentativas de pegar um Chrome do pool
+
+class PoolDrivers:
+    """Chromes headless abertos sob demanda (até `tamanho`) e emprestados às threads."""
+
+    def __init__(self, tamanho):
+        self.tamanho = tamanho
+        self._livres = queue.Queue()
+        self._todos = []
+        self._criados = 0
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        for driver in self._todos:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        self._todos = []
+
+    def _pegar(self):
+        while True:
+            try:
+                return self._livres.get_nowait()
+            except queue.Empty:
+                pass
+            with self._lock:
+                criar = self._criados < self.tamanho
+                if criar:
+                    self._criados += 1
+            if criar:
+                try:
+                    driver = criar_driver()
+                except Exception:
+                    with self._lock:
+                        self._criados -= 1  # devolve a vaga: outra thread pode tentar abrir
+                    raise
+                with self._lock:
+                    self._todos.append(driver)
+                return driver
+            try:
+                return self._livres.get(timeout=ESPERA_DRIVER)
+            except queue.Empty:
+                continue  # o Chrome que ocupava a vaga pode ter falhado ao abrir
+
+    @contextmanager
+    def emprestar(self):
+        driver = self._pegar()
         try:
-            WebDriverWait(driver, 8).until(
-                EC.presence_of_element_located((By.ID, "listacolecao"))
-            )
-        except:
-            break
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
-        tabela = soup.find("table", {"id": "listacolecao"})
-        if not tabela:
-            break
-        linhas = tabela.find_all("tr")[1:]
-        if not linhas:
-            break
-        for linha in linhas:
-            colunas = linha.find_all("td")
-            if len(colunas) >= 11:
-                div_nome = colunas[3].find("div", attrs={"data-tooltip": True})
-                nome_pt = ""
-                nome_en = ""
-                if div_nome:
-                    nomes = div_nome.find_all("a")
-                    if len(nomes) >= 2:
-                        nome_pt = nomes[0].get_text(strip=True)
-                        nome_en = nomes[1].get_text(strip=True)
-                    elif len(nomes) == 1:
-                        nome_pt = nomes[0].get_text(strip=True)
-
-                if nome_en:
-                    nome = f"{nome_pt} / {nome_en}"
+            yield driver
+        finally:
+            self._livres.put(driver)
+
+def impressao_pagina(cartas):
+    """Impressão digital de uma página: hash do conteúdo + quantidade de itens (linhas da tabela)."""
+    conteudo = json.dumps(cartas, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    return {"hash": hashlib.sha1(conteudo).hexdigest(), "itens": linhas_da_pagina(cartas)}
+
+def raspar_listas(urls, raspar, workers=4, max_paginas=25, paginas_por_lista=2, estado=None,
+                  ao_concluir=None):
+    """
+    Raspa várias listas ao mesmo tempo com `workers` threads.
+
+    As páginas são pedidas em ordem e a lista termina na primeira página com
+    menos itens que o tamanho de página do site, na primeira página vazia
+    ou numa página igual à anterior. Os itens são as linhas da tabela
+    (PaginaLista.linhas), contando as malformadas que a leitura pula, e o
+    tamanho de página é aprendido: os itens da primeira página de qualquer
+    lista que teve mais de uma (guardados nas impressões do `estado` e
+    atualizados durante a execução). Sabendo o tamanho, cada lista tem uma
+    página em andamento por vez, e a próxima só é pedida depois que a atual
+    veio cheia; sem ele (primeira execução), até `paginas_por_lista`. O
+    resultado segue a ordem de `urls` e das páginas, independente de qual
+    thread terminou primeiro.
+
+    Parâmetros:
+      urls (list): links das listas (vazio = lista sem cartas).
+      raspar: função (url, page) -> cartas da página.
+      estado (dict): estado da execução anterior (modo incremental). Listas
+        cuja primeira página não mudou reaproveitam as cartas guardadas sem
+        raspar o resto. É atualizado no lugar com as impressões novas.
+      ao_concluir: função (índice, cartas) chamada assim que cada lista
+        termina, na thread que chamou raspar_listas.
+
+    Retorna:
+      Lista de listas de cartas, na mesma ordem de `urls`.
+    """
+    incremental = estado is not None
+    listas_estado = estado.setdefault("listas", {}) if incremental else {}
+    anteriores = [listas_estado.get(url) for url in urls]
+    # Tamanho de página do site: a primeira página de uma lista com mais de uma estava cheia
+    por_pagina = max((lista["primeira"]["itens"] for lista in listas_estado.values()
+                      if lista.get("paginas", 1) > 1), default=None)
+
+    paginas = [{} for _ in urls]
+    fim = [max_paginas + 1 if url else 1 for url in urls]
+    proxima = [1] * len(urls)
+    em_andamento = [0] * len(urls)
+    primeira = [None] * len(urls)
+    reaproveitadas = [None] * len(urls)
+
+    def limite(i):
+        # Enquanto a primeira página de uma lista conhecida não chega, não
+        # adianta pedir as próximas: ela pode estar inalterada
+        if anteriores[i] and primeira[i] is None:
+            return 1
+        # Com o tamanho de página conhecido, uma página cheia é que libera a próxima
+        return 1 if por_pagina else paginas_por_lista
+
+    def montar(i):
+        if reaproveitadas[i] is not None:
+            return reaproveitadas[i]
+        cartas = []
+        anterior = None
+        for page in range(1, fim[i]):
+            cartas_pagina = paginas[i].get(page, [])
+            if cartas_pagina == anterior:
+                break  # o site repetiu a última página
+            cartas.extend(cartas_pagina)
+            anterior = cartas_pagina
+        return cartas
+
+    resultado = [None] * len(urls)
+
+    def encerrar_nas_curtas(i):
+        for page, cartas_pagina in paginas[i].items():
+            if linhas_da_pagina(cartas_pagina) < por_pagina:
+                fim[i] = min(fim[i], page + 1)
+
+    def verificar_conclusao(i):
+        if resultado[i] is None and all(p in paginas[i] for p in range(1, fim[i])):
+            resultado[i] = montar(i)
+            if ao_concluir:
+                ao_concluir(i, resultado[i])
+
+    for i in range(len(urls)):
+        verificar_conclusao(i)  # listas sem link já estão prontas
+
+    with ThreadPoolExecutor(workers) as executor:
+        pendentes = {}
+
+        def agendar():
+            # Distribui as vagas entre as listas, uma página de cada vez
+            agendou = True
+            while agendou and len(pendentes) < workers * 2:
+                agendou = False
+                for i, url in enumerate(urls):
+                    if proxima[i] < fim[i] and em_andamento[i] < limite(i):
+                        futuro = executor.submit(raspar, url, proxima[i])
+                        pendentes[futuro] = (i, proxima[i])
+                        proxima[i] += 1
+                        em_andamento[i] += 1
+                        agendou = True
+
+        agendar()
+        while pendentes:
+            prontos, _ = wait(pendentes, return_when=FIRST_COMPLETED)
+            for futuro in prontos:
+                i, page = pendentes.pop(futuro)
+                em_andamento[i] -= 1
+                cartas_pagina = futuro.result()
+                if not cartas_pagina:
+                    fim[i] = min(fim[i], page)
                 else:
-                    nome = nome_pt
-                link_carta_tag = colunas[3].find("a")
-                carta_url = ""
-                if link_carta_tag and link_carta_tag.get("href"):
-                    raw_href = link_carta_tag.get("href")
-                    if raw_href.startswith("http"):
-                        carta_url = raw_href
-                    elif raw_href.startswith("/"):
-                        carta_url = "https://ligamagic.com.br" + raw_href
-                    else:  
-                        carta_url = "https://ligamagic.com.br/" + raw_href.lstrip("./")
-                extra = colunas[4].get_text(strip=True)
-                idioma = colunas[5].get_text(strip=True)
-                qualidade = colunas[6].get_text(strip=True)
-                quantidade = colunas[0].get_text(strip=True)
-                preco_venda = colunas[9].get_text(strip=True).replace("R$", "").strip()
-                cartas.append({
-                    "Nome": nome,
-                    "Qualidade": qualidade,
-                    "Extra": extra,
-                    "Idioma": idioma,
-                    "Quantidade": quantidade,
-                    "Preço Venda (R$)": preco_venda,
-                    "Imagem": carta_url
-                })
-        page += 1
-    driver.quit()
-    return cartas
+                    paginas[i][page] = cartas_pagina
+                    if page == 1:
+                        primeira[i] = impressao_pagina(cartas_pagina)
+                        anterior = anteriores[i]
+                        if anterior and anterior["primeira"] == primeira[i]:
+                            reaproveitadas[i] = anterior["cartas"]
+                            fim[i] = 1
+                    # O site repete a última página depois do fim da lista
+                    if paginas[i].get(page - 1) == cartas_pagina:
+                        fim[i] = min(fim[i], page)
+                    elif paginas[i].get(page + 1) == cartas_pagina:
+                        fim[i] = min(fim[i], page + 1)
+                    # Uma página seguida de outra com cartas estava cheia
+                    cheias = [linhas_da_pagina(paginas[i][p]) for p in (page - 1, page)
+                              if p in paginas[i] and p + 1 in paginas[i] and p + 1 < fim[i]]
+                    if cheias:
+                        por_pagina = max(por_pagina or 0, *cheias)
+                    if por_pagina:
+                        encerrar_nas_curtas(i)
+                verificar_conclusao(i)
+            agendar()
+
+    for i, url in enumerate(urls):
+        if incremental and primeira[i] is not None and reaproveitadas[i] is None:
+            listas_estado[url] = {"primeira": primeira[i], "cartas": resultado[i], "paginas": fim[i] - 1}
+
+    if incremental:
+        estado.pop("itens_por_pagina", None)  # gravado por versões anteriores, não é mais usado
+    return resultado
+
+def raspar_listas_selenium(urls, workers=4, max_paginas=25, estado=None, ao_concluir=None):
+    """Raspa as listas com um pool de `workers` Chromes reaproveitados."""
+    with PoolDrivers(workers) as pool:
+        def raspar(url, page):
+            with pool.emprestar() as driver:
+                return raspar_pagina(driver, url, page)
+        return raspar_listas(urls, raspar, workers=workers, max_paginas=max_paginas, estado=estado,
+                             ao_concluir=ao_concluir)
+
+def raspar_listas_http(urls, workers=4, max_paginas=25, sessao=None, drivers_reserva=1, estado=None,
+                       ao_concluir=None):
+    """
+    Raspa as listas via HTTP + lxml, caindo para o Chrome só nas páginas que
+    precisam de JavaScript.
 
+    Parâmetros:
+      sessao: requests.Session a usar (ex.: apontada para um servidor local
+        de testes); por padrão criar_sessao(workers).
+      drivers_reserva (int): máximo de Chromes abertos para o fallback.
+    """
+    sessao = sessao or criar_sessao(workers)
+    with PoolDrivers(drivers_reserva) as pool:
+        def raspar(url, page):
+            cartas = raspar_pagina_http(sessao, url, page)
+            if cartas is None:
+                with pool.emprestar() as driver:
+                    return raspar_pagina(driver, url, page)
+            return cartas
+        return raspar_listas(urls, raspar, workers=workers, max_paginas=max_paginas, estado=estado,
+                             ao_concluir=ao_concluir)
+
+# ======================== SAÍDA NDJSON ==============================
+
+class SaidaNdjson:
+    """
+    Grava um jogador por linha (JSON compacto) assim que ele fica pronto.
+
+    As linhas vão para `<caminho>.parcial`, então um erro no meio do scraping
+    não perde quem já terminou. finalizar() reescreve as linhas na ordem da
+    planilha e publica o arquivo final de uma vez (os.replace).
+    """
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self.parcial = caminho + ".parcial"
+        self._arquivo = open(self.parcial, "w", encoding="utf-8")
+        self._posicoes = {}
+
+    def escrever(self, indice, jogador):
+        self._posicoes[indice] = self._arquivo.tell()
+        self._arquivo.write(json.dumps(jogador, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self._arquivo.flush()
+
+    def finalizar(self):
+        self._arquivo.close()
+        temporario = self.caminho + ".tmp"
+        with open(self.parcial, encoding="utf-8") as origem, open(temporario, "w", encoding="utf-8") as destino:
+            for indice in sorted(self._posicoes):
+                origem.seek(self._posicoes[indice])
+                destino.write(origem.readline())
+            destino.flush()
+            os.fsync(destino.fileno())
+        os.replace(temporario, self.caminho)
+        os.remove(self.parcial)
+
+def montar_jogador(linha, lista_have, lista_want):
+    return {
+        "nome": linha.get("Jogador"),
+        "whatsapp": linha.get("Whatsapp (opcional)", ""),
+        "have": lista_have,
+        "want": lista_want
+    }
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scraping das listas Have/Want da Ligamagic.")
+    parser.add_argument("--sqlite", metavar="ARQUIVO",
+                        help="grava também um banco SQLite (ex.: cartas.db) além do cartas.json")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="quantidade de páginas raspadas em paralelo (padrão: 1)")
+    parser.add_argument("--motor", choices=["selenium", "http"], default="selenium",
+                        help="selenium (Chrome headless) ou http (requests + lxml, Chrome só como reserva)")
+    parser.add_argument("--ndjson", metavar="ARQUIVO",
+                        help="grava um jogador por linha (ex.: cartas.ndjson) à medida que termina, no lugar do cartas.json")
+    parser.add_argument("--incremental", action="store_true",
+                        help=f"reaproveita as listas cuja primeira página não mudou desde a última execução ({ARQUIVO_ESTADO})")
+    args = parser.parse_args()
+
     # --- Config Google Sheets: ---
     cliente = autenticar_planilha()
     planilha = cliente.open_by_url("https://docs.google.com/spreadsheets/d/1FmicnHU9caYH0NrxO1W49OyyJsfu-vYTKd9rzkyzZ7E/edit#gid=0")
     aba = planilha.get_worksheet(0)
     dados = aba.get_all_records()
 
-    jogadores = []
+    # Have e want de todos os jogadores, intercalados: [have0, want0, have1, ...]
+    urls = []
     for linha in dados:
-        nome = linha.get("Jogador")
-        whatsapp = linha.get("Whatsapp (opcional)", "")
-        link_have = linha.get("Link do Have", "").strip()
-        link_want = linha.get("Link do Want", "").strip()
-        lista_have = extrair_cartas_ligamagic(link_have) if link_have else []
-        lista_want = extrair_cartas_ligamagic(link_want) if link_want else []
-        jogadores.append({
-            "nome": nome,
-            "whatsapp": whatsapp,
-            "have": lista_have,
-            "want": lista_want
-        })
-
-    # Salva em JSON para commit no GitHub!
-    with open('cartas.json', 'w', encoding='utf-8') as f:
-        json.dump(jogadores, f, ensure_ascii=False, indent=2)
-
-    print("Scraping concluído! Arquivo cartas.json salvo.")
\ No newline at end of file
+        urls.append(linha.get("Link do Have", "").strip())
+        urls.append(linha.get("Link do Want", "").strip())
+    estado = None
+    if args.incremental:
+        estado = {}
+        if os.path.exists(ARQUIVO_ESTADO):
+            with open(ARQUIVO_ESTADO, encoding='utf-8') as f:
+                estado = json.load(f)
+        listas_anteriores = dict(estado.get("listas", {}))
+
+    saida = SaidaNdjson(args.ndjson) if args.ndjson else None
+    prontas = {}
+
+    def ao_concluir(i, cartas):
+        # Jogador vai para o NDJSON assim que have e want terminam
+        prontas[i] = cartas
+        j = i // 2
+        if saida and 2 * j in prontas and 2 * j + 1 in prontas:
+            saida.escrever(j, montar_jogador(dados[j], prontas[2 * j], prontas[2 * j + 1]))
+
+    if args.motor == "http":
+        listas = raspar_listas_http(urls, workers=max(1, args.workers), estado=estado, ao_concluir=ao_concluir)
+    else:
+        listas = raspar_listas_selenium(urls, workers=max(1, args.workers), estado=estado, ao_concluir=ao_concluir)
+
+    if args.incremental:
+        reaproveitadas = sum(
+            1 for url in set(urls)
+            if url in listas_anteriores and estado["listas"][url] is listas_anteriores[url]
+        )
+        with open(ARQUIVO_ESTADO + ".tmp", 'w', encoding='utf-8') as f:
+            json.dump(estado, f, ensure_ascii=False)
+        os.replace(ARQUIVO_ESTADO + ".tmp", ARQUIVO_ESTADO)
+        print(f"{reaproveitadas} lista(s) sem mudança reaproveitada(s).")
+
+    jogadores = [
+        montar_jogador(linha, listas[2 * i], listas[2 * i + 1])
+        for i, linha in enumerate(dados)
+    ]
+
+    if saida:
+        saida.finalizar()
+        print(f"Scraping concluído! Arquivo {args.ndjson} salvo.")
+    else:
+        # Salva em JSON para commit no GitHub!
+        with open('cartas.json', 'w', encoding='utf-8') as f:
+            json.dump(jogadores, f, ensure_ascii=False, indent=2)
+
+        print("Scraping concluído! Arquivo cartas.json salvo.")
+
+    if args.sqlite:
+        salvar_jogadores(jogadores, args.sqlite)
+        print(f"Banco SQLite {args.sqlite} salvo.")
\ No newline at end of file
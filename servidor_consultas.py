@@ -0,0 +1,323 @@
+import argparse
+import http.client
+import io
+import json
+import math
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.error import HTTPError, URLError
+from urllib.parse import parse_qs, quote, unquote, urlencode, urlparse
+
+from armazem_cartas import normalizar_nome_jogador, obter_armazem
+from busca_cartas import IndiceBusca
+from trocas import MotorTrocas
+
+# ======================== API DE CONSULTAS ==========================
+#
+# Serviço HTTP local, só com a biblioteca padrão, para quem precisa das
+# consultas sem rodar o script do Streamlit inteiro (bot do WhatsApp, tela
+# do balcão da loja...):
+#
+#   python servidor_consultas.py --porta 8765
+#
+#   GET /busca?q=sol ring&limite=50       ofertas Have cujo nome contém a busca
+#   GET /jogadores                        nomes, na ordem do cartas.json
+#   GET /jogadores/<nome>/have            lista Have (ou /want) do jogador
+#   GET /jogadores/<nome>/trocas          comparativo com os outros jogadores
+#   GET /jogadores/<nome>/ciclos?limite=3 trocas em cadeia que passam por ele
+#   GET /metricas                         requisições e latência p50/p99 por rota
+#   GET /saude                            versão das cartas carregada
+#
+# Os índices (busca, motor de trocas, ciclos) são os mesmos do app, montados
+# uma vez por versão do armazém de cartas e compartilhados entre as threads
+# das requisições. Quando o scraper grava um arquivo novo, a próxima
+# requisição remonta tudo.
+
+PORTA_PADRAO = 8765
+LIMITE_BUSCA = 200
+FILA_CONEXOES = 64  # conexões aguardando accept(); o padrão do socketserver (5) enfileira clientes
+CONEXOES_CLIENTE = 8  # conexões ociosas guardadas por servidor no cliente
+AMOSTRAS_LATENCIA = 10_000  # últimas requisições guardadas por rota
+CONSULTAS_JOGADOR = ("have", "want", "trocas", "ciclos")
+
+# Campos da carta que saem na API (os ids inteiros só valem dentro do processo)
+CAMPOS_CARTA = ["Nome", "Quantidade", "Qualidade", "Extra", "Idioma", "Preço Venda (R$)",
+                "Imagem", "Link Detalhe", "quantidade", "preco_centavos", "chave", "edicao"]
+
+
+def carta_json(carta):
+    return {campo: carta[campo] for campo in CAMPOS_CARTA if campo in carta}
+
+
+class IndiceConsultas:
+    """Índices de uma versão das cartas; só leitura depois de montado."""
+
+    def __init__(self, jogadores, versao=None):
+        inicio = time.perf_counter()
+        self.versao = versao
+        self.jogadores = jogadores
+        self.por_nome = {}
+        for jogador in jogadores:
+            self.por_nome.setdefault(normalizar_nome_jogador(jogador.get("nome")), jogador)
+        self.busca = IndiceBusca(jogadores, tipo="have")
+        self.motor = MotorTrocas(jogadores)
+        self._ciclos = None  # grafo da liga: só montado na primeira consulta de ciclos
+        self._lock = threading.Lock()
+        self.tempo_montagem_ms = (time.perf_counter() - inicio) * 1000
+
+    def jogador(self, nome):
+        return self.por_nome.get(normalizar_nome_jogador(nome))
+
+    def ciclos(self):
+        with self._lock:
+            if self._ciclos is None:
+                from ciclos_trocas import CiclosTrocas  # numpy só quando alguém pede ciclos
+
+                self._ciclos = CiclosTrocas(self.jogadores)
+            return self._ciclos
+
+    def buscar(self, busca, limite=LIMITE_BUSCA):
+        return [
+            {"jogador": jogador["nome"], "whatsapp": jogador.get("whatsapp", ""), "carta": carta_json(carta)}
+            for jogador, carta in self.busca.buscar(busca, limite=limite)
+        ]
+
+    def trocas(self, jogador):
+        return [
+            {"jogador": outro, "em_demanda": par["em_demanda"], "pode_trocar": par["pode_trocar"]}
+            for outro, par in self.motor.comparativo(jogador["nome"])
+        ]
+
+
+class Latencias:
+    """Últimas AMOSTRAS_LATENCIA durações de cada rota, para p50/p99."""
+
+    def __init__(self, amostras=AMOSTRAS_LATENCIA):
+        self.amostras = amostras
+        self._lock = threading.Lock()
+        self._por_rota = {}   # rota -> [ms, ...] (buffer circular)
+        self._contagem = {}   # rota -> requisições desde o início
+
+    def registrar(self, rota, ms):
+        with self._lock:
+            total = self._contagem.get(rota, 0)
+            tempos = self._por_rota.setdefault(rota, [])
+            if len(tempos) < self.amostras:
+                tempos.append(ms)
+            else:
+                tempos[total % self.amostras] = ms
+            self._contagem[rota] = total + 1
+
+    def resumo(self):
+        with self._lock:
+            copia = {rota: sorted(tempos) for rota, tempos in self._por_rota.items()}
+            contagem = dict(self._contagem)
+        return {
+            rota: {
+                "requisicoes": contagem[rota],
+                "p50_ms": round(percentil(tempos, 50), 3),
+                "p99_ms": round(percentil(tempos, 99), 3),
+                "max_ms": round(tempos[-1], 3),
+            }
+            for rota, tempos in copia.items()
+        }
+
+
+def percentil(ordenados, p):
+    """Percentil por posição (nearest-rank) de uma lista já ordenada."""
+    if not ordenados:
+        return 0.0
+    return ordenados[max(0, math.ceil(p / 100 * len(ordenados)) - 1)]
+
+
+class ServidorConsultas(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = FILA_CONEXOES
+
+    def __init__(self, endereco, armazem=None):
+        super().__init__(endereco, _Requisicao)
+        self.armazem = armazem or obter_armazem()
+        self.latencias = Latencias()
+        self._indice = None
+        self._lock = threading.Lock()
+
+    def indice(self):
+        """Índice da versão atual das cartas (remontado se o arquivo mudou)."""
+        versao = self.armazem.atualizar()
+        with self._lock:
+            if self._indice is None or self._indice.versao != versao:
+                self._indice = IndiceConsultas(self.armazem.jogadores(), versao)
+            return self._indice
+
+
+class _Requisicao(BaseHTTPRequestHandler):
+    server_version = "LigaSBS"
+    protocol_version = "HTTP/1.1"  # conexões reaproveitadas pelos clientes
+    # Cabeçalhos e corpo saem em dois writes: com o Nagle ligado, numa conexão
+    # keep-alive o corpo espera o ACK atrasado do cliente (~40 ms por resposta)
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        inicio = time.perf_counter()
+        url = urlparse(self.path)
+        partes = [unquote(p) for p in url.path.split("/") if p]
+        parametros = {chave: valores[-1] for chave, valores in parse_qs(url.query).items()}
+        try:
+            rota, status, corpo = self._rotear(partes, parametros)
+        except ValueError as e:
+            rota, status, corpo = "/" + "/".join(partes[:1]), 400, {"erro": str(e)}
+        except Exception as e:
+            rota, status, corpo = "/" + "/".join(partes[:1]), 500, {"erro": str(e)}
+        self._responder(status, corpo)
+        self.server.latencias.registrar(rota, (time.perf_counter() - inicio) * 1000)
+
+    @staticmethod
+    def _limite(parametros, padrao, maximo=None):
+        limite = int(parametros.get("limite", padrao))
+        if limite < 1:
+            raise ValueError("O limite precisa ser 1 ou mais.")
+        return min(limite, maximo) if maximo else limite
+
+    def _rotear(self, partes, parametros):
+        """Retorna (rota para as métricas, status HTTP, corpo JSON)."""
+        if partes == ["metricas"]:
+            return "/metricas", 200, self.server.latencias.resumo()
+        indice = self.server.indice()
+        if not partes or partes == ["saude"]:
+            return "/saude", 200, {"versao": indice.versao, "jogadores": len(indice.jogadores)}
+        if partes == ["busca"]:
+            busca = parametros.get("q", "").strip()
+            if not busca:
+                raise ValueError("Informe a busca em ?q=")
+            limite = self._limite(parametros, LIMITE_BUSCA, LIMITE_BUSCA)
+            return "/busca", 200, indice.buscar(busca, limite)
+        if partes == ["jogadores"]:
+            return "/jogadores", 200, [j["nome"] for j in indice.jogadores]
+        if partes[0] == "jogadores" and len(partes) == 3 and partes[2] in CONSULTAS_JOGADOR:
+            _, nome, consulta = partes
+            rota = f"/jogadores/{{nome}}/{consulta}"
+            jogador = indice.jogador(nome)
+            if jogador is None:
+                return rota, 404, {"erro": f"Jogador não encontrado: {nome}"}
+            if consulta in ("have", "want"):
+                return rota, 200, [carta_json(c) for c in jogador.get(consulta, [])]
+            if consulta == "trocas":
+                return rota, 200, indice.trocas(jogador)
+            limite = self._limite(parametros, 3)
+            return rota, 200, indice.ciclos().ciclos_do_jogador(jogador["nome"], limite=limite)
+        return "(desconhecida)", 404, {"erro": f"Rota desconhecida: {self.path}"}
+
+    def _responder(self, status, corpo):
+        dados = json.dumps(corpo, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(dados)))
+        self.end_headers()
+        self.wfile.write(dados)
+
+    def log_message(self, formato, *args):
+        pass  # uma linha por requisição no stderr atrapalha mais do que ajuda; ver /metricas
+
+
+# ======================== CLIENTE ===================================
+#
+# As conexões HTTP/1.1 com o servidor ficam num pool pequeno por host:porta
+# e são reaproveitadas entre as chamadas (e as threads): sem um handshake
+# TCP por consulta. Uma conexão que o servidor já fechou é trocada por uma
+# nova e a consulta é repetida uma vez.
+
+_conexoes_livres = {}
+_lock_conexoes = threading.Lock()
+
+
+def _pegar_conexao(host, porta, timeout):
+    with _lock_conexoes:
+        livres = _conexoes_livres.get((host, porta))
+        conexao = livres.pop() if livres else None
+    if conexao is None:
+        return http.client.HTTPConnection(host, porta, timeout=timeout), False
+    conexao.timeout = timeout
+    if conexao.sock is not None:
+        conexao.sock.settimeout(timeout)
+    return conexao, True
+
+
+def _devolver_conexao(host, porta, conexao):
+    with _lock_conexoes:
+        livres = _conexoes_livres.setdefault((host, porta), [])
+        if len(livres) < CONEXOES_CLIENTE:
+            livres.append(conexao)
+            return
+    conexao.close()
+
+
+def _get(host, porta, caminho, timeout):
+    """(status, motivo, cabeçalhos, corpo) de um GET, numa conexão do pool."""
+    while True:
+        conexao, reaproveitada = _pegar_conexao(host, porta, timeout)
+        try:
+            conexao.request("GET", caminho)
+            resposta = conexao.getresponse()
+            corpo = resposta.read()
+        except (ConnectionError, http.client.HTTPException):
+            conexao.close()
+            if reaproveitada:
+                continue  # o servidor fechou a conexão ociosa: tenta numa nova
+            raise
+        except BaseException:
+            conexao.close()
+            raise
+        if resposta.will_close:
+            conexao.close()
+        else:
+            _devolver_conexao(host, porta, conexao)
+        return resposta.status, resposta.reason, resposta.headers, corpo
+
+
+def consultar(url_base, caminho, timeout=2.0, **parametros):
+    """
+    GET na API de consultas, numa conexão keep-alive reaproveitada.
+
+    Parâmetros:
+      url_base (str): ex.: "http://127.0.0.1:8765".
+      caminho (str): ex.: "/busca" ou ["jogadores", nome, "have"] (partes são escapadas).
+      parametros: vão para a query string.
+
+    Retorna:
+      O JSON da resposta. Falhas de rede e status de erro sobem como OSError
+      (URLError/HTTPError).
+    """
+    if not isinstance(caminho, str):
+        caminho = "/" + "/".join(quote(str(parte), safe="") for parte in caminho)
+    url = url_base.rstrip("/") + caminho
+    if parametros:
+        url += "?" + urlencode(parametros)
+    partes = urlparse(url)
+    caminho_query = partes.path + ("?" + partes.query if partes.query else "")
+    try:
+        status, motivo, cabecalhos, corpo = _get(partes.hostname, partes.port or 80, caminho_query, timeout)
+    except http.client.HTTPException as e:
+        raise URLError(e) from e
+    if status >= 400:
+        raise HTTPError(url, status, motivo, cabecalhos, io.BytesIO(corpo))
+    return json.loads(corpo.decode("utf-8"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="API JSON de busca de cartas e trocas.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=PORTA_PADRAO)
+    parser.add_argument("--cartas", default=None, help="cartas.json ou .ndjson (padrão: o mesmo do app)")
+    args = parser.parse_args()
+
+    servidor = ServidorConsultas((args.host, args.porta), obter_armazem(args.cartas))
+    indice = servidor.indice()  # monta antes da primeira requisição
+    print(f"{len(indice.jogadores)} jogadores carregados em {indice.tempo_montagem_ms:.0f} ms.")
+    print(f"Servindo em http://{args.host}:{servidor.server_address[1]} (Ctrl+C para parar)")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
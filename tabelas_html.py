@@ -0,0 +1,80 @@
+from html import escape
+
+# ======================== TABELAS HTML DE CARTAS ====================
+#
+# Os estilos ficam em classes CSS (CSS_TABELAS, injetado uma vez por
+# página) em vez de repetidos em cada <td>, e o HTML de cada tabela é
+# montado numa lista e unido uma única vez no final.
+
+CSS_TABELAS = """
+<style>
+.lsbs-caixa {border-radius:15px;border:1.5px solid #e6e6ef;box-shadow:0 2px 10px #0001;background:#fff;margin-bottom:14px;margin-top:2px;padding:0px;overflow:hidden;box-sizing:border-box;max-width:100%;}
+.lsbs-rolagem {overflow-y:hidden;overflow-x:auto;border-radius:15px;padding-bottom:6px;box-sizing:border-box;}
+.lsbs-corpo {overflow-y:auto;overflow-x:hidden;}
+.lsbs-tabela {border-collapse:collapse;width:100%;font-family:"Segoe UI",Roboto,Arial,sans-serif;font-size:12px;table-layout:fixed;}
+.lsbs-cabecalho {background:#f7f8fa;}
+.lsbs-tabela th {border-bottom:2px solid #e6e6ef;color:#2e4a66;background:#f0f2fa;padding:6px 5px;text-align:left;font-weight:600;position:sticky;top:0;z-index:2;}
+.lsbs-tabela tr {background:#fff;}
+.lsbs-tabela td {padding:6px 5px;border-bottom:1px solid #e6e6ef;color:#222;}
+.lsbs-tabela th.lsbs-nome {min-width:340px;max-width:400px;width:33%;}
+.lsbs-tabela td.lsbs-nome {vertical-align:middle;word-break:break-word;min-width:180px;max-width:400px;width:33%;}
+.lsbs-tabela .lsbs-preco {width:90px;max-width:120px;}
+.lsbs-tabela td.lsbs-preco {text-align:right;}
+.lsbs-tabela .lsbs-jogador {width:140px;word-break:break-word;}
+.lsbs-tabela .lsbs-outra {width:66px;max-width:88px;}
+.lsbs-tabela td.lsbs-outra {text-align:center;}
+.lsbs-tabela td.lsbs-nome a {color:#1976d2;text-decoration:none;font-weight:600;min-width:180px;display:inline-block;line-height:1.3;word-break:break-word;}
+</style>
+"""
+
+COLUNAS_PADRAO = ["Nome", "Quantidade", "Qualidade", "Extra", "Idioma", "Preço Venda (R$)"]
+
+
+def _classe_coluna(coluna):
+    if coluna == "Nome":
+        return "lsbs-nome"
+    if coluna == "Preço Venda (R$)":
+        return "lsbs-preco"
+    if coluna == "Jogador":
+        return "lsbs-jogador"
+    return "lsbs-outra"
+
+
+def tabela_html_cartas(cartas, altura_px=350, colunas_desejadas=None):
+    """
+    Monta a tabela HTML das cartas (depende do CSS_TABELAS na página).
+
+    Parâmetros:
+      cartas (list): cartas no formato do cartas.json.
+      altura_px (int): altura máxima da área com rolagem.
+      colunas_desejadas (list): colunas a exibir; por padrão todas, inclusive preço.
+
+    Retorna:
+      String com o HTML da tabela, com os textos das cartas escapados.
+    """
+    if not cartas:
+        return "<i>Nenhuma carta cadastrada.</i>"
+    if colunas_desejadas is None:
+        colunas_desejadas = COLUNAS_PADRAO
+    colunas = [c for c in colunas_desejadas if c in cartas[0]]
+    classes = [_classe_coluna(c) for c in colunas]
+
+    partes = [
+        f'<div class="lsbs-caixa"><div class="lsbs-rolagem" style="max-height:{altura_px + 55}px;">',
+        '<table class="lsbs-tabela lsbs-cabecalho"><thead><tr>',
+    ]
+    partes.extend(f'<th class="{classe}">{escape(c)}</th>' for c, classe in zip(colunas, classes))
+    partes.append("</tr></thead></table>")
+    partes.append(f'<div class="lsbs-corpo" style="max-height:{altura_px}px;"><table class="lsbs-tabela"><tbody>')
+    for carta in cartas:
+        partes.append("<tr>")
+        for c, classe in zip(colunas, classes):
+            if c == "Nome":
+                link = carta.get("Link Detalhe") or carta.get("Imagem") or "#"
+                cell = f'<a href="{escape(link)}" target="_blank">{escape(carta.get("Nome", ""))}</a>'
+            else:
+                cell = escape(str(carta.get(c, "-")))
+            partes.append(f'<td class="{classe}">{cell}</td>')
+        partes.append("</tr>")
+    partes.append("</tbody></table></div></div></div>")
+    return "".join(partes)
@@ -0,0 +1,71 @@
+import time
+
+from ids_cartas import obter_catalogo
+
+# ======================== MOTOR DE TROCAS ===========================
+#
+# Índices invertidos carta -> {jogadores que têm} e carta -> {jogadores que
+# querem}, montados uma vez por versão dos dados. A partir deles o
+# comparativo de todos os jogadores sai percorrendo só os pares que de fato
+# combinam, em vez de cruzar as listas de cada par de jogadores.
+#
+# As cartas são comparadas pelo id canônico (ids_cartas.py), então a mesma
+# carta com outra tradução no "Nome" também combina.
+
+
+class MotorTrocas:
+    def __init__(self, jogadores):
+        """
+        Parâmetros:
+          jogadores (list): dicts com "nome", "have" e "want".
+        """
+        inicio = time.perf_counter()
+        catalogo = obter_catalogo()
+        self.ordem = {}
+        self.quem_tem = {}   # id_carta -> {jogadores}
+        self.quem_quer = {}
+        for jogador in jogadores:
+            nome = jogador["nome"]
+            self.ordem.setdefault(nome, len(self.ordem))
+            for carta in jogador.get("have", []):
+                if "Nome" in carta:
+                    self.quem_tem.setdefault(catalogo.id_carta(carta), set()).add(nome)
+            for carta in jogador.get("want", []):
+                if "Nome" in carta:
+                    self.quem_quer.setdefault(catalogo.id_carta(carta), set()).add(nome)
+
+        # comparativos[jogador][outro] = {"em_demanda": [...], "pode_trocar": [...]}
+        self.comparativos = {}
+        for id_carta in self.quem_tem.keys() & self.quem_quer.keys():
+            carta = catalogo.nome(id_carta)
+            for dono in self.quem_tem[id_carta]:
+                for interessado in self.quem_quer[id_carta]:
+                    if dono == interessado:
+                        continue
+                    # dono tem e interessado quer
+                    self._par(dono, interessado)["em_demanda"].append(carta)
+                    # interessado quer e dono tem
+                    self._par(interessado, dono)["pode_trocar"].append(carta)
+        for por_outro in self.comparativos.values():
+            for par in por_outro.values():
+                par["em_demanda"].sort()
+                par["pode_trocar"].sort()
+        self.tempo_montagem_ms = (time.perf_counter() - inicio) * 1000
+
+    def _par(self, jogador, outro):
+        por_outro = self.comparativos.setdefault(jogador, {})
+        par = por_outro.get(outro)
+        if par is None:
+            par = por_outro[outro] = {"em_demanda": [], "pode_trocar": []}
+        return par
+
+    def comparativo(self, nome_jogador):
+        """
+        Retorna:
+          Lista de (outro jogador, {"em_demanda": cartas que o outro quer e este
+          jogador tem, "pode_trocar": cartas que este jogador quer e o outro
+          tem}), na ordem da planilha. Só aparecem jogadores com pelo menos uma
+          carta em comum.
+        """
+        por_outro = self.comparativos.get(nome_jogador, {})
+        return sorted(por_outro.items(), key=lambda item: self.ordem[item[0]])
@@ -0,0 +1,63 @@
+import re
+from functools import lru_cache
+
+# ======================== QUANTIDADE E PREÇO NUMÉRICOS ==============
+#
+# A Ligamagic mostra "2x" e "0,04"; esses textos continuam nas colunas
+# "Quantidade" e "Preço Venda (R$)" (são o que as tabelas exibem), e a
+# ingestão acrescenta ao lado as versões numéricas, calculadas uma vez:
+#
+#   "quantidade": int            ("2x" -> 2)
+#   "preco_centavos": int | None ("1.234,56" -> 123456; sem preço -> None)
+#
+# O preço fica em centavos inteiros para somas e comparações exatas.
+
+_DIGITOS = re.compile(r"\d+")
+_PRECO = re.compile(r"\d[\d.]*(?:,\d{1,2})?")
+
+
+@lru_cache(maxsize=4096)  # poucos textos distintos ("1x", "0,10"...) repetidos milhares de vezes
+def quantidade_int(texto):
+    """'2x' -> 2. Sem número legível vale 1: a carta está listada."""
+    if isinstance(texto, int):
+        return texto
+    encontrado = _DIGITOS.search(str(texto or ""))
+    return int(encontrado.group()) if encontrado else 1
+
+
+@lru_cache(maxsize=4096)
+def preco_centavos(texto):
+    """'R$ 1.234,56' -> 123456; None se não houver preço."""
+    if isinstance(texto, int):
+        return texto
+    encontrado = _PRECO.search(str(texto or ""))
+    if not encontrado:
+        return None
+    reais, _, centavos = encontrado.group().replace(".", "").partition(",")
+    return int(reais) * 100 + int(centavos.ljust(2, "0") or 0)
+
+
+def formatar_reais(centavos):
+    """123456 -> 'R$ 1.234,56'."""
+    if centavos is None:
+        return "-"
+    reais, resto = divmod(int(centavos), 100)
+    return f"R$ {reais:,}".replace(",", ".") + f",{resto:02d}"
+
+
+def normalizar_carta(carta):
+    """Acrescenta (se faltarem) os campos numéricos à carta e a devolve."""
+    if "quantidade" not in carta:
+        carta["quantidade"] = quantidade_int(carta.get("Quantidade"))
+    if "preco_centavos" not in carta:
+        carta["preco_centavos"] = preco_centavos(carta.get("Preço Venda (R$)"))
+    return carta
+
+
+def normalizar_jogadores(jogadores):
+    """Normaliza todas as cartas have/want, no lugar (arquivos de scrapers antigos)."""
+    for jogador in jogadores:
+        for tipo in ("have", "want"):
+            for carta in jogador.get(tipo, []):
+                normalizar_carta(carta)
+    return jogadores
@@ -0,0 +1,231 @@
+import numpy as np
+
+from valores_cartas import normalizar_carta
+
+# ======================== VISÃO COLUNAR DAS OFERTAS =================
+#
+# As cartas have/want de todos os jogadores viram arrays NumPy paralelos
+# (quantidade, preço em centavos, jogador), montados uma vez por versão dos
+# dados. Valor das coleções, ordenação por preço e filtro por faixa de
+# preço são operações vetorizadas nesses arrays; os dicts originais só são
+# tocados para devolver as cartas selecionadas.
+#
+# As ofertas de cada jogador ficam contíguas, então as de um jogador são
+# uma fatia [inicio:fim] dos arrays.
+#
+# Para os filtros por faceta (Qualidade, Idioma, Extra, faixa de preço),
+# cada valor de cada faceta tem um array booleano sobre todas as ofertas,
+# montado na primeira consulta. Uma combinação de filtros é um OU dos
+# valores escolhidos dentro da faceta e um E entre as facetas; a contagem
+# de cada valor considera os filtros das outras facetas.
+
+SEM_PRECO = -1  # preco_centavos ausente
+
+FACETAS = ["Qualidade", "Idioma", "Extra"]
+FACETA_PRECO = "Preço"
+# (rótulo, mínimo, máximo) em centavos; o máximo não entra na faixa
+FAIXAS_PRECO = [
+    ("Até R$ 1", 0, 100),
+    ("R$ 1 a 5", 100, 500),
+    ("R$ 5 a 20", 500, 2000),
+    ("R$ 20 a 100", 2000, 10000),
+    ("Acima de R$ 100", 10000, None),
+    ("Sem preço", None, None),
+]
+
+
+def _valores_faceta(faceta, texto):
+    """Valores da carta na faceta; o Extra pode ter vários ("Foil, Promo")."""
+    texto = (texto or "").strip()
+    if faceta == "Extra" and "," in texto:
+        return [parte.strip() for parte in texto.split(",")]
+    return [texto]
+
+
+class VisaoOfertas:
+    def __init__(self, jogadores, tipo="have"):
+        """
+        Parâmetros:
+          jogadores (list): jogadores no formato do cartas.json.
+          tipo (str): "have" ou "want".
+        """
+        self.tipo = tipo
+        self.nomes = [j["nome"] for j in jogadores]
+        self.cartas = []
+        self.fatias = {}
+        quantidades, precos, tamanhos = [], [], []
+        for jogador in jogadores:
+            lista = jogador.get(tipo, [])
+            inicio = len(self.cartas)
+            for carta in lista:
+                normalizar_carta(carta)
+                quantidades.append(carta["quantidade"])
+                preco = carta["preco_centavos"]
+                precos.append(SEM_PRECO if preco is None else preco)
+            self.cartas.extend(lista)
+            self.fatias.setdefault(jogador["nome"], (inicio, len(self.cartas)))
+            tamanhos.append(len(lista))
+
+        self.quantidade = np.array(quantidades, dtype=np.int64)
+        self.preco_centavos = np.array(precos, dtype=np.int64)
+        self.jogador = np.repeat(np.arange(len(jogadores), dtype=np.int32), tamanhos)
+        self.tem_preco = self.preco_centavos != SEM_PRECO
+        self._facetas = None  # montadas na primeira consulta por faceta
+
+    def valor_por_jogador(self):
+        """
+        Valor de cada lista (soma de quantidade × preço; cartas sem preço
+        não contam).
+
+        Retorna:
+          pd.Series em centavos, indexada pelo nome do jogador.
+        """
+        import pandas as pd  # só quem pede a Series paga o import
+
+        subtotal = np.where(self.tem_preco, self.quantidade * self.preco_centavos, 0)
+        valores = np.bincount(self.jogador, weights=subtotal, minlength=len(self.nomes))
+        return pd.Series(valores.astype(np.int64), index=self.nomes, name="valor_centavos")
+
+    def valor_do_jogador(self, nome):
+        inicio, fim = self.fatias.get(nome, (0, 0))
+        precos = self.preco_centavos[inicio:fim]
+        tem_preco = self.tem_preco[inicio:fim]
+        return int((self.quantidade[inicio:fim] * precos)[tem_preco].sum())
+
+    def preco_maximo(self):
+        """Maior preço unitário (centavos) entre todas as ofertas, 0 se não houver."""
+        return int(self.preco_centavos.max()) if len(self.preco_centavos) else 0
+
+    def selecionar(self, nome=None, preco_min=None, preco_max=None, ordem=None):
+        """
+        Cartas de um jogador (ou de todos) filtradas e ordenadas por preço.
+
+        Parâmetros:
+          nome (str): jogador; None para todas as ofertas.
+          preco_min, preco_max (int): faixa de preço em centavos, inclusiva.
+            Com faixa, cartas sem preço ficam de fora.
+          ordem (str): None (ordem da lista), "asc" ou "desc". Cartas sem
+            preço vão para o fim; empates mantêm a ordem da lista.
+
+        Retorna:
+          Lista dos dicts originais das cartas selecionadas.
+        """
+        inicio, fim = (0, len(self.cartas)) if nome is None else self.fatias.get(nome, (0, 0))
+        precos = self.preco_centavos[inicio:fim]
+        posicoes = np.arange(inicio, fim)
+        if preco_min is not None or preco_max is not None:
+            mascara = self.tem_preco[inicio:fim].copy()
+            if preco_min is not None:
+                mascara &= precos >= preco_min
+            if preco_max is not None:
+                mascara &= precos <= preco_max
+            posicoes, precos = posicoes[mascara], precos[mascara]
+        if ordem is not None:
+            chave = -precos if ordem == "desc" else precos
+            chave = np.where(precos == SEM_PRECO, np.iinfo(np.int64).max, chave)
+            posicoes = posicoes[np.argsort(chave, kind="stable")]
+        return [self.cartas[i] for i in posicoes]
+
+    def facetas(self):
+        """
+        Índices das facetas, montados uma vez.
+
+        Retorna:
+          {faceta: (valores, mapas)}, com `mapas` um array booleano
+          len(valores) x ofertas: mapas[i, j] diz se a oferta j tem valores[i].
+        """
+        if self._facetas is None:
+            total = len(self.cartas)
+            facetas = {}
+            for faceta in FACETAS:
+                # Poucos textos distintos: cada oferta vira o código do seu
+                # texto, e cada valor, os códigos dos textos que o contêm
+                codigos = {}
+                por_oferta = np.fromiter(
+                    (codigos.setdefault(carta.get(faceta) or "", len(codigos)) for carta in self.cartas),
+                    dtype=np.int32, count=total,
+                )
+                textos_do_valor = {}  # valor -> [códigos]
+                for texto, codigo in codigos.items():
+                    for valor in _valores_faceta(faceta, texto):
+                        textos_do_valor.setdefault(valor, []).append(codigo)
+                por_codigo = np.zeros((len(textos_do_valor), len(codigos)), dtype=bool)
+                valores = list(textos_do_valor)
+                for linha, valor in enumerate(valores):
+                    por_codigo[linha, textos_do_valor[valor]] = True
+                mapas = por_codigo[:, por_oferta]
+                ordem = np.argsort(-mapas.sum(axis=1), kind="stable")
+                facetas[faceta] = ([valores[i] for i in ordem], mapas[ordem])
+
+            precos = self.preco_centavos
+            mapas = np.zeros((len(FAIXAS_PRECO), total), dtype=bool)
+            for linha, (_, minimo, maximo) in enumerate(FAIXAS_PRECO):
+                if minimo is None:
+                    mapas[linha] = ~self.tem_preco
+                else:
+                    mapas[linha] = self.tem_preco & (precos >= minimo)
+                    if maximo is not None:
+                        mapas[linha] &= precos < maximo
+            facetas[FACETA_PRECO] = ([rotulo for rotulo, _, _ in FAIXAS_PRECO], mapas)
+            self._facetas = facetas
+        return self._facetas
+
+    def filtrar(self, selecao=None):
+        """
+        Ofertas que passam pelos filtros, com as contagens de cada faceta.
+
+        Parâmetros:
+          selecao (dict): faceta -> valores aceitos (um deles basta). Faceta
+            ausente ou sem valores não filtra.
+
+        Retorna:
+          (posições das ofertas selecionadas, {faceta: {valor: ofertas}}), em
+          que a contagem de cada valor aplica os filtros das demais facetas:
+          é quantas ofertas sobrariam escolhendo também aquele valor.
+        """
+        facetas = self.facetas()
+        selecao = selecao or {}
+        mascaras = {}
+        for faceta, (valores, mapas) in facetas.items():
+            escolhidos = [valores.index(v) for v in selecao.get(faceta, []) if v in valores]
+            if escolhidos:
+                mascaras[faceta] = mapas[escolhidos].any(axis=0)
+
+        todas = np.ones(len(self.cartas), dtype=bool)
+        contagens = {}
+        for faceta, (valores, mapas) in facetas.items():
+            outras = todas.copy()
+            for nome, mascara in mascaras.items():
+                if nome != faceta:
+                    outras &= mascara
+            por_valor = np.count_nonzero(mapas & outras, axis=1)
+            contagens[faceta] = dict(zip(valores, por_valor.tolist()))
+
+        selecionadas = todas
+        for mascara in mascaras.values():
+            selecionadas &= mascara
+        return np.flatnonzero(selecionadas), contagens
+
+    def ofertas(self, posicoes, ordem=None, limite=None):
+        """
+        (nome do jogador, carta) das posições, na ordem da lista ou por preço
+        ("asc"/"desc", sem preço no fim), até `limite`.
+        """
+        posicoes = np.asarray(posicoes)
+        if ordem is not None:
+            precos = self.preco_centavos[posicoes]
+            chave = -precos if ordem == "desc" else precos
+            chave = np.where(precos == SEM_PRECO, np.iinfo(np.int64).max, chave)
+            posicoes = posicoes[np.argsort(chave, kind="stable")]
+        return [(self.nomes[self.jogador[i]], self.cartas[i]) for i in posicoes[:limite]]
+
+    def como_dataframe(self):
+        """As ofertas como DataFrame (jogador, nome, quantidade, preco_centavos)."""
+        import pandas as pd
+
+        return pd.DataFrame({
+            "jogador": np.array(self.nomes, dtype=object)[self.jogador],
+            "nome": [c.get("Nome", "") for c in self.cartas],
+            "quantidade": self.quantidade,
+            "preco_centavos": pd.Series(self.preco_centavos).where(self.tem_preco).astype("Int64"),
+        })